@@ -0,0 +1,74 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    Bytes per cached item and hit-path latency of every PayloadCodec
+    available in this environment, for 10-item SearchItems responses.
+
+    python -m benchmarks.bench_cache_codecs [--responses 200] [--hits 2000]
+"""
+
+import argparse
+import json
+import timeit
+
+from benchmarks.fixtures import search_items_response
+from paapi5_python_sdk.cache import ResponseCache
+from paapi5_python_sdk.compression import available_codecs
+
+
+def measure(codec, responses, hits):
+    cache = ResponseCache(ttl=3600, max_entries=len(responses), codec=codec)
+    for index, response in enumerate(responses):
+        cache.get_or_load(index, lambda: response)
+
+    items = sum(len(response["SearchResult"]["Items"])
+                for response in responses)
+    if codec is None:
+        stored = sum(len(json.dumps(response, separators=(',', ':')))
+                     for response in responses)
+    else:
+        stored = cache.stats()["bytes"]
+
+    keys = list(range(len(responses)))
+    elapsed = timeit.timeit(
+        lambda: [cache.get_or_load(key, None) for key in keys],
+        number=max(1, hits // len(keys)))
+    calls = max(1, hits // len(keys)) * len(keys)
+    return stored / float(items), elapsed / calls * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--responses", type=int, default=200)
+    parser.add_argument("--hits", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    responses = [search_items_response(10, seed=seed)
+                 for seed in range(args.responses)]
+
+    print("%-16s %16s %16s" % ("codec", "bytes/item", "hit latency (us)"))
+    for codec in [None] + available_codecs():
+        name = "json (no codec)" if codec is None else codec.name
+        per_item, latency = measure(codec, responses, args.hits)
+        print("%-16s %16.0f %16.1f" % (name, per_item, latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    Throughput of ApiClient.deserialize on generated payloads (see
+    benchmarks.payload_generator), after checking that each one round-trips
+    through to_dict().
+
+    python -m benchmarks.bench_deserialize [--items 10] [--listings 3]
+        [--promotions 2] [--contributors 2] [--depth 3] [--number 20]
+"""
+
+import argparse
+import json
+import timeit
+
+from benchmarks.fixtures import RawResponse
+from benchmarks.payload_generator import (PayloadGenerator, RESPONSE_TYPES,
+                                          expected_to_dict)
+from paapi5_python_sdk.api_client import ApiClient
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10)
+    parser.add_argument("--listings", type=int, default=3)
+    parser.add_argument("--promotions", type=int, default=2)
+    parser.add_argument("--contributors", type=int, default=2)
+    parser.add_argument("--depth", type=int, default=3,
+                        help="browse node ancestor depth")
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    generator = PayloadGenerator(
+        item_count=args.items, listings=args.listings,
+        promotions=args.promotions, contributors=args.contributors,
+        browse_node_depth=args.depth)
+    api_client = ApiClient(access_key="key", secret_key="secret",
+                           host="webservices.amazon.fr", region="eu-west-1")
+
+    print("%-24s %10s %12s %10s" % ("response", "KiB", "responses/s",
+                                    "MiB/s"))
+    for response_type in RESPONSE_TYPES:
+        payload = generator.generate(response_type)
+        response = RawResponse(json.dumps(payload))
+        model = api_client.deserialize(response, response_type)
+        assert model.to_dict() == expected_to_dict(payload, response_type), \
+            "%s does not round-trip through to_dict()" % response_type
+
+        elapsed = min(timeit.repeat(
+            lambda: api_client.deserialize(response, response_type),
+            number=args.number, repeat=3))
+        size = len(response.data.encode("utf-8"))
+        rate = args.number / elapsed
+        print("%-24s %10.1f %12.1f %10.2f" % (
+            response_type, size / 1024.0, rate, rate * size / 1048576.0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    Cold import time of the SDK, measured with `python -X importtime` in a
+    fresh interpreter per run, checked against a budget per statement.
+    Exits with status 1 when a median exceeds its budget.
+
+    python -m benchmarks.bench_import_time [--runs 7]
+        [--budget "import paapi5_python_sdk=10"]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# statement -> budget in milliseconds (cumulative import time).
+DEFAULT_BUDGETS = {
+    "import paapi5_python_sdk": 10.0,
+    "from paapi5_python_sdk import SearchItemsRequest": 25.0,
+    "from paapi5_python_sdk.api.default_api import DefaultApi": 150.0,
+}
+
+_IMPORTTIME_LINE = re.compile(
+    r"^import time:\s+\d+\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def import_time_ms(statement):
+    """Returns the cumulative import time of `statement`, in ms.
+
+    Sums the top-level entries reported by -X importtime, excluding the
+    interpreter start-up imports (encodings, site, ...) which are reported
+    before `-c` runs.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    baseline = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "pass"],
+        cwd=root, stderr=subprocess.PIPE, universal_newlines=True,
+        check=True).stderr
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=root, stderr=subprocess.PIPE, universal_newlines=True,
+        check=True).stderr
+    startup = len(baseline.splitlines())
+    total = 0
+    for line in output.splitlines()[startup:]:
+        match = _IMPORTTIME_LINE.match(line)
+        # Only top-level entries: their cumulative time includes children.
+        if match and match.group(2) == " ":
+            total += int(match.group(1))
+    return total / 1000.0
+
+
+def parse_budget(value):
+    statement, _, budget = value.rpartition("=")
+    if not statement:
+        raise argparse.ArgumentTypeError("expected STATEMENT=MILLISECONDS")
+    return statement, float(budget)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget", type=parse_budget, action="append",
+                        default=[], metavar="STATEMENT=MS",
+                        help="override or add a budget")
+    args = parser.parse_args(argv)
+
+    budgets = dict(DEFAULT_BUDGETS)
+    budgets.update(args.budget)
+
+    over_budget = False
+    print("%-60s %10s %10s" % ("statement", "median ms", "budget ms"))
+    for statement, budget in budgets.items():
+        median = statistics.median(
+            import_time_ms(statement) for _ in range(args.runs))
+        flag = ""
+        if median > budget:
+            over_budget = True
+            flag = "  OVER BUDGET"
+        print("%-60s %10.1f %10.1f%s" % (statement, median, budget, flag))
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    Client-side CPU to produce the ten page bodies of one /search call:
+    building a SearchItemsRequest per page and serializing it, against
+    deriving the pages from a PreparedRequest.
+
+    python -m benchmarks.bench_prepared_request [--number 2000]
+"""
+
+import argparse
+import json
+import timeit
+
+from benchmarks.fixtures import search_items_request
+from paapi5_python_sdk import serializer
+from paapi5_python_sdk.api_client import ApiClient
+from paapi5_python_sdk.prepared_request import PreparedRequest
+
+PAGES = range(1, 11)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    api_client = ApiClient(access_key="key", secret_key="secret",
+                           host="webservices.amazon.fr", region="eu-west-1")
+
+    def legacy():
+        return [json.dumps(api_client.sanitize_for_serialization(
+            search_items_request(item_page=page))) for page in PAGES]
+
+    def compiled():
+        return [serializer.dumps(search_items_request(item_page=page))
+                for page in PAGES]
+
+    def prepared():
+        request = PreparedRequest(search_items_request(),
+                                  fields=("item_page",))
+        return [request.body(item_page=page) for page in PAGES]
+
+    assert [body.encode("utf-8") for body in legacy()] == prepared()
+
+    print("%-36s %16s" % ("ten page bodies", "us per search"))
+    for name, function in [("new request + sanitize + json.dumps", legacy),
+                           ("new request + serializer.dumps", compiled),
+                           ("PreparedRequest.body", prepared)]:
+        elapsed = min(timeit.repeat(function, number=args.number, repeat=3))
+        print("%-36s %16.1f" % (name, elapsed / args.number * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    Turning a 10-item GetItemsResponse into JSON output: the generated
+    to_dict() followed by json.dumps, against serializer.to_dict() and the
+    direct serializer.to_json() in both key styles.
+
+    python -m benchmarks.bench_response_output [--number 2000]
+"""
+
+import argparse
+import json
+import timeit
+
+from benchmarks.fixtures import deserialize, get_items_response
+from paapi5_python_sdk import serializer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    payload = get_items_response(10)
+    raw = json.dumps(payload)
+    response = deserialize(payload, "GetItemsResponse")
+    assert serializer.to_dict(response) == response.to_dict()
+
+    candidates = [
+        ("to_dict()", lambda: response.to_dict()),
+        ("to_dict() + json.dumps",
+         lambda: json.dumps(response.to_dict()).encode("utf-8")),
+        ("serializer.to_dict()", lambda: serializer.to_dict(response)),
+        ("to_json(model, snake)",
+         lambda: serializer.to_json(response, key_style="snake")),
+        ("to_json(model, api)", lambda: serializer.to_json(response)),
+        ("to_json(raw, snake)",
+         lambda: serializer.to_json(raw, key_style="snake",
+                                    response_type="GetItemsResponse")),
+    ]
+    print("%-26s %14s" % ("10-item GetItemsResponse", "us per call"))
+    for name, function in candidates:
+        elapsed = min(timeit.repeat(function, number=args.number, repeat=3))
+        print("%-26s %14.1f" % (name, elapsed / args.number * 1e6))
+
+
+if __name__ == "__main__":
+    main()
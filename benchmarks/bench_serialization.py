@@ -0,0 +1,60 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    Requests/sec of request body serialization for the SearchItemsRequest
+    main.py sends (twelve resources): sanitize_for_serialization followed
+    by json.dumps, against the compiled per-class serializer.
+
+    python -m benchmarks.bench_serialization [--number 20000]
+"""
+
+import argparse
+import json
+import timeit
+
+from benchmarks.fixtures import search_items_request
+from paapi5_python_sdk import serializer
+from paapi5_python_sdk.api_client import ApiClient
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    api_client = ApiClient(access_key="key", secret_key="secret",
+                           host="webservices.amazon.fr", region="eu-west-1")
+    request = search_items_request()
+    assert serializer.dumps(request) == json.dumps(
+        api_client.sanitize_for_serialization(request))
+
+    candidates = [
+        ("sanitize + json.dumps",
+         lambda: json.dumps(api_client.sanitize_for_serialization(request))),
+        ("serializer.dumps", lambda: serializer.dumps(request)),
+    ]
+    print("%-24s %14s" % ("serializer", "requests/sec"))
+    for name, function in candidates:
+        elapsed = min(timeit.repeat(function, number=args.number, repeat=3))
+        print("%-24s %14.0f" % (name, args.number / elapsed))
+
+
+if __name__ == "__main__":
+    main()
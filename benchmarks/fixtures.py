@@ -0,0 +1,231 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    Hand-written PA-API requests and payloads shaped like what /search
+    sends and receives: the twelve SearchItemsResource values used in
+    main.py, fully populated.
+"""
+
+import json
+import random
+
+from paapi5_python_sdk.api_client import ApiClient
+from paapi5_python_sdk.models.availability import Availability
+from paapi5_python_sdk.models.delivery_flag import DeliveryFlag
+from paapi5_python_sdk.models.partner_type import PartnerType
+from paapi5_python_sdk.models.search_items_request import SearchItemsRequest
+from paapi5_python_sdk.models.search_items_resource import SearchItemsResource
+
+# The resources main.amazon_search() asks for.
+SEARCH_RESOURCES = [
+    SearchItemsResource.ITEMINFO_TITLE,
+    SearchItemsResource.ITEMINFO_BYLINEINFO,
+    SearchItemsResource.OFFERS_LISTINGS_PRICE,
+    SearchItemsResource.OFFERS_LISTINGS_CONDITION,
+    SearchItemsResource.ITEMINFO_CLASSIFICATIONS,
+    SearchItemsResource.CUSTOMERREVIEWS_STARRATING,
+    SearchItemsResource.IMAGES_PRIMARY_LARGE,
+    SearchItemsResource.BROWSENODEINFO_WEBSITESALESRANK,
+    SearchItemsResource.CUSTOMERREVIEWS_COUNT,
+    SearchItemsResource.OFFERS_LISTINGS_AVAILABILITY_TYPE,
+    SearchItemsResource.OFFERS_LISTINGS_DELIVERYINFO_ISPRIMEELIGIBLE,
+    SearchItemsResource.ITEMINFO_EXTERNALIDS,
+]
+
+
+def search_items_request(keywords="casque bluetooth", item_page=1):
+    """Returns a SearchItemsRequest built the way main.py builds them."""
+    return SearchItemsRequest(
+        partner_tag="dummy-21",
+        partner_type=PartnerType.ASSOCIATES,
+        keywords=keywords,
+        search_index="All",
+        item_count=10,
+        item_page=item_page,
+        resources=SEARCH_RESOURCES,
+        availability=Availability.AVAILABLE,
+        delivery_flags=[DeliveryFlag.PRIME],
+        min_price=2500,
+    )
+
+
+def search_item(index, rng=None):
+    """Returns the raw dict of one `Item` as returned by SearchItems."""
+    rng = rng or random.Random(index)
+    asin = "B0%08d" % index
+    amount = round(rng.uniform(25, 400), 2)
+    return {
+        "ASIN": asin,
+        "DetailPageURL": "https://www.amazon.fr/dp/%s?tag=dummy-21"
+                         "&linkCode=osi&th=1&psc=1" % asin,
+        "BrowseNodeInfo": {
+            "WebsiteSalesRank": {
+                "ContextFreeName": "High-Tech",
+                "DisplayName": "High-Tech",
+                "SalesRank": rng.randint(1, 200000),
+            },
+        },
+        "CustomerReviews": {
+            "Count": rng.randint(0, 25000),
+            "StarRating": {"Value": round(rng.uniform(1, 5), 1)},
+        },
+        "Images": {
+            "Primary": {
+                "Large": {
+                    "URL": "https://m.media-amazon.com/images/I/%s._SL500_.jpg"
+                           % asin,
+                    "Height": 500,
+                    "Width": 500,
+                },
+            },
+        },
+        "ItemInfo": {
+            "ByLineInfo": {
+                "Brand": {"DisplayValue": "Marque %d" % (index % 17),
+                          "Label": "Brand", "Locale": "fr_FR"},
+                "Manufacturer": {"DisplayValue": "Fabricant %d" % (index % 11),
+                                 "Label": "Manufacturer", "Locale": "fr_FR"},
+            },
+            "Classifications": {
+                "Binding": {"DisplayValue": "Électronique",
+                            "Label": "Binding", "Locale": "fr_FR"},
+                "ProductGroup": {"DisplayValue": "Électronique grand public",
+                                 "Label": "ProductGroup", "Locale": "fr_FR"},
+            },
+            "ExternalIds": {
+                "EANs": {"DisplayValues": ["%013d" % (3000000000000 + index)],
+                         "Label": "EAN", "Locale": "en_US"},
+            },
+            "Title": {
+                "DisplayValue": "Casque audio sans fil à réduction de bruit "
+                                "active, modèle %d, autonomie 30 heures"
+                                % index,
+                "Label": "Title",
+                "Locale": "fr_FR",
+            },
+        },
+        "Offers": {
+            "Listings": [{
+                "Availability": {"Message": "En stock.", "MinOrderQuantity": 1,
+                                 "MaxOrderQuantity": 30, "Type": "Now"},
+                "Condition": {"DisplayValue": "Neuf", "Label": "Condition",
+                              "Locale": "fr_FR", "Value": "New"},
+                "DeliveryInfo": {"IsAmazonFulfilled": True,
+                                 "IsFreeShippingEligible": True,
+                                 "IsPrimeEligible": bool(index % 5)},
+                "Id": "pfVQ%08dXhZ2dA4fa%%2BTbW1zSc3dWyu6o" % index,
+                "Price": {"Amount": amount, "Currency": "EUR",
+                          "DisplayAmount": ("%.2f €" % amount).replace(".", ",")},
+                "ViolatesMAP": False,
+            }],
+        },
+    }
+
+
+def search_items_response(item_count=10, seed=0):
+    """Returns the raw dict of a `SearchItemsResponse`."""
+    rng = random.Random(seed)
+    return {
+        "SearchResult": {
+            "Items": [search_item(seed * 1000 + index, rng)
+                      for index in range(item_count)],
+            "SearchURL": "https://www.amazon.fr/s?k=casque&rh=p_n_availability"
+                         "%3A-1&tag=dummy-21&linkCode=osi",
+            "TotalResultCount": 1000,
+        },
+    }
+
+
+def get_items_response(item_count=10, seed=0):
+    """Returns the raw dict of a `GetItemsResponse`."""
+    rng = random.Random(seed)
+    return {
+        "ItemsResult": {
+            "Items": [search_item(seed * 1000 + index, rng)
+                      for index in range(item_count)],
+        },
+    }
+
+
+def get_variations_response(item_count=10, seed=0):
+    """Returns the raw dict of a `GetVariationsResponse`."""
+    rng = random.Random(seed)
+    sizes = ["XS", "S", "M", "L", "XL"]
+    items = []
+    for index in range(item_count):
+        item = search_item(seed * 1000 + index, rng)
+        item["VariationAttributes"] = [
+            {"Name": "size_name", "Value": sizes[index % len(sizes)]}]
+        items.append(item)
+    return {
+        "VariationsResult": {
+            "Items": items,
+            "VariationSummary": {
+                "PageCount": 1,
+                "VariationCount": item_count,
+                "VariationDimensions": [{
+                    "DisplayName": "Taille", "Locale": "fr_FR",
+                    "Name": "size_name", "Values": sizes,
+                }],
+            },
+        },
+    }
+
+
+def get_browse_nodes_response(node_count=10, seed=0):
+    """Returns the raw dict of a `GetBrowseNodesResponse`."""
+    def node(node_id):
+        return {"Id": str(node_id), "DisplayName": "Catégorie %d" % node_id,
+                "ContextFreeName": "Catégorie %d" % node_id}
+
+    nodes = []
+    for index in range(node_count):
+        node_id = 1000 + seed * 1000 + index
+        browse_node = node(node_id)
+        browse_node["IsRoot"] = False
+        browse_node["Ancestor"] = dict(node(node_id // 10),
+                                       Ancestor=node(node_id // 100))
+        browse_node["Children"] = [node(node_id * 10 + child)
+                                   for child in range(5)]
+        nodes.append(browse_node)
+    return {"BrowseNodesResult": {"BrowseNodes": nodes}}
+
+
+class RawResponse(object):
+    """Stands in for rest.RESTResponse when feeding ApiClient.deserialize."""
+
+    def __init__(self, data, status=200):
+        self.data = data
+        self.status = status
+        self.reason = "OK"
+
+    def getheaders(self):
+        return {}
+
+    def getheader(self, name, default=None):
+        return default
+
+
+def deserialize(payload, response_type):
+    """Returns `payload` (a raw dict) deserialized into `response_type`."""
+    api_client = ApiClient(access_key="key", secret_key="secret",
+                           host="webservices.amazon.fr", region="eu-west-1")
+    return api_client.deserialize(RawResponse(json.dumps(payload)),
+                                  response_type)
@@ -0,0 +1,177 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    Synthetic PA-API payloads built from the models' swagger_types and
+    attribute_map, with every attribute populated, for deserializer stress
+    tests. Unlike the hand-written payloads of benchmarks.fixtures, they
+    cover every model reachable from a response and their size is driven by
+    a few knobs.
+
+    >>> generator = PayloadGenerator(item_count=10, listings=3, promotions=2)
+    >>> payload = generator.generate('SearchItemsResponse')
+    >>> model = fixtures.deserialize(payload, 'SearchItemsResponse')
+    >>> model.to_dict() == expected_to_dict(payload, 'SearchItemsResponse')
+    True
+"""
+
+import random
+import re
+
+from paapi5_python_sdk import models
+
+RESPONSE_TYPES = ("SearchItemsResponse", "GetItemsResponse",
+                  "GetVariationsResponse", "GetBrowseNodesResponse")
+
+_PRIMITIVES = ("str", "int", "float", "bool", "object")
+_LIST = re.compile(r"^list\[(.*)\]$")
+_DICT = re.compile(r"^dict\(([^,]*), (.*)\)$")
+
+
+def _enum_values(klass):
+    return sorted(value for name, value in vars(klass).items()
+                  if name.isupper() and isinstance(value, str))
+
+
+class PayloadGenerator(object):
+    """Builds raw PA-API JSON dicts from model metadata.
+
+    :param item_count: items of SearchResult/ItemsResult/VariationsResult,
+        browse nodes of BrowseNodesResult.
+    :param listings: OfferListing entries per item (Offers.Listings).
+    :param promotions: promotions per listing and per offer summary.
+    :param contributors: ByLineInfo.Contributors per item.
+    :param browse_node_depth: Ancestor chain length, and how many times a
+        model may nest inside itself.
+    :param list_length: length of every other list.
+    :param errors: Errors entries of the response.
+    :param seed: seed of the value generator.
+    """
+
+    def __init__(self, item_count=10, listings=1, promotions=0,
+                 contributors=2, browse_node_depth=2, list_length=2,
+                 errors=0, seed=0):
+        self.browse_node_depth = browse_node_depth
+        self.list_length = list_length
+        # (model, attribute) -> list length, overriding list_length.
+        self.list_lengths = {
+            ("SearchResult", "items"): item_count,
+            ("ItemsResult", "items"): item_count,
+            ("VariationsResult", "items"): item_count,
+            ("BrowseNodesResult", "browse_nodes"): item_count,
+            ("Offers", "listings"): listings,
+            ("OfferListing", "promotions"): promotions,
+            ("OfferSummary", "promotions"): promotions,
+            ("ByLineInfo", "contributors"): contributors,
+        }
+        for response_type in RESPONSE_TYPES:
+            self.list_lengths[(response_type, "errors")] = errors
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._counter = 0
+
+    def generate(self, response_type):
+        """Returns the raw dict of one `response_type` response."""
+        self._rng.seed(self.seed)
+        self._counter = 0
+        return self.model(response_type, ())
+
+    def model(self, name, stack):
+        klass = models.get_model(name)
+        if not klass.swagger_types:
+            return self._rng.choice(_enum_values(klass))
+        stack = stack + (name,)
+        payload = {}
+        for attr, attr_type in sorted(klass.swagger_types.items()):
+            if stack.count(self._item_type(attr_type)) >= \
+                    self.browse_node_depth:
+                continue
+            value = self.value(name, attr, attr_type, stack)
+            if value is not None:
+                payload[klass.attribute_map[attr]] = value
+        return payload
+
+    def value(self, model_name, attr, attr_type, stack):
+        match = _LIST.match(attr_type)
+        if match:
+            length = self.list_lengths.get((model_name, attr),
+                                           self.list_length)
+            values = [self.value(model_name, attr, match.group(1), stack)
+                      for _ in range(length)]
+            return values or None
+        match = _DICT.match(attr_type)
+        if match:
+            return {"%s%d" % (attr, index): self.value(
+                model_name, attr, match.group(2), stack)
+                for index in range(self.list_length)}
+        if attr_type in _PRIMITIVES:
+            return self.primitive(model_name, attr, attr_type)
+        return self.model(attr_type, stack)
+
+    def primitive(self, model_name, attr, attr_type):
+        rng = self._rng
+        self._counter += 1
+        if attr_type == "bool":
+            return rng.random() < 0.5
+        if attr_type == "int":
+            return rng.randint(0, 100000)
+        if attr_type == "float":
+            return round(rng.uniform(0, 1000), 2)
+        if attr in ("asin", "parent_asin"):
+            return "B0%08d" % rng.randint(0, 99999999)
+        if attr in ("url", "detail_page_url", "search_url"):
+            return "https://www.amazon.fr/%s/%d" % (model_name.lower(),
+                                                   self._counter)
+        if attr == "currency":
+            return "EUR"
+        if attr == "locale":
+            return "fr_FR"
+        return u"%s.%s %d é" % (model_name, attr, self._counter)
+
+    @staticmethod
+    def _item_type(attr_type):
+        match = _LIST.match(attr_type)
+        if match:
+            return match.group(1)
+        match = _DICT.match(attr_type)
+        return match.group(2) if match else attr_type
+
+
+def expected_to_dict(payload, type_name):
+    """Returns what `to_dict()` of `payload` deserialized as `type_name`
+    should give: attribute names instead of JSON keys, every attribute
+    present (None when absent from the payload)."""
+    match = _LIST.match(type_name)
+    if match:
+        return [expected_to_dict(value, match.group(1)) for value in payload]
+    match = _DICT.match(type_name)
+    if match:
+        return {key: expected_to_dict(value, match.group(2))
+                for key, value in payload.items()}
+    if type_name in _PRIMITIVES:
+        return payload
+    klass = models.get_model(type_name)
+    if not klass.swagger_types:
+        return payload
+    result = {}
+    for attr, attr_type in klass.swagger_types.items():
+        value = payload.get(klass.attribute_map[attr])
+        result[attr] = None if value is None else \
+            expected_to_dict(value, attr_type)
+    return result
@@ -0,0 +1,324 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    Replays a log of /search calls against the Flask service and reports
+    throughput, latency percentiles and errors.
+
+    The log is either JSON lines ({"keywords": ..., "search_index": ...,
+    "timestamp": epoch seconds or ISO 8601}) or access log lines in
+    common/combined log format, of which only GET /search lines are kept.
+    Calls are sent at their original pace divided by --speed (0 sends them
+    as fast as --concurrency allows). Latencies are measured from the time
+    a call was due, so a saturated service shows up as queueing in the
+    percentiles rather than as a silently slower replay.
+
+    --target replays against a running service; --local starts the PA-API
+    simulator and main.py on local ports and replays against them.
+
+    python -m benchmarks.replay_traffic calls.jsonl --local --speed 10
+        [--concurrency 16] [--latency lognormal:0.1:0.5] [--json]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import logging
+import math
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import urllib3
+from six.moves.urllib.parse import parse_qs, urlencode, urlsplit
+
+from benchmarks.simulator import PaapiSimulator, load_service, parse_latency
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+_ACCESS_LOG = re.compile(
+    r'\[(?P<time>[^\]]+)\] "GET (?P<path>/search\?\S*) HTTP/[\d.]+"')
+
+
+class Call(object):
+    """One /search call of a traffic log.
+
+    :param offset: seconds since the first call of the log.
+    """
+
+    __slots__ = ('offset', 'keywords', 'search_index')
+
+    def __init__(self, offset, keywords, search_index='All'):
+        self.offset = offset
+        self.keywords = keywords
+        self.search_index = search_index
+
+    @property
+    def path(self):
+        return '/search?' + urlencode([('keywords', self.keywords),
+                                       ('search_index', self.search_index)])
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    moment = datetime.datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return moment.timestamp()
+
+
+def parse_line(line):
+    """Returns (timestamp or None, keywords, search_index) or None for lines
+    that are not /search calls."""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith('{'):
+        entry = json.loads(line)
+        if not entry.get('keywords'):
+            return None
+        return (_timestamp(entry.get('timestamp')), entry['keywords'],
+                entry.get('search_index') or 'All')
+    match = _ACCESS_LOG.search(line)
+    if match is None:
+        return None
+    query = parse_qs(urlsplit(match.group('path')).query)
+    if not query.get('keywords'):
+        return None
+    moment = datetime.datetime.strptime(match.group('time'),
+                                        '%d/%b/%Y:%H:%M:%S %z')
+    return (moment.timestamp(), query['keywords'][0],
+            query.get('search_index', ['All'])[0])
+
+
+def load_calls(lines):
+    """Returns the Calls of a log, in time order, offsets from the first.
+
+    Entries without a timestamp are due together with the previous one.
+    """
+    parsed = []
+    previous = None
+    for line in lines:
+        entry = parse_line(line)
+        if entry is None:
+            continue
+        timestamp, keywords, search_index = entry
+        if timestamp is None:
+            timestamp = previous if previous is not None else 0.0
+        previous = timestamp
+        parsed.append((timestamp, keywords, search_index))
+    parsed.sort(key=lambda entry: entry[0])
+    if not parsed:
+        return []
+    start = parsed[0][0]
+    return [Call(timestamp - start, keywords, search_index)
+            for timestamp, keywords, search_index in parsed]
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = int(math.ceil(percent / 100.0 * len(sorted_values))) - 1
+    return sorted_values[min(max(rank, 0), len(sorted_values) - 1)]
+
+
+class ReplayReport(object):
+    """Outcome of a replay: one (latency, status) per call."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.statuses = {}
+        self.duration = 0.0
+
+    def add(self, latency, status):
+        with self._lock:
+            self.latencies.append(latency)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        total = len(latencies)
+        errors = sum(count for status, count in self.statuses.items()
+                     if not 200 <= status <= 299)
+        return {
+            'calls': total,
+            'duration': round(self.duration, 3),
+            'throughput': round(total / self.duration, 2)
+            if self.duration else None,
+            'error_rate': round(float(errors) / total, 4) if total else None,
+            'statuses': {str(status): count
+                         for status, count in sorted(self.statuses.items())},
+            'latency_ms': dict(
+                [('p%g' % percent, _ms(percentile(latencies, percent)))
+                 for percent in PERCENTILES] +
+                [('max', _ms(latencies[-1] if latencies else None))]),
+        }
+
+    def format(self):
+        summary = self.summary()
+        lines = [
+            'calls       %d in %.1f s' % (summary['calls'],
+                                          summary['duration']),
+            'throughput  %s calls/s' % summary['throughput'],
+            'error rate  %s  %s' % (summary['error_rate'],
+                                    summary['statuses']),
+        ]
+        lines.extend('%-11s %s ms' % (name, value)
+                     for name, value in summary['latency_ms'].items())
+        return '\n'.join(lines)
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000.0, 2)
+
+
+def replay(calls, send, speed=1.0, concurrency=8, clock=time.time,
+           sleep=time.sleep):
+    """Sends `calls` with `send(call) -> HTTP status` and returns a
+    ReplayReport. Exceptions raised by `send` are reported as status 0.
+
+    :param speed: pace factor, 2 replays twice as fast as recorded, 0 as
+        fast as `concurrency` allows.
+    """
+    report = ReplayReport()
+
+    def run(call, due):
+        try:
+            status = send(call)
+        except Exception:
+            status = 0
+        report.add(clock() - due, status)
+
+    start = clock()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for call in calls:
+            due = start + (call.offset / speed if speed else 0.0)
+            delay = due - clock()
+            if delay > 0:
+                sleep(delay)
+            executor.submit(run, call, due)
+    report.duration = clock() - start
+    return report
+
+
+def http_sender(base_url, concurrency=8, timeout=30.0):
+    """Returns a `send` function issuing the calls against `base_url`."""
+    pool = urllib3.PoolManager(maxsize=concurrency, block=True,
+                               timeout=urllib3.Timeout(total=timeout),
+                               retries=False)
+    base_url = base_url.rstrip('/')
+
+    def send(call):
+        return pool.request('GET', base_url + call.path).status
+
+    return send
+
+
+class LocalService(object):
+    """The PA-API simulator and main.py served on local ports."""
+
+    def __init__(self, simulator):
+        from werkzeug.serving import make_server
+
+        self.simulator = simulator
+        self.service = load_service(simulator)
+        self._server = make_server('127.0.0.1', 0, self.service.app,
+                                   threaded=True)
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d' % self._server.server_port
+
+    def __enter__(self):
+        self.simulator.start()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._thread.join()
+        self.simulator.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('log', type=argparse.FileType('r'),
+                        help='JSON lines or access log, - for stdin')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--target', help='base URL of a running service')
+    target.add_argument('--local', action='store_true',
+                        help='replay against main.py and the simulator')
+    parser.add_argument('--speed', type=float, default=1.0)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--latency', type=parse_latency, default=None,
+                        help='simulator latency with --local')
+    parser.add_argument('--throttle-rate', type=float, default=0.0,
+                        help='simulator 429 rate with --local')
+    parser.add_argument('--json', action='store_true',
+                        help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    calls = load_calls(args.log)
+    if not calls:
+        parser.error('no /search call found in %s' % args.log.name)
+
+    def run(url):
+        send = http_sender(url, args.concurrency, args.timeout)
+        return replay(calls, send, args.speed, args.concurrency)
+
+    if args.local:
+        simulator = PaapiSimulator(latency=args.latency,
+                                   throttle_rate=args.throttle_rate)
+        # main.py prints every call and werkzeug logs every request.
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        with LocalService(simulator) as local, \
+                contextlib.redirect_stdout(io.StringIO()):
+            report = run(local.url)
+    else:
+        report = run(args.target)
+
+    if args.json:
+        print(json.dumps(report.summary(), indent=2))
+    else:
+        print(report.format())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
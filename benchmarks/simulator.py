@@ -0,0 +1,607 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    Local stand-in for the PA-API 5.0 web service, for benchmarks and load
+    tests without network access.
+
+    It serves the four operations on their usual paths, checks the
+    x-amz-target header and the SigV4 signature produced by AWSV4Auth, and
+    answers with synthetic payloads containing only the requested
+    resources. Latency, throttling (429 TooManyRequests) and 5xx errors can
+    be injected.
+
+    >>> with PaapiSimulator(latency=lognormal_latency(0.1, 0.5)) as sim:
+    ...     api = DefaultApi(api_client=sim.api_client())
+    ...     api.search_items(request)
+
+    python -m benchmarks.simulator --port 8081 --latency lognormal:0.1:0.5 \\
+        --throttle-rate 0.02 --error-rate 0.01
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import zlib
+
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler
+from six.moves.socketserver import ThreadingMixIn
+from six.moves.BaseHTTPServer import HTTPServer
+
+from benchmarks.fixtures import search_item
+from paapi5_python_sdk.api_client import ApiClient
+from paapi5_python_sdk.auth.sign_helper import AWSV4Auth
+from paapi5_python_sdk.configuration import Configuration
+from paapi5_python_sdk.metrics import MetricsRegistry
+
+SIMULATOR_ACCESS_KEY = "AKIAPAAPISIMULATOR"
+SIMULATOR_SECRET_KEY = "paapi-simulator-secret-key"
+SIMULATOR_REGION = "eu-west-1"
+
+TARGET_PREFIX = "com.amazon.paapi5.v1.ProductAdvertisingAPIv1."
+OPERATIONS = {
+    "/paapi5/searchitems": "SearchItems",
+    "/paapi5/getitems": "GetItems",
+    "/paapi5/getvariations": "GetVariations",
+    "/paapi5/getbrowsenodes": "GetBrowseNodes",
+}
+# Keys present on every item whatever the requested resources.
+ITEM_KEYS = ("ASIN", "DetailPageURL")
+
+_AUTHORIZATION = re.compile(
+    r"AWS4-HMAC-SHA256 Credential=(?P<access_key>[^/]+)/(?P<date>\d{8})/"
+    r"(?P<region>[^/]+)/(?P<service>[^/]+)/aws4_request, "
+    r"SignedHeaders=(?P<signed_headers>[^,]+), Signature=(?P<signature>\w+)$")
+
+
+def constant_latency(seconds):
+    """Latency distribution always returning `seconds`."""
+    return lambda rng: seconds
+
+
+def uniform_latency(low, high):
+    """Latency uniformly distributed between `low` and `high` seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal_latency(median, sigma):
+    """Log-normal latency: `median` seconds, long tail growing with sigma."""
+    if median <= 0:
+        return constant_latency(0.0)
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def parse_latency(spec):
+    """Parses `constant:S`, `uniform:LOW:HIGH` or `lognormal:MEDIAN:SIGMA`."""
+    name, _, arguments = spec.partition(":")
+    values = [float(value) for value in arguments.split(":") if value]
+    factories = {"constant": constant_latency, "uniform": uniform_latency,
+                 "lognormal": lognormal_latency}
+    if name not in factories:
+        raise ValueError("Unknown latency distribution `%s`." % name)
+    return factories[name](*values)
+
+
+def select_resources(item, resources):
+    """Returns the part of a fully populated item covered by `resources`.
+
+    Resources are dotted paths into the item (`Offers.Listings.Price`);
+    lists along the path are traversed element by element.
+    """
+    selected = {key: item[key] for key in ITEM_KEYS if key in item}
+    for resource in resources or ():
+        _copy_path(item, selected, resource.split("."))
+    return selected
+
+
+def _copy_path(source, target, path):
+    key = path[0]
+    if not isinstance(source, dict) or key not in source:
+        return
+    value = source[key]
+    if len(path) == 1:
+        target[key] = value
+    elif isinstance(value, dict):
+        _copy_path(value, target.setdefault(key, {}), path[1:])
+    elif isinstance(value, list):
+        copies = target.setdefault(key, [{} for _ in value])
+        for item, copy in zip(value, copies):
+            _copy_path(item, copy, path[1:])
+
+
+def matches_filters(item, request):
+    """True if a fully populated item passes the SearchItems filters of
+    `request` the simulator honours: MinPrice, MaxPrice (in cents),
+    MinReviewsRating and the Prime delivery flag."""
+    prices = [listing["Price"]["Amount"] * 100
+              for listing in item.get("Offers", {}).get("Listings", ())]
+    if "MinPrice" in request and not any(
+            price >= request["MinPrice"] for price in prices):
+        return False
+    if "MaxPrice" in request and not any(
+            price <= request["MaxPrice"] for price in prices):
+        return False
+    if "MinReviewsRating" in request and \
+            item["CustomerReviews"]["StarRating"]["Value"] < \
+            request["MinReviewsRating"]:
+        return False
+    if "Prime" in request.get("DeliveryFlags", ()) and not any(
+            listing["DeliveryInfo"]["IsPrimeEligible"]
+            for listing in item.get("Offers", {}).get("Listings", ())):
+        return False
+    return True
+
+
+def error_body(code, message):
+    return {
+        "__type": "com.amazon.paapi5#%sException" % code,
+        "Errors": [{"Code": code, "Message": message}],
+    }
+
+
+class SimulatorError(Exception):
+
+    def __init__(self, status, code, message):
+        super(SimulatorError, self).__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class PaapiSimulator(object):
+    """In-process PA-API stand-in listening on a local port.
+
+    :param port: TCP port, 0 picks a free one.
+    :param credentials: dict access key -> secret key accepted by the
+        signature check, defaults to the SIMULATOR_* pair; False disables
+        the check.
+    :param latency: callable(rng) returning the seconds to wait before
+        answering, see `constant_latency` and friends.
+    :param throttle_rate: probability of answering 429 TooManyRequests.
+    :param tps: requests per second accepted from each access key before
+        answering 429 (PA-API quotas are per credential), None for no
+        limit.
+    :param taxonomy: dict browse node id -> list of child ids served by
+        GetBrowseNodes, unknown ids being reported in Errors; None serves
+        an endless taxonomy where node N has children N0 to N9.
+    :param partner_tags: dict access key -> partner tag it may use; a
+        request signed by that key with another PartnerTag answers 400
+        InvalidPartnerTag. None accepts any tag.
+    :param error_rate: probability of answering 500 InternalFailure.
+    :param total_results: results available for any search; pages beyond
+        them answer 404 NoResults.
+    :param honour_filters: drop from the results the items failing the
+        filters of the request (see `matches_filters`), as PA-API does.
+    :param variation_count: variations of any GetVariations ASIN.
+    :param seed: seed of the latency/error random generator.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, credentials=None,
+                 region=SIMULATOR_REGION, latency=None, throttle_rate=0.0,
+                 tps=None, error_rate=0.0, total_results=100,
+                 variation_count=25, seed=None, partner_tags=None,
+                 taxonomy=None, honour_filters=False):
+        if credentials is None:
+            credentials = {SIMULATOR_ACCESS_KEY: SIMULATOR_SECRET_KEY}
+        self.credentials = credentials
+        self.region = region
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.tps = tps
+        self.error_rate = error_rate
+        self.total_results = total_results
+        self.variation_count = variation_count
+        self.partner_tags = partner_tags
+        self.taxonomy = taxonomy
+        self.honour_filters = honour_filters
+        self.metrics = MetricsRegistry()
+
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._tps_lock = threading.Lock()
+        self._tps_windows = {}
+        self._server = _Server((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def host(self):
+        """`host:port` to give to ApiClient/DefaultApi as `host`."""
+        return "%s:%d" % self._server.server_address[:2]
+
+    def api_client(self, access_key=SIMULATOR_ACCESS_KEY,
+                   secret_key=SIMULATOR_SECRET_KEY, configuration=None):
+        """Returns an ApiClient talking plain HTTP to this simulator."""
+        if configuration is None:
+            configuration = Configuration()
+        configuration.scheme = "http"
+        return ApiClient(access_key=access_key, secret_key=secret_key,
+                         host=self.host, region=self.region,
+                         configuration=configuration)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _random(self):
+        with self._rng_lock:
+            return self._rng.random()
+
+    def _delay(self):
+        if self.latency is None:
+            return 0.0
+        with self._rng_lock:
+            return max(0.0, self.latency(self._rng))
+
+    def _over_tps(self, access_key):
+        if self.tps is None:
+            return False
+        second = int(time.time())
+        with self._tps_lock:
+            window, count = self._tps_windows.get(access_key, (0, 0))
+            if window != second:
+                window, count = second, 0
+            count += 1
+            self._tps_windows[access_key] = (window, count)
+        return count > self.tps
+
+    def handle(self, path, headers, body):
+        """Returns (status, payload dict) for one request."""
+        operation = OPERATIONS.get(path)
+        if operation is None:
+            raise SimulatorError(404, "UnknownOperation",
+                                 "Unknown path %s." % path)
+        if headers.get("x-amz-target") != TARGET_PREFIX + operation:
+            raise SimulatorError(400, "UnknownOperation",
+                                 "x-amz-target does not match %s."
+                                 % operation)
+        access_key = self._verify_signature(path, headers, body)
+        self.metrics.incr("requests." + operation)
+        if access_key is not None:
+            self.metrics.incr("requests_by_key." + access_key)
+
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        if self._over_tps(access_key) or (self.throttle_rate and
+                                self._random() < self.throttle_rate):
+            self.metrics.incr("throttled")
+            raise SimulatorError(429, "TooManyRequests",
+                                 "The request was denied due to request "
+                                 "throttling.")
+        if self.error_rate and self._random() < self.error_rate:
+            self.metrics.incr("errors")
+            raise SimulatorError(500, "InternalFailure",
+                                 "The request processing has failed because "
+                                 "of an unknown error.")
+
+        try:
+            request = json.loads(body.decode("utf-8"))
+        except ValueError:
+            raise SimulatorError(400, "InvalidParameterValue",
+                                 "The request body is not valid JSON.")
+        if self.partner_tags is not None and access_key is not None and \
+                request.get("PartnerTag") != self.partner_tags.get(access_key):
+            raise SimulatorError(400, "InvalidPartnerTag",
+                                 "The partner tag is invalid or not present.")
+        return 200, getattr(self, "_" + operation)(request)
+
+    def _verify_signature(self, path, headers, body):
+        """Returns the access key that signed the request, None when the
+        check is disabled."""
+        if self.credentials is False:
+            return None
+        match = _AUTHORIZATION.match(headers.get("authorization", ""))
+        if match is None or "x-amz-date" not in headers:
+            self.metrics.incr("signature_failures")
+            raise SimulatorError(
+                400, "IncompleteSignature",
+                "The request signature did not include all of the required "
+                "components.")
+        secret_key = self.credentials.get(match.group("access_key"))
+        if secret_key is None:
+            self.metrics.incr("signature_failures")
+            raise SimulatorError(
+                401, "UnrecognizedClient",
+                "The Access Key ID or security token included in the request "
+                "is invalid.")
+        signed = match.group("signed_headers").split(";")
+        if any(name not in headers for name in signed):
+            self.metrics.incr("signature_failures")
+            raise SimulatorError(400, "IncompleteSignature",
+                                 "A signed header is missing.")
+        timestamp = datetime.datetime.strptime(headers["x-amz-date"],
+                                               "%Y%m%dT%H%M%SZ")
+        expected = AWSV4Auth(
+            access_key=match.group("access_key"), secret_key=secret_key,
+            host=headers.get("host"), region=match.group("region"),
+            service=match.group("service"), method_name="POST",
+            timestamp=timestamp,
+            headers={name: headers[name] for name in signed},
+            payload=body, path=path).get_headers()["Authorization"]
+        if expected != headers["authorization"] or \
+                match.group("region") != self.region:
+            self.metrics.incr("signature_failures")
+            raise SimulatorError(
+                401, "InvalidSignature",
+                "The request signature we calculated does not match the "
+                "signature you provided.")
+        return match.group("access_key")
+
+    def _item(self, index, resources):
+        return select_resources(search_item(index), resources)
+
+    def _SearchItems(self, request):
+        item_count = request.get("ItemCount", 10)
+        item_page = request.get("ItemPage", 1)
+        base = zlib.crc32(json.dumps(
+            [request.get("Keywords"), request.get("SearchIndex")]).encode(
+                "utf-8")) % 100000 * 1000
+        indexes = range(base, base + self.total_results)
+        if self.honour_filters:
+            indexes = [index for index in indexes
+                       if matches_filters(search_item(index), request)]
+        first = (item_page - 1) * item_count
+        if first >= len(indexes):
+            raise SimulatorError(404, "NoResults",
+                                 "No results found for your request.")
+        resources = request.get("Resources")
+        result = {
+            "Items": [self._item(index, resources)
+                      for index in indexes[first:first + item_count]],
+            "SearchURL": "https://www.amazon.fr/s?k=%s"
+                         % (request.get("Keywords") or ""),
+            "TotalResultCount": len(indexes),
+        }
+        if resources and "SearchRefinements" in resources:
+            result["SearchRefinements"] = {"SearchIndex": {
+                "Bins": [{"DisplayName": "High-Tech", "Id": "Electronics"}],
+                "DisplayName": "Catégorie", "Id": "SearchIndex"}}
+        return {"SearchResult": result}
+
+    def _GetItems(self, request):
+        resources = request.get("Resources")
+        items = []
+        for asin in request.get("ItemIds") or ():
+            index = int(asin[2:]) if asin[2:].isdigit() else \
+                zlib.crc32(asin.encode("utf-8"))
+            item = self._item(index, resources)
+            item["ASIN"] = asin
+            items.append(item)
+        return {"ItemsResult": {"Items": items}}
+
+    def _GetVariations(self, request):
+        asin = request.get("ASIN", "")
+        per_page = request.get("VariationCount", 10)
+        page = request.get("VariationPage", 1)
+        page_count = max(1, -(-self.variation_count // per_page))
+        first = (page - 1) * per_page
+        if first >= self.variation_count:
+            raise SimulatorError(404, "NoResults",
+                                 "No results found for your request.")
+        base = zlib.crc32(asin.encode("utf-8")) % 100000 * 1000
+        resources = request.get("Resources")
+        sizes = ("XS", "S", "M", "L", "XL")
+        items = []
+        for index in range(first, min(first + per_page,
+                                      self.variation_count)):
+            item = self._item(base + index, resources)
+            item["ParentASIN"] = asin
+            item["VariationAttributes"] = [
+                {"Name": "size_name", "Value": sizes[index % len(sizes)]},
+                {"Name": "color_name", "Value": "Couleur %d"
+                 % (index // len(sizes))},
+            ]
+            items.append(item)
+        return {"VariationsResult": {
+            "Items": items,
+            "VariationSummary": {
+                "PageCount": page_count,
+                "VariationCount": self.variation_count,
+                "VariationDimensions": [
+                    {"DisplayName": "Taille", "Locale": "fr_FR",
+                     "Name": "size_name", "Values": list(sizes)},
+                    {"DisplayName": "Couleur", "Locale": "fr_FR",
+                     "Name": "color_name",
+                     "Values": ["Couleur %d" % index for index in range(
+                         -(-self.variation_count // len(sizes)))]},
+                ],
+            },
+        }}
+
+    def _GetBrowseNodes(self, request):
+        if self.taxonomy is not None:
+            return self._taxonomy_nodes(request)
+        resources = request.get("Resources") or ()
+        nodes = []
+        for node_id in request.get("BrowseNodeIds") or ():
+            number = int(node_id) if node_id.isdigit() else \
+                zlib.crc32(node_id.encode("utf-8"))
+            node = {"Id": node_id, "DisplayName": "Catégorie %s" % node_id,
+                    "ContextFreeName": "Catégorie %s" % node_id,
+                    "IsRoot": number < 10}
+            if "BrowseNodes.Ancestor" in resources and number >= 10:
+                node["Ancestor"] = {"Id": str(number // 10),
+                                    "DisplayName": "Catégorie %d"
+                                                   % (number // 10),
+                                    "ContextFreeName": "Catégorie %d"
+                                                       % (number // 10)}
+            if "BrowseNodes.Children" in resources:
+                node["Children"] = [
+                    {"Id": str(number * 10 + child),
+                     "DisplayName": "Catégorie %d" % (number * 10 + child),
+                     "ContextFreeName": "Catégorie %d"
+                                        % (number * 10 + child)}
+                    for child in range(10)]
+            nodes.append(node)
+        return {"BrowseNodesResult": {"BrowseNodes": nodes}}
+
+    def _taxonomy_nodes(self, request):
+        resources = request.get("Resources") or ()
+        parents = {child: parent for parent, children in self.taxonomy.items()
+                   for child in children}
+
+        def named(node_id):
+            return {"Id": node_id, "DisplayName": "Catégorie %s" % node_id,
+                    "ContextFreeName": "Catégorie %s" % node_id}
+
+        nodes = []
+        errors = []
+        for node_id in request.get("BrowseNodeIds") or ():
+            if node_id not in self.taxonomy:
+                errors.append({
+                    "Code": "InvalidParameterValue",
+                    "Message": "The value [%s] provided in the request for "
+                               "BrowseNodeIds is invalid." % node_id})
+                continue
+            node = named(node_id)
+            node["IsRoot"] = node_id not in parents
+            if "BrowseNodes.Ancestor" in resources and node_id in parents:
+                chain = node
+                parent = parents[node_id]
+                while parent is not None:
+                    chain["Ancestor"] = named(parent)
+                    chain = chain["Ancestor"]
+                    parent = parents.get(parent)
+            if "BrowseNodes.Children" in resources:
+                node["Children"] = [named(child)
+                                    for child in self.taxonomy[node_id]]
+            nodes.append(node)
+        payload = {"BrowseNodesResult": {"BrowseNodes": nodes}}
+        if errors:
+            if not nodes:
+                raise SimulatorError(400, errors[0]["Code"],
+                                     errors[0]["Message"])
+            payload["Errors"] = errors
+        return payload
+
+    def _handler_class(self):
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately: without this, Nagle
+            # and delayed ACKs add ~40 ms to every response.
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                headers = {name.lower(): value
+                           for name, value in self.headers.items()}
+                try:
+                    status, payload = simulator.handle(self.path, headers,
+                                                       body)
+                except SimulatorError as error:
+                    status, payload = error.status, error_body(error.code,
+                                                               error.message)
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type",
+                                 "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("x-amzn-RequestId",
+                                 hashlib.md5(body).hexdigest())
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def load_service(simulator):
+    """Imports main.py (the Flask service) and points it at `simulator`,
+    whatever credentials and host the environment configures."""
+    for name, value in (("ACCESS_KEY", SIMULATOR_ACCESS_KEY),
+                        ("SECRET_KEY", SIMULATOR_SECRET_KEY),
+                        ("ASSOCIATE_TAG", "dummy-21")):
+        os.environ.setdefault(name, value)
+    import main as service
+
+    service.ACCESS_KEY = SIMULATOR_ACCESS_KEY
+    service.SECRET_KEY = SIMULATOR_SECRET_KEY
+    service.HOST = simulator.host
+    service.REGION = simulator.region
+    service.SCHEME = "http"
+    return service
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=parse_latency, default=None,
+                        help="constant:S, uniform:LOW:HIGH or "
+                             "lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--tps", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--total-results", type=int, default=100)
+    parser.add_argument("--honour-filters", action="store_true")
+    parser.add_argument("--no-signature-check", action="store_true")
+    args = parser.parse_args(argv)
+
+    simulator = PaapiSimulator(
+        host=args.host, port=args.port, latency=args.latency,
+        throttle_rate=args.throttle_rate, tps=args.tps,
+        error_rate=args.error_rate, total_results=args.total_results,
+        honour_filters=args.honour_filters,
+        credentials=False if args.no_signature_check else None)
+    print("PA-API simulator on http://%s (access key %s, secret key %s, "
+          "region %s)" % (simulator.host, SIMULATOR_ACCESS_KEY,
+                          SIMULATOR_SECRET_KEY, simulator.region))
+    try:
+        simulator._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    End-to-end benchmark suite, one entry per stage of a request:
+
+      sign          AWSV4Auth.get_headers
+      serialize     ApiClient.sanitize_for_serialization / serialize_body
+      transport     RESTClientObject.request against the local simulator
+      deserialize   ApiClient.deserialize, for each response type
+      flask         GET /search through the Flask test client, main.py
+                    talking to the local simulator
+
+    Each benchmark reports operations/sec (best of --repeat runs) and, under
+    tracemalloc, the peak memory allocated by one operation and the memory
+    it leaves allocated. Results can be saved as a baseline and later runs
+    compared against it; the exit status is 1 when a benchmark is slower, or
+    allocates more, than the baseline by more than --tolerance. Nothing
+    leaves the machine.
+
+    python -m benchmarks.suite [--filter deserialize] [--save baseline.json]
+        [--compare baseline.json] [--tolerance 0.15]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+
+from benchmarks import fixtures
+from benchmarks.payload_generator import PayloadGenerator, RESPONSE_TYPES
+from benchmarks.simulator import (PaapiSimulator, SIMULATOR_ACCESS_KEY,
+                                  SIMULATOR_SECRET_KEY, load_service)
+from paapi5_python_sdk.api_client import ApiClient
+from paapi5_python_sdk.auth.sign_helper import AWSV4Auth
+
+# Operations traced per benchmark for the allocation figures.
+ALLOCATION_SAMPLES = 20
+
+
+class Benchmark(object):
+    """A named operation to time.
+
+    :param name: `stage.case`, used by --filter and in baselines.
+    :param function: callable without arguments, one operation.
+    """
+
+    def __init__(self, name, function):
+        self.name = name
+        self.function = function
+
+
+def measure(function, repeat=5, min_time=0.2):
+    """Returns operations/sec, best of `repeat` runs of >= `min_time` s."""
+    timer = timeit.Timer(function)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return number / best
+
+
+def measure_allocations(function, samples=ALLOCATION_SAMPLES):
+    """Returns (median peak bytes, median retained bytes) per operation."""
+    function()
+    peaks = []
+    retained = []
+    tracemalloc.start()
+    try:
+        for _ in range(samples):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            function()
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+    finally:
+        tracemalloc.stop()
+    return int(statistics.median(peaks)), int(statistics.median(retained))
+
+
+def _api_client(simulator=None):
+    if simulator is not None:
+        return simulator.api_client()
+    return ApiClient(access_key=SIMULATOR_ACCESS_KEY,
+                     secret_key=SIMULATOR_SECRET_KEY,
+                     host="webservices.amazon.fr", region="eu-west-1")
+
+
+def sign_benchmarks(simulator):
+    body = fixtures.search_items_request().to_dict()
+    timestamp = datetime.datetime.utcnow()
+
+    def sign():
+        return AWSV4Auth(
+            access_key=SIMULATOR_ACCESS_KEY, secret_key=SIMULATOR_SECRET_KEY,
+            host="webservices.amazon.fr", region="eu-west-1",
+            service="ProductAdvertisingAPI", method_name="POST",
+            timestamp=timestamp, headers={
+                "host": "webservices.amazon.fr",
+                "content-encoding": "amz-1.0",
+                "x-amz-date": timestamp.strftime("%Y%m%dT%H%M%SZ"),
+                "x-amz-target": "com.amazon.paapi5.v1."
+                                "ProductAdvertisingAPIv1.SearchItems",
+                "Content-Type": "application/json; charset=utf-8",
+            }, payload=body, path="/paapi5/searchitems").get_headers()
+
+    return [Benchmark("sign.search_items", sign)]
+
+
+def serialize_benchmarks(simulator):
+    api_client = _api_client()
+    request = fixtures.search_items_request()
+    return [
+        Benchmark("serialize.sanitize_for_serialization",
+                  lambda: api_client.sanitize_for_serialization(request)),
+        Benchmark("serialize.serialize_body",
+                  lambda: api_client.serialize_body(request)),
+    ]
+
+
+def transport_benchmarks(simulator):
+    api_client = _api_client(simulator)
+    body = api_client.serialize_body(fixtures.search_items_request())
+    headers = {}
+    api_client.update_params_for_auth(headers, [], None, "SearchItems",
+                                      "POST", body, "/paapi5/searchitems")
+    url = "http://%s/paapi5/searchitems" % simulator.host
+
+    def request():
+        response = api_client.rest_client.request("POST", url,
+                                                  headers=dict(headers),
+                                                  body=body)
+        assert response.status == 200, response.data
+
+    return [Benchmark("transport.search_items", request)]
+
+
+def deserialize_benchmarks(simulator):
+    api_client = _api_client()
+    payloads = [
+        ("SearchItemsResponse", fixtures.search_items_response()),
+        ("GetItemsResponse", fixtures.get_items_response()),
+        ("GetVariationsResponse", fixtures.get_variations_response()),
+        ("GetBrowseNodesResponse", fixtures.get_browse_nodes_response()),
+    ]
+    # Every attribute populated, several listings and promotions per item.
+    generator = PayloadGenerator(item_count=10, listings=3, promotions=2,
+                                 browse_node_depth=3)
+    payloads.extend((response_type + ".generated",
+                     generator.generate(response_type))
+                    for response_type in RESPONSE_TYPES)
+    benchmarks = []
+    for name, payload in payloads:
+        response_type = name.split(".")[0]
+        response = fixtures.RawResponse(json.dumps(payload))
+        benchmarks.append(Benchmark(
+            "deserialize." + name,
+            lambda response=response, response_type=response_type:
+                api_client.deserialize(response, response_type)))
+    return benchmarks
+
+
+def flask_benchmarks(simulator):
+    main = load_service(simulator)
+    client = main.app.test_client()
+    url = "/search?keywords=casque+bluetooth"
+
+    def search(cached):
+        if not cached:
+            main.SEARCH_CACHE.clear()
+        # /search logs every request on stdout.
+        with contextlib.redirect_stdout(io.StringIO()):
+            response = client.get(url)
+        assert response.status_code == 200, response.data
+
+    return [
+        Benchmark("flask.search", lambda: search(cached=False)),
+        Benchmark("flask.search_cached", lambda: search(cached=True)),
+    ]
+
+
+STAGES = [sign_benchmarks, serialize_benchmarks, transport_benchmarks,
+          deserialize_benchmarks, flask_benchmarks]
+
+
+def run(filters=(), repeat=5, min_time=0.2, allocations=True, out=sys.stdout):
+    """Runs the benchmarks whose name contains one of `filters`.
+
+    :return: dict name -> {'ops_per_sec', 'peak_bytes', 'retained_bytes'}.
+    """
+    results = {}
+    with PaapiSimulator(total_results=100, seed=0) as simulator:
+        out.write("%-46s %14s %12s %12s\n" % ("benchmark", "ops/sec",
+                                            "peak B/op", "kept B/op"))
+        for stage in STAGES:
+            for benchmark in stage(simulator):
+                if filters and not any(f in benchmark.name for f in filters):
+                    continue
+                result = {"ops_per_sec": measure(benchmark.function, repeat,
+                                                 min_time)}
+                if allocations:
+                    result["peak_bytes"], result["retained_bytes"] = \
+                        measure_allocations(benchmark.function)
+                results[benchmark.name] = result
+                out.write("%-46s %14.1f %12s %12s\n" % (
+                    benchmark.name, result["ops_per_sec"],
+                    result.get("peak_bytes", "-"),
+                    result.get("retained_bytes", "-")))
+    return results
+
+
+def save_baseline(path, results):
+    with open(path, "w") as baseline:
+        json.dump({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.datetime.utcnow().isoformat() + "Z",
+            "results": results,
+        }, baseline, indent=2, sort_keys=True)
+
+
+def compare(results, baseline, tolerance):
+    """Returns a list of (name, message) regressions against `baseline`."""
+    regressions = []
+    for name, result in sorted(results.items()):
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        ratio = result["ops_per_sec"] / reference["ops_per_sec"]
+        if ratio < 1 - tolerance:
+            regressions.append((name, "%.1f ops/sec vs %.1f (%+.0f%%)" % (
+                result["ops_per_sec"], reference["ops_per_sec"],
+                (ratio - 1) * 100)))
+        if "peak_bytes" in result and reference.get("peak_bytes"):
+            ratio = float(result["peak_bytes"]) / reference["peak_bytes"]
+            if ratio > 1 + tolerance:
+                regressions.append((name, "%d peak B/op vs %d (%+.0f%%)" % (
+                    result["peak_bytes"], reference["peak_bytes"],
+                    (ratio - 1) * 100)))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--filter", action="append", default=[],
+                        help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="seconds per timed run")
+    parser.add_argument("--no-allocations", action="store_true")
+    parser.add_argument("--save", metavar="PATH",
+                        help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH",
+                        help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="accepted relative slowdown/allocation growth")
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.repeat, args.min_time,
+                  not args.no_allocations)
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare:
+        with open(args.compare) as baseline:
+            regressions = compare(results, json.load(baseline)["results"],
+                                  args.tolerance)
+        for name, message in regressions:
+            print("REGRESSION %s: %s" % (name, message))
+        if regressions:
+            return 1
+        print("No regression against %s." % args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
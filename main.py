@@ -1,6 +1,9 @@
 
+import atexit
+import copy
 import os
 import sys
+import threading
 from datetime import datetime
 from flask import Flask, request, jsonify
 from dotenv import load_dotenv
@@ -16,9 +19,28 @@ if sdk_path not in sys.path:
 # Import necessary modules from SDK
 from paapi5_python_sdk.api_client import ApiClient
 from paapi5_python_sdk.api.default_api import DefaultApi
+from paapi5_python_sdk.cache import ResponseCache
+from paapi5_python_sdk.cassette import Cassette
+from paapi5_python_sdk.circuit_breaker import CircuitBreaker, CircuitOpenError
+from paapi5_python_sdk.compression import PayloadCodec
+from paapi5_python_sdk.concurrency import ConcurrencyLimiter
+from paapi5_python_sdk.configuration import Configuration
+from paapi5_python_sdk.credentials import (Credential, CredentialPool,
+                                           parse_credentials)
+from paapi5_python_sdk.deadline import Deadline
+from paapi5_python_sdk.filters import SearchFilter
+from paapi5_python_sdk.hedging import HedgingPolicy
+from paapi5_python_sdk.marketplaces import (MARKETPLACES, MarketplaceSearch,
+                                            get_marketplace)
+from paapi5_python_sdk.metrics import MetricsRegistry
 from paapi5_python_sdk.models.search_items_request import SearchItemsRequest
 from paapi5_python_sdk.models.partner_type import PartnerType
 from paapi5_python_sdk.models.search_items_resource import SearchItemsResource
+from paapi5_python_sdk.pagination import (asin_key, parent_asin_key,
+                                          search_pages)
+from paapi5_python_sdk.prepared_request import PreparedRequest
+from paapi5_python_sdk.resources import ResourceUsage, resources_for
+from paapi5_python_sdk.scheduler import INTERACTIVE, PriorityScheduler
 from paapi5_python_sdk.rest import ApiException
 
 # Initialize Flask app
@@ -28,97 +50,395 @@ app = Flask(__name__)
 ACCESS_KEY = os.getenv("ACCESS_KEY")
 SECRET_KEY = os.getenv("SECRET_KEY")
 ASSOCIATE_TAG = os.getenv("ASSOCIATE_TAG")
-HOST='webservices.amazon.fr'
-REGION='eu-west-1'
+# Tags partenaire par place de marché (ex. "fr:xx-21,de:yy-21"), sinon
+# ASSOCIATE_TAG partout
+ASSOCIATE_TAGS = dict(
+    entry.strip().split(":", 1)
+    for entry in os.getenv("ASSOCIATE_TAGS", "").split(",") if entry.strip())
+HOST = os.getenv("PAAPI_HOST", "webservices.amazon.fr")
+REGION = os.getenv("PAAPI_REGION", "eu-west-1")
+# "http" uniquement pour viser un simulateur local (benchmarks.simulator)
+SCHEME = os.getenv("PAAPI_SCHEME", "https")
+
+# Budget de temps d'une recherche complète (toutes pages confondues) et
+# nombre de pages demandées en parallèle
+SEARCH_DEADLINE_SECONDS = float(os.getenv("SEARCH_DEADLINE_SECONDS", "8"))
+SEARCH_PAGE_CONCURRENCY = int(os.getenv("SEARCH_PAGE_CONCURRENCY", "1"))
+# Pages en échec (throttling, 5xx, réseau) redemandées après les autres, et
+# mode résultats partiels par défaut de /search (sinon ?partial=1)
+SEARCH_PAGE_RETRIES = int(os.getenv("SEARCH_PAGE_RETRIES", "1"))
+SEARCH_PAGE_RETRY_DELAY = float(os.getenv("SEARCH_PAGE_RETRY_DELAY", "0.5"))
+SEARCH_PARTIAL_RESULTS = os.getenv("SEARCH_PARTIAL_RESULTS", "0") == "1"
+# Dédoublonnage des résultats par ASIN, ou par ASIN parent pour ne garder
+# qu'une déclinaison (taille, couleur...) de chaque produit
+SEARCH_COLLAPSE_VARIATIONS = os.getenv("SEARCH_COLLAPSE_VARIATIONS",
+                                       "0") == "1"
+# Journalise les ressources PA-API demandées mais jamais lues par
+# format_items (à n'activer que pour le diagnostic)
+PAAPI_RESOURCE_DEBUG = os.getenv("PAAPI_RESOURCE_DEBUG", "0") == "1"
 
 # Check environment variables
 if not ACCESS_KEY or not SECRET_KEY or not ASSOCIATE_TAG:
     raise ValueError("Missing ACCESS_KEY, SECRET_KEY, or ASSOCIATE_TAG.")
+for code in ASSOCIATE_TAGS:
+    get_marketplace(code)
 
-@app.route('/search', methods=['GET'])
-def amazon_search():
-    amazon_api = DefaultApi(
-        access_key=ACCESS_KEY, secret_key=SECRET_KEY, host=HOST, region=REGION
+# Disjoncteur par hôte/région : quand PA-API échoue ou ralentit, les appels
+# échouent immédiatement au lieu de bloquer les workers jusqu'au timeout
+metrics = MetricsRegistry()
+CIRCUIT_BREAKER = CircuitBreaker(
+    failure_rate=float(os.getenv("PAAPI_BREAKER_FAILURE_RATE", "0.5")),
+    slow_call_seconds=float(os.getenv("PAAPI_BREAKER_SLOW_CALL_SECONDS",
+                                      "10")),
+    open_seconds=float(os.getenv("PAAPI_BREAKER_OPEN_SECONDS", "30")),
+    metrics=metrics,
+)
+
+# Cache des résultats de /search : une entrée périmée est servie immédiatement
+# et rafraîchie en arrière-plan, les erreurs déterministes (NoResults, ...)
+# sont mises en cache pour ne plus consommer de quota. Les entrées sont
+# stockées compressées (zstd si disponible, sinon zlib). Disjoncteur ouvert :
+# une entrée expirée est servie plutôt qu'une erreur.
+SEARCH_CACHE = ResponseCache(
+    ttl=int(os.getenv("SEARCH_CACHE_TTL", "300")),
+    stale_ttl=int(os.getenv("SEARCH_CACHE_STALE_TTL", "3600")),
+    negative_ttl=int(os.getenv("SEARCH_CACHE_NEGATIVE_TTL", "600")),
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024")),
+    metrics=metrics,
+    name="search_cache",
+    codec=PayloadCodec(
+        encoding=os.getenv("SEARCH_CACHE_ENCODING", "json"),
+        compression=os.getenv("SEARCH_CACHE_COMPRESSION") or None,
+    ),
+    serve_expired_on=(CircuitOpenError,),
+    # NoResults sur la première page donne une recherche complète et vide :
+    # elle est gardée SEARCH_CACHE_NEGATIVE_TTL secondes comme l'erreur
+    is_negative=lambda search: search["complete"] and not search["results"],
+)
+
+# Enregistrement (PAAPI_CASSETTE_MODE=record) ou rejeu hors ligne
+# (PAAPI_CASSETTE_MODE=replay) des réponses PA-API, pour comparer les
+# performances de versions successives sur un trafic réel
+CASSETTE = None
+if os.getenv("PAAPI_CASSETTE"):
+    CASSETTE = Cassette(
+        os.getenv("PAAPI_CASSETTE"),
+        mode=os.getenv("PAAPI_CASSETTE_MODE", "replay"),
+        latency_scale=float(os.getenv("PAAPI_CASSETTE_LATENCY_SCALE", "1")),
+        metrics=metrics,
+    )
+    atexit.register(CASSETTE.close)
+
+# Requêtes de couverture : une page plus lente que le percentile
+# PAAPI_HEDGING_PERCENTILE des latences observées est redemandée, la
+# première réponse gagne (au plus PAAPI_HEDGING_MAX_RATE des requêtes)
+HEDGING = None
+if os.getenv("PAAPI_HEDGING_PERCENTILE"):
+    HEDGING = HedgingPolicy(
+        percentile=float(os.getenv("PAAPI_HEDGING_PERCENTILE")),
+        max_hedge_rate=float(os.getenv("PAAPI_HEDGING_MAX_RATE", "0.05")),
+        metrics=metrics,
+    )
+
+# Nombre de requêtes PA-API simultanées, toutes recherches confondues :
+# augmenté tant que les réponses sont bonnes, divisé par deux à chaque
+# TooManyRequests (au plus PAAPI_CONCURRENCY_MAX_LIMIT). À combiner avec
+# SEARCH_PAGE_CONCURRENCY > 1
+CONCURRENCY_LIMITER = None
+if os.getenv("PAAPI_CONCURRENCY_MAX_LIMIT"):
+    CONCURRENCY_LIMITER = ConcurrencyLimiter(
+        initial_limit=int(os.getenv("PAAPI_CONCURRENCY_INITIAL_LIMIT", "2")),
+        max_limit=int(os.getenv("PAAPI_CONCURRENCY_MAX_LIMIT")),
+        metrics=metrics,
+    )
+
+# File d'attente par priorité devant PA-API, partagée avec les traitements
+# par lots du même processus : les appels de /search passent en priorité
+# (voie "interactive"), les lots se partagent la capacité restante
+SCHEDULER = None
+if os.getenv("PAAPI_SCHEDULER_MAX_IN_FLIGHT"):
+    SCHEDULER = PriorityScheduler(
+        max_in_flight=int(os.getenv("PAAPI_SCHEDULER_MAX_IN_FLIGHT")),
+        limiter=CONCURRENCY_LIMITER,
+        metrics=metrics,
+    )
+
+# Identifiants supplémentaires (access_key:secret_key:partner_tag[:tps],
+# séparés par des virgules) : chaque requête part avec l'identifiant le moins
+# chargé, le quota de chacun s'ajoute à celui du compte principal. Tags par
+# place de marché de chaque identifiant : partner_tag;fr=xx-21;de=yy-21 (ceux
+# du compte principal viennent d'ASSOCIATE_TAGS)
+CREDENTIAL_POOL = None
+if os.getenv("PAAPI_EXTRA_CREDENTIALS"):
+    CREDENTIAL_POOL = CredentialPool(
+        [Credential(ACCESS_KEY, SECRET_KEY, ASSOCIATE_TAG,
+                    tps=float(os.getenv("PAAPI_TPS", "1")),
+                    partner_tags=ASSOCIATE_TAGS)] +
+        parse_credentials(os.getenv("PAAPI_EXTRA_CREDENTIALS")),
+        metrics=metrics,
+    )
+
+
+# Champs des articles lus par format_items : les ressources PA-API demandées
+# en sont déduites, rien d'autre n'alourdit les réponses
+SEARCH_FIELDS = [
+    "asin",
+    "detail_page_url",
+    "item_info.title.display_value",
+    "offers.listings[*].price.display_amount",
+    "offers.listings[*].delivery_info.is_prime_eligible",
+    "images.primary.large.url",
+]
+SEARCH_RESOURCES = resources_for(SEARCH_FIELDS)
+
+
+def format_items(items):
+    """Met en forme les articles renvoyés par PA-API pour la réponse JSON."""
+    return [
+        {
+            "title": item.item_info.title.display_value,
+            "url": item.detail_page_url,
+            "price": item.offers.listings[
+                0].price.display_amount if item.offers and item.offers.listings else 'N/A',
+            "primary_image": item.images.primary.large.url if hasattr(item, 'images') and hasattr(
+                item.images, 'primary') and hasattr(item.images.primary, 'large') else 'N/A',
+            "ASIN": item.asin,
+            "prime_eligible": any(
+                listing.delivery_info.is_prime_eligible
+                for listing in item.offers.listings
+                if listing is not None and listing.delivery_info is not None
+            ) if item.offers and item.offers.listings else False
+        }
+        for item in items
+    ]
+
+
+def has_listing(item):
+    """Vrai si l'article a au moins une offre avec un prix."""
+    return bool(item.offers and item.offers.listings and
+                item.offers.listings[0].price is not None)
+
+
+# Un client (et un pool de connexions) par place de marché, partagé par
+# toutes les recherches multi-places de marché : au plus un par place de
+# marché connue
+MARKETPLACE_APIS = {}
+MARKETPLACE_APIS_LOCK = threading.Lock()
+
+def search_configuration():
+    configuration = Configuration()
+    configuration.scheme = SCHEME
+    configuration.cassette = CASSETTE
+    configuration.hedging = HEDGING
+    configuration.circuit_breaker = CIRCUIT_BREAKER
+    configuration.concurrency_limiter = CONCURRENCY_LIMITER
+    configuration.scheduler = SCHEDULER
+    configuration.credential_pool = CREDENTIAL_POOL
+    return configuration
+
+
+def host_denomination(host):
+    """Unités monétaires minimales par unité de la devise de `host` (100
+    pour les centimes, 1 pour le yen)."""
+    for marketplace in MARKETPLACES.values():
+        if marketplace.host == host:
+            return marketplace.denomination
+    return 100
+
+
+def marketplace_search(marketplaces):
+    """Renvoie une MarketplaceSearch des places de marché données, sur les
+    clients de MARKETPLACE_APIS (créés à la première recherche qui les
+    demande).
+
+    :raises ValueError: pour une place de marché inconnue.
+    """
+    marketplaces = [get_marketplace(code) for code in marketplaces]
+    with MARKETPLACE_APIS_LOCK:
+        for marketplace in marketplaces:
+            if marketplace.code not in MARKETPLACE_APIS:
+                MARKETPLACE_APIS[marketplace.code] = DefaultApi(
+                    api_client=ApiClient(
+                        access_key=ACCESS_KEY, secret_key=SECRET_KEY,
+                        host=marketplace.host, region=marketplace.region,
+                        configuration=search_configuration()))
+        apis = {marketplace.code: MARKETPLACE_APIS[marketplace.code]
+                for marketplace in marketplaces}
+    return MarketplaceSearch(ACCESS_KEY, SECRET_KEY, marketplaces,
+                             partner_tags=ASSOCIATE_TAGS, apis=apis)
+
+def fetch_search_results(keywords, search_index, marketplaces=None):
+    # Ressources nécessaires à format_items, plus ParentASIN pour regrouper
+    # les déclinaisons (les filtres ajoutent les leurs)
+    resources = list(SEARCH_RESOURCES)
+    if SEARCH_COLLAPSE_VARIATIONS:
+        resources.append(SearchItemsResource.PARENTASIN)
+
+    desired_total = 100  # Nombre total de résultats souhaité
+    results_per_page = 10  # Nombre de résultats par page (maximum possible)
+    pages_needed = desired_total // results_per_page  # Nombre de pages requis
+
+    search_request = SearchItemsRequest(
+        partner_tag=ASSOCIATE_TAG,
+        partner_type=PartnerType.ASSOCIATES,
+        keywords=keywords,
+        search_index=search_index,
+        item_count=results_per_page,
+        item_page=1,
+        resources=resources,
+    )
+    # Filtres appliqués par PA-API (prix minimum, livraison Prime,
+    # disponibilité) : les articles écartés n'occupent aucune page. Seuls
+    # les articles sans offre sont écartés localement, et seuls les articles
+    # gardés comptent pour desired_total. Le prix minimum n'est pas converti
+    # d'une devise à l'autre : c'est 25 dans la devise de chaque place de
+    # marché (25 EUR, 25 GBP, 25 JPY...)
+    search_filter = SearchFilter(
+        min_price=25,
+        availability=Availability.AVAILABLE,
+        delivery_flags=[DeliveryFlag.PRIME],
+        predicates=[has_listing],
+    )
+    # Les articles déjà vus (pages qui se recouvrent, déclinaisons) sont
+    # écartés au fil des pages, et aucune page n'est demandée une fois
+    # desired_total articles uniques obtenus
+    search_options = dict(
+        unique_by=parent_asin_key if SEARCH_COLLAPSE_VARIATIONS else asin_key,
+        target=desired_total,
+        item_filter=search_filter,
+        deadline=Deadline(SEARCH_DEADLINE_SECONDS),
+        concurrency=SEARCH_PAGE_CONCURRENCY,
+        partial=True,
+        retries=SEARCH_PAGE_RETRIES,
+        retry_delay=SEARCH_PAGE_RETRY_DELAY,
+        _priority=INTERACTIVE,
     )
 
+    if marketplaces:
+        # Même recherche sur plusieurs places de marché en parallèle (un
+        # client et un pool de connexions chacune) : la durée totale est
+        # celle de la plus lente. Chaque résultat indique sa place de marché
+        outcome = marketplace_search(marketplaces).search_items(
+            search_request, pages=pages_needed, **search_options)
+        total_results = []
+        errors = []
+        for code, pages in outcome.results.items():
+            metrics.incr("search.pages_saved", pages.pages_saved)
+            for result in format_items(pages.items)[:desired_total]:
+                result["marketplace"] = code
+                total_results.append(result)
+            for error in pages.page_errors():
+                error["marketplace"] = code
+                errors.append(error)
+        for code, error in outcome.errors.items():
+            print(f"[WARNING] Marketplace {code} failed: {error}")
+            errors.append({"marketplace": code, "page": None,
+                           "status": getattr(error, "status", None),
+                           "codes": error.error_codes()
+                           if isinstance(error, ApiException) else [],
+                           "message": str(error)})
+        return {
+            "results": total_results,
+            "complete": outcome.complete,
+            "deadline_exceeded": any(pages.deadline_exceeded for pages
+                                     in outcome.results.values()),
+            "errors": errors,
+        }
+
+    amazon_api = DefaultApi(api_client=ApiClient(
+        access_key=ACCESS_KEY, secret_key=SECRET_KEY, host=HOST, region=REGION,
+        configuration=search_configuration(),
+    ))
+    # Créer et encoder la requête de recherche une seule fois : seules les
+    # pages diffèrent, elles sont injectées dans l'encodage mis en cache
+    search_filter = search_filter.with_denomination(host_denomination(HOST))
+    search_options["item_filter"] = search_filter
+    search_request = PreparedRequest(search_filter.apply(search_request),
+                                     fields=('item_page',))
+
+    # Toutes les pages partagent le même budget de temps : une fois épuisé,
+    # les pages restantes sont abandonnées et celles obtenues sont renvoyées.
+    # Une page en échec n'annule pas les autres : elle est signalée dans
+    # "errors" (une erreur n'est levée que si aucune page n'a abouti)
+    usage = None
+    if PAAPI_RESOURCE_DEBUG:
+        # Ressources réellement envoyées, y compris celles ajoutées par les
+        # filtres et ParentASIN. Le filtre et le dédoublonnage lisent les
+        # articles pendant la pagination : leurs lectures comptent aussi
+        usage = ResourceUsage(search_request.request.resources)
+        search_options["unique_by"] = usage.tracked(
+            search_options["unique_by"])
+        search_options["item_filter"] = copy.copy(search_filter)
+        search_options["item_filter"].matches = usage.tracked(
+            search_filter.matches)
+    pages = search_pages(amazon_api, search_request, pages=pages_needed,
+                         **search_options)
+    if pages.deadline_exceeded:
+        print(f"[WARNING] Search deadline exceeded, {len(pages.pages)} "
+              f"page(s) out of {pages_needed} returned")
+    for error in pages.page_errors():
+        print(f"[WARNING] Page {error['page']} failed: {error['message']}")
+    # Pages non demandées car desired_total articles ont suffi
+    metrics.incr("search.pages_saved", pages.pages_saved)
+
+    # Traiter les réponses
+    items = pages.items
+    if usage is not None:
+        items = usage.track(items)
+    total_results = format_items(items)
+    if usage is not None and usage.unused():
+        print(f"[DEBUG] Resources never read: {', '.join(usage.unused())}")
+
+    # Limite à 100 résultats uniques maximum
+    total_results = total_results[:desired_total]
+
+    return {
+        "results": total_results,
+        "complete": pages.complete,
+        "deadline_exceeded": pages.deadline_exceeded,
+        "errors": pages.page_errors(),
+    }
+
+
+@app.route('/search', methods=['GET'])
+def amazon_search():
     keywords = request.args.get('keywords')
     if not keywords:
         raise ValueError("Missing keywords.")
+    search_index = request.args.get('search_index', default='All')
+    # Places de marché à interroger en parallèle (ex. "fr,de,it,es"), sinon
+    # uniquement PAAPI_HOST
+    marketplaces = tuple(code.strip() for code in request.args.get(
+        'marketplaces', default='').split(',') if code.strip())
+    partial = request.args.get('partial', default='1' if SEARCH_PARTIAL_RESULTS
+                               else '0') in ('1', 'true')
+    try:
+        for code in marketplaces:
+            get_marketplace(code)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     print(f"[DEBUG] Received keywords: {keywords}")
 
     try:
-        # Define the resources needed for search
-        resources = [
-            SearchItemsResource.ITEMINFO_TITLE,
-            SearchItemsResource.ITEMINFO_BYLINEINFO,
-            SearchItemsResource.OFFERS_LISTINGS_PRICE,
-            SearchItemsResource.OFFERS_LISTINGS_CONDITION,
-            SearchItemsResource.ITEMINFO_CLASSIFICATIONS,
-            SearchItemsResource.CUSTOMERREVIEWS_STARRATING,
-            SearchItemsResource.IMAGES_PRIMARY_LARGE,
-            SearchItemsResource.BROWSENODEINFO_WEBSITESALESRANK,
-            SearchItemsResource.CUSTOMERREVIEWS_COUNT,
-            SearchItemsResource.OFFERS_LISTINGS_AVAILABILITY_TYPE,
-            SearchItemsResource.OFFERS_LISTINGS_DELIVERYINFO_ISPRIMEELIGIBLE,
-            SearchItemsResource.ITEMINFO_EXTERNALIDS
-        ]
-
-        total_results = []
-        desired_total = 100  # Nombre total de résultats souhaité
-        results_per_page = 10  # Nombre de résultats par page (maximum possible)
-        pages_needed = desired_total // results_per_page  # Nombre de pages requis
-
-        for page in range(1, pages_needed + 1):
-            # Créer la requête de recherche pour chaque page
-            search_request = SearchItemsRequest(
-                partner_tag=ASSOCIATE_TAG,
-                partner_type=PartnerType.ASSOCIATES,
-                keywords=keywords,
-                search_index=request.args.get('search_index', default='All'),
-                item_count=results_per_page,
-                item_page=page,  # Utilisation du paramètre de pagination
-                resources=resources,
-                availability=Availability.AVAILABLE,
-                delivery_flags=[DeliveryFlag.PRIME],
-                min_price=2500  # Exemple de filtre de prix pour 30 EUR minimum
-            )
-
-            # Faire la requête et récupérer la réponse
-            response = amazon_api.search_items(search_request)
-
-            # Traiter la réponse
-            if response and response.search_result and response.search_result.items:
-                results = [
-                    {
-                        "title": item.item_info.title.display_value,
-                        "url": item.detail_page_url,
-                        "price": item.offers.listings[
-                            0].price.display_amount if item.offers and item.offers.listings else 'N/A',
-                        "primary_image": item.images.primary.large.url if hasattr(item, 'images') and hasattr(
-                            item.images, 'primary') and hasattr(item.images.primary, 'large') else 'N/A',                        
-                        "ASIN": item.asin,
-                        "prime_eligible": any(
-                            listing.delivery_info.is_prime_eligible
-                            for listing in item.offers.listings
-                            if listing is not None and listing.delivery_info is not None
-                        ) if item.offers and item.offers.listings else False
-                    }
-                    for item in response.search_result.items
-                    if item.offers and item.offers.listings and item.offers.listings[0].price.amount >= 25
-                    # Filtre de prix en EUR
-                ]
-                total_results.extend(results)  # Ajoute les résultats de cette page
-
-            # Arrête la boucle si le nombre de résultats souhaité est atteint
-            if len(total_results) >= desired_total:
-                break
-
-        # Limite à 100 résultats uniques maximum
-        total_results = total_results[:desired_total]
+        key = (keywords, search_index) + marketplaces
+        search = SEARCH_CACHE.get_or_load(
+            key, lambda: fetch_search_results(keywords, search_index,
+                                              marketplaces))
+        if not search["complete"]:
+            # Un résultat incomplet n'est pas gardé : la requête suivante
+            # redemande toutes les pages
+            SEARCH_CACHE.invalidate(key)
 
+        # Mode partiel : les pages obtenues, la liste des pages en échec et
+        # l'indicateur de complétude. Sinon, tout ou rien comme auparavant
+        if partial:
+            return jsonify(search), 200
+        if search["errors"]:
+            return jsonify({"error": search["errors"][0]["message"],
+                            "errors": search["errors"]}), 500
         # Retourne les résultats finaux sous forme de JSON
-        return jsonify(total_results), 200
+        return jsonify(search["results"]), 200
 
     except ApiException as e:
         print(f"[ERROR] API Exception: {str(e)}")
@@ -128,5 +448,20 @@ def amazon_search():
         return jsonify({"error": f"An unexpected error occurred. {str(e)}"}), 500
 
 
+@app.route('/metrics', methods=['GET'])
+def service_metrics():
+    return jsonify({
+        "metrics": metrics.snapshot(),
+        "search_cache": SEARCH_CACHE.stats(),
+        "hedging": HEDGING.stats() if HEDGING is not None else None,
+        "circuit_breaker": CIRCUIT_BREAKER.stats(),
+        "concurrency": CONCURRENCY_LIMITER.stats()
+        if CONCURRENCY_LIMITER is not None else None,
+        "scheduler": SCHEDULER.stats() if SCHEDULER is not None else None,
+        "credentials": CREDENTIAL_POOL.stats()
+        if CREDENTIAL_POOL is not None else None,
+    }), 200
+
+
 if __name__ == '__main__':
     app.run(host="0.0.0.0", port=8080)
@@ -67,6 +67,8 @@ class DefaultApi(object):
         >>> result = thread.get()
 
         :param async_req bool
+        :param Deadline _deadline: time budget of the call, see paapi5_python_sdk.deadline
+        :param str _priority: scheduler lane of the call, see paapi5_python_sdk.scheduler
         :param GetBrowseNodesRequest get_browse_nodes_request: GetBrowseNodesRequest (required)
         :return: GetBrowseNodesResponse
                  If the method is called asynchronously,
@@ -88,6 +90,8 @@ class DefaultApi(object):
         >>> result = thread.get()
 
         :param async_req bool
+        :param Deadline _deadline: time budget of the call, see paapi5_python_sdk.deadline
+        :param str _priority: scheduler lane of the call, see paapi5_python_sdk.scheduler
         :param GetBrowseNodesRequest get_browse_nodes_request: GetBrowseNodesRequest (required)
         :return: GetBrowseNodesResponse
                  If the method is called asynchronously,
@@ -99,6 +103,8 @@ class DefaultApi(object):
         all_params.append('_return_http_data_only')
         all_params.append('_preload_content')
         all_params.append('_request_timeout')
+        all_params.append('_deadline')
+        all_params.append('_priority')
 
         params = locals()
         for key, val in six.iteritems(params['kwargs']):
@@ -149,6 +155,8 @@ class DefaultApi(object):
             _return_http_data_only=params.get('_return_http_data_only'),
             _preload_content=params.get('_preload_content', True),
             _request_timeout=params.get('_request_timeout'),
+            _deadline=params.get('_deadline'),
+            _priority=params.get('_priority'),
             collection_formats=collection_formats)
 
     def get_items(self, get_items_request, **kwargs):  # noqa: E501
@@ -160,6 +168,8 @@ class DefaultApi(object):
         >>> result = thread.get()
 
         :param async_req bool
+        :param Deadline _deadline: time budget of the call, see paapi5_python_sdk.deadline
+        :param str _priority: scheduler lane of the call, see paapi5_python_sdk.scheduler
         :param GetItemsRequest get_items_request: GetItemsRequest (required)
         :return: GetItemsResponse
                  If the method is called asynchronously,
@@ -181,6 +191,8 @@ class DefaultApi(object):
         >>> result = thread.get()
 
         :param async_req bool
+        :param Deadline _deadline: time budget of the call, see paapi5_python_sdk.deadline
+        :param str _priority: scheduler lane of the call, see paapi5_python_sdk.scheduler
         :param GetItemsRequest get_items_request: GetItemsRequest (required)
         :return: GetItemsResponse
                  If the method is called asynchronously,
@@ -192,6 +204,8 @@ class DefaultApi(object):
         all_params.append('_return_http_data_only')
         all_params.append('_preload_content')
         all_params.append('_request_timeout')
+        all_params.append('_deadline')
+        all_params.append('_priority')
 
         params = locals()
         for key, val in six.iteritems(params['kwargs']):
@@ -242,8 +256,39 @@ class DefaultApi(object):
             _return_http_data_only=params.get('_return_http_data_only'),
             _preload_content=params.get('_preload_content', True),
             _request_timeout=params.get('_request_timeout'),
+            _deadline=params.get('_deadline'),
+            _priority=params.get('_priority'),
             collection_formats=collection_formats)
 
+    def get_all_variations(self, get_variations_request, concurrency=4, **kwargs):  # noqa: E501
+        """Fetches every page of get_variations and merges them.
+
+        The first page tells how many pages the family has; the others are
+        fetched `concurrency` at a time, through the concurrency limiter
+        and scheduler of the configuration if any.
+        >>> result = api.get_all_variations(get_variations_request)
+        >>> result.items, result.variation_summary.variation_dimensions
+
+        :param GetVariationsRequest get_variations_request: GetVariationsRequest of the ASIN and resources (required)
+        :param int concurrency: pages fetched at a time after the first one
+        :param Deadline _deadline: time budget of the whole crawl, see paapi5_python_sdk.deadline
+        :return: VariationsResult holding the variations of every page,
+                 each ASIN once, and the VariationSummary of the first page
+                 (page count, variation count, VariationDimension list)
+        """
+        # imported here so that importing DefaultApi stays lazy
+        from paapi5_python_sdk.models.variations_result import VariationsResult
+        from paapi5_python_sdk.pagination import variation_pages
+
+        deadline = kwargs.pop('_deadline', None)
+        pages = variation_pages(self, get_variations_request, deadline=deadline,
+                                concurrency=concurrency, **kwargs)
+        first = pages.responses.get(1)
+        summary = None
+        if first is not None and first.variations_result is not None:
+            summary = first.variations_result.variation_summary
+        return VariationsResult(items=pages.items, variation_summary=summary)
+
     def get_variations(self, get_variations_request, **kwargs):  # noqa: E501
         """get_variations  # noqa: E501
 
@@ -253,6 +298,8 @@ class DefaultApi(object):
         >>> result = thread.get()
 
         :param async_req bool
+        :param Deadline _deadline: time budget of the call, see paapi5_python_sdk.deadline
+        :param str _priority: scheduler lane of the call, see paapi5_python_sdk.scheduler
         :param GetVariationsRequest get_variations_request: GetVariationsRequest (required)
         :return: GetVariationsResponse
                  If the method is called asynchronously,
@@ -274,6 +321,8 @@ class DefaultApi(object):
         >>> result = thread.get()
 
         :param async_req bool
+        :param Deadline _deadline: time budget of the call, see paapi5_python_sdk.deadline
+        :param str _priority: scheduler lane of the call, see paapi5_python_sdk.scheduler
         :param GetVariationsRequest get_variations_request: GetVariationsRequest (required)
         :return: GetVariationsResponse
                  If the method is called asynchronously,
@@ -285,6 +334,8 @@ class DefaultApi(object):
         all_params.append('_return_http_data_only')
         all_params.append('_preload_content')
         all_params.append('_request_timeout')
+        all_params.append('_deadline')
+        all_params.append('_priority')
 
         params = locals()
         for key, val in six.iteritems(params['kwargs']):
@@ -335,6 +386,8 @@ class DefaultApi(object):
             _return_http_data_only=params.get('_return_http_data_only'),
             _preload_content=params.get('_preload_content', True),
             _request_timeout=params.get('_request_timeout'),
+            _deadline=params.get('_deadline'),
+            _priority=params.get('_priority'),
             collection_formats=collection_formats)
 
     def search_items(self, search_items_request, **kwargs):  # noqa: E501
@@ -346,6 +399,8 @@ class DefaultApi(object):
         >>> result = thread.get()
 
         :param async_req bool
+        :param Deadline _deadline: time budget of the call, see paapi5_python_sdk.deadline
+        :param str _priority: scheduler lane of the call, see paapi5_python_sdk.scheduler
         :param SearchItemsRequest search_items_request: SearchItemsRequest (required)
         :return: SearchItemsResponse
                  If the method is called asynchronously,
@@ -367,6 +422,8 @@ class DefaultApi(object):
         >>> result = thread.get()
 
         :param async_req bool
+        :param Deadline _deadline: time budget of the call, see paapi5_python_sdk.deadline
+        :param str _priority: scheduler lane of the call, see paapi5_python_sdk.scheduler
         :param SearchItemsRequest search_items_request: SearchItemsRequest (required)
         :return: SearchItemsResponse
                  If the method is called asynchronously,
@@ -378,6 +435,8 @@ class DefaultApi(object):
         all_params.append('_return_http_data_only')
         all_params.append('_preload_content')
         all_params.append('_request_timeout')
+        all_params.append('_deadline')
+        all_params.append('_priority')
 
         params = locals()
         for key, val in six.iteritems(params['kwargs']):
@@ -428,4 +487,6 @@ class DefaultApi(object):
             _return_http_data_only=params.get('_return_http_data_only'),
             _preload_content=params.get('_preload_content', True),
             _request_timeout=params.get('_request_timeout'),
+            _deadline=params.get('_deadline'),
+            _priority=params.get('_priority'),
             collection_formats=collection_formats)
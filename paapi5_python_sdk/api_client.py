@@ -26,6 +26,7 @@ from __future__ import absolute_import
 """
 
 import datetime
+import functools
 import json
 import mimetypes
 from multiprocessing.pool import ThreadPool
@@ -40,6 +41,9 @@ from six.moves.urllib.parse import quote
 from paapi5_python_sdk.configuration import Configuration
 import paapi5_python_sdk.models
 from paapi5_python_sdk import rest
+from paapi5_python_sdk import credentials
+from paapi5_python_sdk import serializer
+from paapi5_python_sdk.scheduler import NORMAL
 
 from paapi5_python_sdk.auth.sign_helper import AWSV4Auth
 
@@ -101,6 +105,9 @@ class ApiClient(object):
         self.secret_key = secret_key
         self.host = host
         self.region = region
+        # marketplace code of `host`, picks the partner tag of each
+        # credential of Configuration.credential_pool
+        self.marketplace = None
 
     def __del__(self):
         self.pool.close()
@@ -123,12 +130,29 @@ class ApiClient(object):
             query_params=None, header_params=None, body=None, post_params=None,
             files=None, response_type=None, auth_settings=None,
             _return_http_data_only=None, collection_formats=None,
-            _preload_content=True, _request_timeout=None):
+            _preload_content=True, _request_timeout=None, _deadline=None,
+            _priority=None):
 
-        if self.access_key is None or self.secret_key is None:
+        config = self.configuration
+
+        if config.credential_pool is None and (
+                self.access_key is None or self.secret_key is None):
             raise ValueError("Missing Credentials (Access Key and SecretKey). Please specify credentials.")
 
-        config = self.configuration
+        # With a deadline, urllib3 must not retry on its own: each of its
+        # retries would get the whole timeout again.
+        retries = None
+        if _deadline is not None:
+            # raises DeadlineExceeded once the budget is spent
+            _deadline.check()
+            retries = False
+
+        def dispatch_timeout():
+            # Computed when the request leaves: waiting for the scheduler or
+            # the concurrency limiter spends the same budget.
+            if _deadline is None:
+                return _request_timeout
+            return _deadline.timeout(_request_timeout)
 
         # header parameters
         header_params = header_params or {}
@@ -165,22 +189,67 @@ class ApiClient(object):
             post_params = self.parameters_to_tuples(post_params,
                                                     collection_formats)
 
-        # auth setting
-        self.update_params_for_auth(header_params, query_params, auth_settings, api_name, method, body, resource_path)
-
-        # body
+        # body, encoded once so that the signed payload is the one sent
         if body:
-            body = self.sanitize_for_serialization(body)
+            body = self.serialize_body(body)
+
+        # auth setting
+        if config.credential_pool is None:
+            self.update_params_for_auth(header_params, query_params, auth_settings, api_name, method, body, resource_path)
 
         # request url
-        url = "https://" + self.host + resource_path
+        url = config.scheme + "://" + self.host + resource_path
 
         # perform request and return response
-        response_data = self.request(
-            method, url, query_params=query_params, headers=header_params,
-            post_params=post_params, body=body,
-            _preload_content=_preload_content,
-            _request_timeout=_request_timeout)
+        def send():
+            return self.request(
+                method, url, query_params=query_params,
+                headers=dict(header_params), post_params=post_params,
+                body=body, _preload_content=_preload_content,
+                _request_timeout=dispatch_timeout(), _retries=retries)
+
+        if config.credential_pool is not None:
+            # signed per attempt, with the credential the pool picks
+            def send_with(credential):
+                payload = body
+                if payload:
+                    partner_tag = credential.partner_tag_for(self.marketplace)
+                    payload = credentials.with_partner_tag(payload,
+                                                           partner_tag)
+                headers = dict(header_params)
+                self.update_params_for_auth(
+                    headers, query_params, auth_settings, api_name, method,
+                    payload, resource_path, credential=credential)
+                return self.request(
+                    method, url, query_params=query_params, headers=headers,
+                    post_params=post_params, body=payload,
+                    _preload_content=_preload_content,
+                    _request_timeout=dispatch_timeout(), _retries=retries)
+
+            send = functools.partial(config.credential_pool.call, send_with)
+
+        perform = send
+        if config.concurrency_limiter is not None:
+            # every attempt, hedges included, takes a slot
+            perform = functools.partial(
+                config.concurrency_limiter.call, send,
+                timeout=_deadline.remaining() if _deadline is not None
+                else None)
+        if config.hedging is not None and _preload_content:
+            # a streamed response cannot be raced against a duplicate
+            perform = functools.partial(config.hedging.call, perform)
+        if config.circuit_breaker is not None:
+            perform = functools.partial(config.circuit_breaker.call,
+                                        (self.host, self.region), perform)
+        if config.scheduler is not None:
+            # queueing time does not count as a slow call for the breaker,
+            # but it does spend the deadline (see dispatch_timeout)
+            response_data = config.scheduler.call(
+                perform, lane=_priority or NORMAL,
+                timeout=_deadline.remaining() if _deadline is not None
+                else None)
+        else:
+            response_data = perform()
 
         self.last_response = response_data
 
@@ -240,6 +309,20 @@ class ApiClient(object):
         return {key: self.sanitize_for_serialization(val)
                 for key, val in six.iteritems(obj_dict)}
 
+    def serialize_body(self, body):
+        """Encodes a request body into the JSON bytes sent on the wire.
+
+        Uses the per-class compiled serializer, which produces the same
+        document as `json.dumps(self.sanitize_for_serialization(body))`.
+        Bytes are assumed to be already encoded and returned unchanged.
+
+        :param body: swagger model, dict or bytes.
+        :return: UTF-8 encoded JSON.
+        """
+        if isinstance(body, bytes):
+            return body
+        return serializer.dumps(body).encode('utf-8')
+
     def deserialize(self, response, response_type):
         """Deserializes response into an object.
 
@@ -288,7 +371,7 @@ class ApiClient(object):
             if klass in self.NATIVE_TYPES_MAPPING:
                 klass = self.NATIVE_TYPES_MAPPING[klass]
             else:
-                klass = getattr(paapi5_python_sdk.models, klass)
+                klass = paapi5_python_sdk.models.get_model(klass)
 
         if klass in self.PRIMITIVE_TYPES:
             return self.__deserialize_primitive(data, klass)
@@ -306,7 +389,8 @@ class ApiClient(object):
                  body=None, post_params=None, files=None,
                  response_type=None, auth_settings=None, async_req=None,
                  _return_http_data_only=None, collection_formats=None,
-                 _preload_content=True, _request_timeout=None):
+                 _preload_content=True, _request_timeout=None,
+                 _deadline=None, _priority=None):
         """Makes the HTTP request (synchronous) and returns deserialized data.
 
         To make an async request, set the async_req parameter.
@@ -336,6 +420,11 @@ class ApiClient(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _deadline: paapi5_python_sdk.deadline.Deadline shared by
+                          the calls of one operation; the request timeout
+                          is capped to the time it has left.
+        :param _priority: lane of the call in the scheduler of the
+                          configuration, see paapi5_python_sdk.scheduler.
         :return:
             If async_req parameter is True,
             the request will be called asynchronously.
@@ -349,7 +438,8 @@ class ApiClient(object):
                                    body, post_params, files,
                                    response_type, auth_settings,
                                    _return_http_data_only, collection_formats,
-                                   _preload_content, _request_timeout)
+                                   _preload_content, _request_timeout,
+                                   _deadline, _priority)
         else:
             thread = self.pool.apply_async(self.__call_api, (resource_path,
                                            method, api_name, path_params, query_params,
@@ -358,24 +448,27 @@ class ApiClient(object):
                                            response_type, auth_settings,
                                            _return_http_data_only,
                                            collection_formats,
-                                           _preload_content, _request_timeout))
+                                           _preload_content, _request_timeout,
+                                           _deadline, _priority))
         return thread
 
     def request(self, method, url, query_params=None, headers=None,
                 post_params=None, body=None, _preload_content=True,
-                _request_timeout=None):
+                _request_timeout=None, _retries=None):
         """Makes the HTTP request using RESTClient."""
         if method == "GET":
             return self.rest_client.GET(url,
                                         query_params=query_params,
                                         _preload_content=_preload_content,
                                         _request_timeout=_request_timeout,
+                                        _retries=_retries,
                                         headers=headers)
         elif method == "HEAD":
             return self.rest_client.HEAD(url,
                                          query_params=query_params,
                                          _preload_content=_preload_content,
                                          _request_timeout=_request_timeout,
+                                         _retries=_retries,
                                          headers=headers)
         elif method == "OPTIONS":
             return self.rest_client.OPTIONS(url,
@@ -384,6 +477,7 @@ class ApiClient(object):
                                             post_params=post_params,
                                             _preload_content=_preload_content,
                                             _request_timeout=_request_timeout,
+                                            _retries=_retries,
                                             body=body)
         elif method == "POST":
             return self.rest_client.POST(url,
@@ -392,6 +486,7 @@ class ApiClient(object):
                                          post_params=post_params,
                                          _preload_content=_preload_content,
                                          _request_timeout=_request_timeout,
+                                         _retries=_retries,
                                          body=body)
         elif method == "PUT":
             return self.rest_client.PUT(url,
@@ -400,6 +495,7 @@ class ApiClient(object):
                                         post_params=post_params,
                                         _preload_content=_preload_content,
                                         _request_timeout=_request_timeout,
+                                        _retries=_retries,
                                         body=body)
         elif method == "PATCH":
             return self.rest_client.PATCH(url,
@@ -408,6 +504,7 @@ class ApiClient(object):
                                           post_params=post_params,
                                           _preload_content=_preload_content,
                                           _request_timeout=_request_timeout,
+                                          _retries=_retries,
                                           body=body)
         elif method == "DELETE":
             return self.rest_client.DELETE(url,
@@ -415,6 +512,7 @@ class ApiClient(object):
                                            headers=headers,
                                            _preload_content=_preload_content,
                                            _request_timeout=_request_timeout,
+                                           _retries=_retries,
                                            body=body)
         else:
             raise ValueError(
@@ -515,12 +613,14 @@ class ApiClient(object):
     def get_amz_date(self, utc_timestamp):
         return utc_timestamp.strftime('%Y%m%dT%H%M%SZ')
 
-    def update_params_for_auth(self, headers, querys, auth_settings, api_name, method, body, resource_path):
+    def update_params_for_auth(self, headers, querys, auth_settings, api_name, method, body, resource_path, credential=None):
         """Updates header and query params based on authentication setting.
 
         :param headers: Header parameters dict to be updated.
         :param querys: Query parameters tuple list to be updated.
         :param auth_settings: Authentication setting identifiers list.
+        :param credential: paapi5_python_sdk.credentials.Credential to sign
+            with instead of the access key of the client.
         """
         if not auth_settings:
             service = 'ProductAdvertisingAPI'
@@ -530,8 +630,8 @@ class ApiClient(object):
             headers['Content-Type'] = 'application/json; charset=utf-8'
             headers['host'] = self.host
             headers['x-amz-date'] = self.get_amz_date(utc_timestamp)
-            aws_v4_auth = AWSV4Auth(access_key=self.access_key,
-                                  secret_key=self.secret_key,
+            aws_v4_auth = AWSV4Auth(access_key=credential.access_key if credential else self.access_key,
+                                  secret_key=credential.secret_key if credential else self.secret_key,
                                   host=self.host,
                                   region=self.region,
                                   service=service,
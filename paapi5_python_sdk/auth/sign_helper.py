@@ -97,9 +97,12 @@ class AWSV4Auth:
                 canonical_header + key.lower() + ":" + self.headers[key] + "\n"
             )
         self.signed_header = self.signed_header[:-1]
-        payload_hash = hashlib.sha256(
-            json.dumps(self.payload).encode("utf-8")
-        ).hexdigest()
+        # A bytes payload is the already encoded request body.
+        if isinstance(self.payload, bytes):
+            payload = self.payload
+        else:
+            payload = json.dumps(self.payload).encode("utf-8")
+        payload_hash = hashlib.sha256(payload).hexdigest()
         canonical_request = (
             canonical_uri
             + "\n"
@@ -0,0 +1,374 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import collections
+import gzip
+import json
+import threading
+import time
+
+from paapi5_python_sdk.models.get_browse_nodes_request import \
+    GetBrowseNodesRequest
+from paapi5_python_sdk.models.get_browse_nodes_resource import \
+    GetBrowseNodesResource
+from paapi5_python_sdk.models.partner_type import PartnerType
+
+# Browse node ids accepted by one GetBrowseNodes call.
+MAX_BATCH_SIZE = 10
+GRAPH_FORMAT_VERSION = 1
+
+
+class BrowseNodeEntry(object):
+    """One node of a BrowseNodeGraph.
+
+    :ivar children: tuple of child ids, None while the node has not been
+        fetched itself (only seen as the child of a fetched node).
+    :ivar fetched_at: time of the last GetBrowseNodes of this node.
+    """
+
+    __slots__ = ('id', 'name', 'parent', 'children', 'sales_rank',
+                 'fetched_at')
+
+    def __init__(self, id, name, parent=None, children=None,
+                 sales_rank=None, fetched_at=None):
+        self.id = id
+        self.name = name
+        self.parent = parent
+        self.children = children
+        self.sales_rank = sales_rank
+        self.fetched_at = fetched_at
+
+    @property
+    def expanded(self):
+        return self.children is not None
+
+
+class BrowseNodeGraph(object):
+    """Browse node taxonomy held in memory, answering navigation queries
+    without calling PA-API.
+
+    >>> graph = BrowseNodeGraph.load('taxonomy.json.gz')
+    >>> graph.path('13921051')
+    ['High-Tech', 'Audio', 'Casques']
+
+    Saved as gzipped JSON, one `[id, name, parent, children, sales_rank,
+    fetched_at]` row per node.
+    """
+
+    def __init__(self):
+        self._nodes = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node_id):
+        return node_id in self._nodes
+
+    def __iter__(self):
+        return iter(self._nodes.values())
+
+    def get(self, node_id):
+        """Returns the BrowseNodeEntry of `node_id`, None if unknown."""
+        return self._nodes.get(node_id)
+
+    def roots(self):
+        """Returns the ids of the nodes without a parent."""
+        return [node.id for node in self._nodes.values()
+                if node.parent is None]
+
+    def children(self, node_id):
+        """Returns the child ids of `node_id`, () if not expanded."""
+        return self._nodes[node_id].children or ()
+
+    def ancestors(self, node_id):
+        """Returns the ids from the parent of `node_id` up to its root."""
+        ancestors = []
+        parent = self._nodes[node_id].parent
+        while parent is not None:
+            ancestors.append(parent)
+            node = self._nodes.get(parent)
+            parent = node.parent if node is not None else None
+        return ancestors
+
+    def descendants(self, node_id, max_depth=None):
+        """Returns the ids below `node_id`, breadth first."""
+        descendants = []
+        level = list(self.children(node_id))
+        depth = 1
+        while level and (max_depth is None or depth <= max_depth):
+            descendants.extend(level)
+            level = [child for parent in level if parent in self._nodes
+                     for child in self.children(parent)]
+            depth += 1
+        return descendants
+
+    def path(self, node_id):
+        """Returns the names from the root down to `node_id`."""
+        ids = self.ancestors(node_id)[::-1] + [node_id]
+        return [self._nodes[id].name if id in self._nodes else id
+                for id in ids]
+
+    def depth(self, node_id):
+        return len(self.ancestors(node_id))
+
+    def add(self, entry):
+        """Adds or replaces a node."""
+        self._nodes[entry.id] = entry
+
+    def remove(self, node_id):
+        """Removes `node_id` and everything below it, and unlinks it from
+        its parent. Returns the number of nodes removed."""
+        node = self._nodes.get(node_id)
+        if node is None:
+            return 0
+        parent = self._nodes.get(node.parent)
+        if parent is not None and parent.children:
+            parent.children = tuple(child for child in parent.children
+                                    if child != node_id)
+        removed = [node_id] + [id for id in self.descendants(node_id)
+                               if id in self._nodes]
+        for id in removed:
+            del self._nodes[id]
+        return len(removed)
+
+    def save(self, path):
+        rows = [[node.id, node.name, node.parent,
+                 list(node.children) if node.children is not None else None,
+                 node.sales_rank, node.fetched_at]
+                for node in self._nodes.values()]
+        with gzip.open(path, 'wt', encoding='utf-8') as output:
+            json.dump({'version': GRAPH_FORMAT_VERSION, 'nodes': rows},
+                      output, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, 'rt', encoding='utf-8') as source:
+            document = json.load(source)
+        if document.get('version') != GRAPH_FORMAT_VERSION:
+            raise ValueError("Unsupported browse node graph version %r"
+                             % document.get('version'))
+        graph = cls()
+        for id, name, parent, children, sales_rank, fetched_at in \
+                document['nodes']:
+            graph.add(BrowseNodeEntry(
+                id, name, parent,
+                tuple(children) if children is not None else None,
+                sales_rank, fetched_at))
+        return graph
+
+
+class RefreshReport(object):
+    """What `BrowseNodeCrawler.refresh` found.
+
+    :ivar checked: number of nodes fetched again.
+    :ivar changed: ids of the nodes whose children changed.
+    :ivar added: number of nodes added below changed nodes.
+    :ivar removed: number of nodes removed, subtrees included.
+    """
+
+    def __init__(self):
+        self.checked = 0
+        self.changed = []
+        self.added = 0
+        self.removed = 0
+
+
+class BrowseNodeCrawler(object):
+    """Walks the browse node taxonomy breadth first into a
+    BrowseNodeGraph, `batch_size` node ids per GetBrowseNodes call and
+    `concurrency` calls at a time.
+
+    >>> crawler = BrowseNodeCrawler(api, partner_tag='tag-21', max_depth=3)
+    >>> graph = crawler.crawl(['13910691'])
+    >>> report = crawler.refresh(graph, max_age=86400)
+
+    Nodes deeper than `max_depth` in the taxonomy (its roots being at
+    depth 0), or beyond the first `max_nodes` expanded nodes, are kept with
+    their name and parent, unexpanded.
+
+    :param api: DefaultApi.
+    :param kwargs: extra arguments of `DefaultApi.get_browse_nodes`, e.g.
+        `_priority`.
+    """
+
+    def __init__(self, api, partner_tag, partner_type=PartnerType.ASSOCIATES,
+                 marketplace=None, languages_of_preference=None,
+                 batch_size=MAX_BATCH_SIZE, concurrency=1, max_depth=None,
+                 max_nodes=None, clock=time.time, **kwargs):
+        if not 1 <= batch_size <= MAX_BATCH_SIZE:
+            raise ValueError("Invalid value for `batch_size`, must be "
+                             "between 1 and %d" % MAX_BATCH_SIZE)
+        self.api = api
+        self.partner_tag = partner_tag
+        self.partner_type = partner_type
+        self.marketplace = marketplace
+        self.languages_of_preference = languages_of_preference
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.clock = clock
+        self.kwargs = kwargs
+
+    def fetch(self, node_ids):
+        """Returns a dict id -> BrowseNode for `node_ids`, fetched in
+        batches; ids PA-API does not know are left out."""
+        node_ids = list(node_ids)
+        batches = collections.deque(
+            node_ids[index:index + self.batch_size]
+            for index in range(0, len(node_ids), self.batch_size))
+        nodes = {}
+        errors = []
+        lock = threading.Lock()
+
+        def worker():
+            while True:
+                with lock:
+                    if errors or not batches:
+                        return
+                    batch = batches.popleft()
+                try:
+                    response = self.api.get_browse_nodes(
+                        GetBrowseNodesRequest(
+                            browse_node_ids=batch,
+                            partner_tag=self.partner_tag,
+                            partner_type=self.partner_type,
+                            marketplace=self.marketplace,
+                            languages_of_preference=(
+                                self.languages_of_preference),
+                            resources=[GetBrowseNodesResource.ANCESTOR,
+                                       GetBrowseNodesResource.CHILDREN]),
+                        **self.kwargs)
+                except Exception as error:
+                    with lock:
+                        errors.append(error)
+                    return
+                result = response.browse_nodes_result
+                with lock:
+                    for node in (result.browse_nodes if result is not None
+                                 else None) or ():
+                        nodes[node.id] = node
+
+        threads = [threading.Thread(target=worker)
+                   for _ in range(min(self.concurrency, len(batches)))]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return nodes
+
+    def crawl(self, root_ids, graph=None):
+        """Crawls the subtrees of `root_ids` into `graph` (a new
+        BrowseNodeGraph by default) and returns it."""
+        if graph is None:
+            graph = BrowseNodeGraph()
+        self._expand(graph, list(root_ids))
+        return graph
+
+    def refresh(self, graph, max_age=None, node_ids=None):
+        """Fetches again the expanded nodes of `graph` older than `max_age`
+        seconds (all of them if None), or `node_ids`, and updates the graph
+        where their children changed: new children are crawled, removed
+        ones are dropped with their subtree. Unchanged subtrees are not
+        crawled again. Returns a RefreshReport."""
+        report = RefreshReport()
+        if node_ids is None:
+            now = self.clock()
+            node_ids = [node.id for node in graph if node.expanded and (
+                max_age is None or node.fetched_at is None or
+                node.fetched_at <= now - max_age)]
+        node_ids = [node_id for node_id in node_ids if node_id in graph]
+        fetched = self.fetch(node_ids)
+        report.checked = len(node_ids)
+        for node_id in node_ids:
+            if node_id not in graph:
+                # removed with the subtree of a changed ancestor
+                continue
+            node = fetched.get(node_id)
+            if node is None:
+                report.removed += graph.remove(node_id)
+                report.changed.append(node_id)
+                continue
+            old_children = set(graph.children(node_id))
+            self._store(graph, node, graph.get(node_id).parent)
+            new_children = set(graph.children(node_id))
+            if old_children == new_children:
+                continue
+            report.changed.append(node_id)
+            for child in old_children - new_children:
+                report.removed += graph.remove(child)
+            added = [child for child in graph.children(node_id)
+                     if child in new_children - old_children]
+            before = len(graph)
+            self._expand(graph, added)
+            report.added += len(graph) - before + len(added)
+        return report
+
+    def _expand(self, graph, level):
+        while level:
+            nodes = self.fetch(level)
+            next_level = []
+            for node_id in level:
+                node = nodes.get(node_id)
+                if node is None:
+                    continue
+                entry = graph.get(node_id)
+                self._store(graph, node,
+                            entry.parent if entry is not None else None)
+                if self.max_depth is not None and \
+                        graph.depth(node_id) >= self.max_depth:
+                    continue
+                next_level.extend(child for child in graph.children(node_id)
+                                  if not graph.get(child).expanded)
+            if self.max_nodes is not None:
+                room = self.max_nodes - sum(1 for node in graph
+                                            if node.expanded)
+                next_level = next_level[:max(room, 0)]
+            level = next_level
+
+    def _store(self, graph, node, parent):
+        if node.ancestor is not None:
+            parent = node.ancestor.id
+            self._store_ancestors(graph, node.ancestor)
+        children = tuple(child.id for child in node.children or ())
+        graph.add(BrowseNodeEntry(node.id, node.display_name, parent,
+                                  children, node.sales_rank, self.clock()))
+        for child in node.children or ():
+            if child.id not in graph:
+                graph.add(BrowseNodeEntry(child.id, child.display_name,
+                                          node.id))
+
+    def _store_ancestors(self, graph, ancestor):
+        # Ancestors outside the crawled subtrees are kept unexpanded, so
+        # that paths reach up to the root.
+        while ancestor is not None:
+            if ancestor.id not in graph:
+                parent = ancestor.ancestor.id \
+                    if ancestor.ancestor is not None else None
+                graph.add(BrowseNodeEntry(ancestor.id, ancestor.display_name,
+                                          parent))
+            ancestor = ancestor.ancestor
@@ -0,0 +1,303 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import collections
+import logging
+import threading
+import time
+
+from paapi5_python_sdk.metrics import MetricsRegistry
+from paapi5_python_sdk.rest import ApiException
+
+
+logger = logging.getLogger(__name__)
+
+# PA-API error codes that are a property of the request itself: sending the
+# same request again returns the same error, so it is safe to cache them.
+NEGATIVE_CACHE_ERROR_CODES = frozenset([
+    'NoResults',
+    'InvalidParameterValue',
+    'MissingParameter',
+    'UnknownOperation',
+])
+
+
+class CacheEntry(object):
+    """A cached value, or a cached deterministic error.
+
+    An entry is fresh until `fresh_until`, then stale (still servable while
+    it is refreshed in the background) until `stale_until`. When `codec` is
+    set, `value` holds the encoded bytes and is only decoded on a hit.
+    `negative_value` marks a value cached as a negative answer.
+    """
+
+    __slots__ = ('value', 'error', 'stored_at', 'fresh_until', 'stale_until',
+                 'codec', 'negative_value')
+
+    def __init__(self, value, error, stored_at, fresh_until, stale_until,
+                 codec=None, negative_value=False):
+        self.value = value
+        self.error = error
+        self.stored_at = stored_at
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+        self.codec = codec
+        self.negative_value = negative_value
+
+    @property
+    def negative(self):
+        return self.error is not None or self.negative_value
+
+    def staleness(self, now):
+        """Seconds elapsed since the entry stopped being fresh."""
+        return max(0.0, now - self.fresh_until)
+
+    @property
+    def size(self):
+        """Bytes held by an encoded entry, None if stored as is."""
+        if self.codec is None or self.value is None:
+            return None
+        return len(self.value)
+
+    def resolve(self):
+        if self.error is not None:
+            raise self.error
+        if self.codec is not None:
+            return self.codec.decode(self.value)
+        return self.value
+
+
+class _Flight(object):
+    """An in-progress load that concurrent callers for the same key join."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.entry = None
+        self.error = None
+
+
+class ResponseCache(object):
+    """TTL cache with stale-while-revalidate, single-flight loading and
+    negative caching of deterministic PA-API errors.
+
+    >>> cache = ResponseCache(ttl=300, stale_ttl=3600)
+    >>> results = cache.get_or_load(('harry potter', 'Books'), fetch)
+
+    * A fresh entry is returned as is.
+    * A stale entry is returned immediately and one background thread
+      reloads it; other callers keep getting the stale entry meanwhile.
+    * On a miss only one caller runs `loader`; concurrent callers for the
+      same key wait for its result instead of issuing their own requests.
+    * An `ApiException` whose error code is in `negative_error_codes` is
+      cached for `negative_ttl` seconds and re-raised on every hit. So is
+      a value for which `is_negative(value)` is true, e.g. an empty result
+      list that a loader returns instead of raising NoResults.
+
+    :param ttl: seconds an entry is served without being refreshed.
+    :param stale_ttl: seconds past `ttl` a stale entry may still be served.
+    :param negative_ttl: seconds a deterministic error is cached.
+    :param max_entries: entries kept before the least recently used is
+        evicted.
+    :param metrics: MetricsRegistry receiving `<name>.*` counters.
+    :param name: prefix of the metric names.
+    :param codec: PayloadCodec used to keep values compressed in memory;
+        None stores values as is.
+    :param serve_expired_on: exception classes which, raised by `loader`
+        on a miss, make the cache return the expired entry of the key if it
+        still holds one (e.g. CircuitOpenError: an old answer beats an
+        error while the service is down).
+    :param is_negative: predicate on loaded values, true for the values to
+        cache for `negative_ttl` seconds only.
+    """
+
+    def __init__(self, ttl=300, stale_ttl=3600, negative_ttl=600,
+                 max_entries=1024,
+                 negative_error_codes=NEGATIVE_CACHE_ERROR_CODES,
+                 metrics=None, name='cache', clock=time.time, codec=None,
+                 serve_expired_on=(), is_negative=None):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.negative_error_codes = frozenset(negative_error_codes)
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self.name = name
+        self.clock = clock
+        self.codec = codec
+        self.serve_expired_on = tuple(serve_expired_on)
+        self.is_negative = is_negative
+
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._flights = {}
+
+    def get_or_load(self, key, loader):
+        """Returns the cached value for `key`, calling `loader()` if needed.
+
+        :param key: hashable cache key.
+        :param loader: callable without arguments returning the value.
+        :return: the cached or freshly loaded value.
+        :raises: the cached deterministic ApiException, or whatever
+            `loader` raised on a miss.
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.stale_until:
+                self._entries.move_to_end(key)
+                if now < entry.fresh_until:
+                    self._count('negative_hits' if entry.negative else 'hits')
+                else:
+                    self._count('stale_hits')
+                    self.metrics.set_gauge(
+                        self._metric('last_served_staleness'),
+                        entry.staleness(now))
+                    if key not in self._flights:
+                        flight = self._flights[key] = _Flight()
+                        self._start_refresh(key, loader, flight)
+            else:
+                expired = entry if entry is not None and \
+                    not entry.negative else None
+                entry = None
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+                    self._count('misses')
+                else:
+                    self._count('coalesced')
+        if entry is not None:
+            # Decoding happens outside the lock so that hits on compressed
+            # entries do not serialize each other.
+            return entry.resolve()
+
+        if leader:
+            self._load(key, loader, flight)
+        else:
+            flight.event.wait()
+        if flight.entry is None:
+            if expired is not None and \
+                    isinstance(flight.error, self.serve_expired_on):
+                self._count('expired_hits')
+                return expired.resolve()
+            raise flight.error
+        return flight.entry.resolve()
+
+    def invalidate(self, key):
+        """Drops the entry stored for `key`, if any."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drops every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        """Returns the cache counters and the staleness of every entry."""
+        now = self.clock()
+        with self._lock:
+            entries = [{
+                'key': key if isinstance(key, str) else repr(key),
+                'age': now - entry.stored_at,
+                'staleness': entry.staleness(now),
+                'stale': now >= entry.fresh_until,
+                'negative': entry.negative,
+                'refreshing': key in self._flights,
+                'size': entry.size,
+            } for key, entry in self._entries.items()]
+        prefix = self.name + '.'
+        counters = self.metrics.snapshot()['counters']
+        return {
+            'counters': {name[len(prefix):]: value
+                         for name, value in counters.items()
+                         if name.startswith(prefix)},
+            'size': len(entries),
+            'bytes': sum(entry['size'] or 0 for entry in entries),
+            'entries': entries,
+        }
+
+    def _start_refresh(self, key, loader, flight):
+        self._count('refreshes')
+        thread = threading.Thread(target=self._load,
+                                  args=(key, loader, flight, True))
+        thread.daemon = True
+        thread.start()
+
+    def _load(self, key, loader, flight, background=False):
+        entry = None
+        try:
+            value = loader()
+            negative = self.is_negative is not None and \
+                self.is_negative(value)
+            if self.codec is not None:
+                value = self.codec.encode(value)
+            now = self.clock()
+            if negative:
+                entry = CacheEntry(value, None, now, now + self.negative_ttl,
+                                   now + self.negative_ttl, self.codec,
+                                   negative_value=True)
+                self._count('negative_stores')
+            else:
+                entry = CacheEntry(value, None, now, now + self.ttl,
+                                   now + self.ttl + self.stale_ttl,
+                                   self.codec)
+        except ApiException as exception:
+            if self.negative_error_codes.intersection(exception.error_codes()):
+                now = self.clock()
+                entry = CacheEntry(None, exception, now,
+                                   now + self.negative_ttl,
+                                   now + self.negative_ttl)
+                self._count('negative_stores')
+            else:
+                flight.error = exception
+        except Exception as exception:
+            flight.error = exception
+
+        if flight.error is not None:
+            self._count('load_errors')
+            if background:
+                logger.warning("Background refresh of %r failed, keeping "
+                               "the stale entry: %s", key, flight.error)
+
+        with self._lock:
+            if entry is not None:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._count('evictions')
+            del self._flights[key]
+        flight.entry = entry
+        flight.event.set()
+
+    def _metric(self, name):
+        return self.name + '.' + name
+
+    def _count(self, name):
+        self.metrics.incr(self._metric(name))
@@ -0,0 +1,271 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from six.moves.urllib.parse import urlsplit
+
+from paapi5_python_sdk.rest import ApiException
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+# Request body keys left out of the recording key: they identify the
+# account, not the query, and differ between environments.
+IGNORED_BODY_KEYS = ('PartnerTag',)
+# Response headers kept in recordings.
+RECORDED_HEADERS = ('content-type',)
+
+
+def canonical_body(body, ignored_keys=IGNORED_BODY_KEYS):
+    """Returns `body` (bytes, str or dict) as compact JSON with sorted keys,
+    without `ignored_keys`. Bodies that are not JSON are returned as is."""
+    if isinstance(body, bytes):
+        body = body.decode('utf-8')
+    if isinstance(body, str):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            return body
+    if body is None:
+        return ''
+    if isinstance(body, dict):
+        body = {key: value for key, value in body.items()
+                if key not in ignored_keys}
+    return json.dumps(body, sort_keys=True, separators=(',', ':'))
+
+
+def operation_name(url, headers):
+    """Returns the PA-API operation of a request (`SearchItems`, ...)."""
+    target = (headers or {}).get('x-amz-target')
+    if target:
+        return target.rpartition('.')[2]
+    return url.rstrip('/').rpartition('/')[2]
+
+
+class CassetteMiss(ApiException):
+    """Raised when replaying a request the cassette has no recording of.
+
+    Nothing was sent: it is neither retried by pagination nor counted by
+    the circuit breaker.
+    """
+
+    def __init__(self, method, url, path):
+        super(CassetteMiss, self).__init__(
+            status=0, reason="No recorded response for %s %s in cassette %s"
+            % (method, url, path))
+
+
+class RecordedResponse(io.IOBase):
+    """A recorded response, shaped like rest.RESTResponse."""
+
+    def __init__(self, status, reason, data, headers):
+        self.status = status
+        self.reason = reason
+        self.data = data
+        self.headers = headers
+
+    def getheaders(self):
+        """Returns a dictionary of the response headers."""
+        return dict(self.headers)
+
+    def getheader(self, name, default=None):
+        """Returns a given response header."""
+        return self.headers.get(name.lower(), default)
+
+
+class Cassette(object):
+    """Recorded request/response pairs for offline, deterministic runs.
+
+    Set on `Configuration.cassette`, it makes `rest.RESTClientObject`
+    either record every response it receives (`mode='record'`) or serve
+    recorded responses without touching the network (`mode='replay'`).
+
+    Responses are keyed by host, operation and canonical request body, so
+    that marketplaces do not answer for each other, while the signature,
+    the timestamp and the partner tag do not matter. No request header is
+    stored; of the response headers only Content-Type is kept.
+    When a key was recorded several times, replay cycles through the
+    recordings in order. Replayed responses are delayed by the latency
+    observed when recording, times `latency_scale` (0 to disable).
+
+    The cassette file is gzipped JSON lines, one recording per line; it is
+    loaded when replaying and written by `save()` / `close()` when
+    recording. Saving merges the new recordings into the file on disk and
+    replaces it atomically, under a lock file where `fcntl` exists, so
+    several worker processes may record into the same cassette.
+
+    :param path: cassette file.
+    :param mode: 'record' or 'replay'.
+    :param latency_scale: factor applied to replayed latencies.
+    :param metrics: optional MetricsRegistry for `cassette.*` counters.
+    """
+
+    def __init__(self, path, mode=REPLAY, latency_scale=1.0, metrics=None,
+                 sleep=time.sleep):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError("Invalid cassette mode `%s`, must be one of %s"
+                             % (mode, [RECORD, REPLAY]))
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.metrics = metrics
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._recordings = {}
+        self._positions = {}
+        # key -> recordings of this process already written to the file
+        self._saved = {}
+        if mode == REPLAY:
+            self.load()
+
+    @property
+    def replaying(self):
+        return self.mode == REPLAY
+
+    @property
+    def recording(self):
+        return self.mode == RECORD
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(entries) for entries in self._recordings.values())
+
+    def _incr(self, name):
+        if self.metrics is not None:
+            self.metrics.incr('cassette.' + name)
+
+    @staticmethod
+    def key(method, url, headers, body):
+        return '%s %s %s %s' % (method.upper(), urlsplit(url).netloc,
+                                operation_name(url, headers),
+                                canonical_body(body))
+
+    def record(self, method, url, headers, body, response, latency):
+        """Stores `response` (status, reason, data, getheaders()) as the
+        answer to the request, observed after `latency` seconds."""
+        data = response.data
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        response_headers = {name.lower(): value
+                            for name, value in response.getheaders().items()
+                            if name.lower() in RECORDED_HEADERS}
+        entry = {'status': response.status, 'reason': response.reason,
+                 'headers': response_headers, 'data': data,
+                 'latency': round(latency, 6)}
+        key = self.key(method, url, headers, body)
+        with self._lock:
+            self._recordings.setdefault(key, []).append(entry)
+        self._incr('recorded')
+
+    def replay(self, method, url, headers, body):
+        """Returns the next RecordedResponse for the request, after its
+        recorded latency, or None if it was never recorded."""
+        key = self.key(method, url, headers, body)
+        with self._lock:
+            entries = self._recordings.get(key)
+            if not entries:
+                entry = None
+            else:
+                position = self._positions.get(key, 0)
+                self._positions[key] = position + 1
+                entry = entries[position % len(entries)]
+        if entry is None:
+            self._incr('misses')
+            return None
+        self._incr('hits')
+        delay = entry['latency'] * self.latency_scale
+        if delay > 0:
+            self._sleep(delay)
+        return RecordedResponse(entry['status'], entry['reason'],
+                                entry['data'], entry['headers'])
+
+    def load(self):
+        recordings = self._read()
+        with self._lock:
+            self._recordings = recordings
+            self._positions = {}
+
+    def _read(self):
+        recordings = {}
+        with gzip.open(self.path, 'rt', encoding='utf-8') as cassette:
+            for line in cassette:
+                if line.strip():
+                    entry = json.loads(line)
+                    recordings.setdefault(entry.pop('key'), []).append(entry)
+        return recordings
+
+    def save(self):
+        """Adds the recordings not saved yet to the cassette file."""
+        with self._lock:
+            new = {key: entries[self._saved.get(key, 0):]
+                   for key, entries in self._recordings.items()}
+            counts = {key: len(entries)
+                      for key, entries in self._recordings.items()}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with open(self.path + '.lock', 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            recordings = self._read() if os.path.exists(self.path) else {}
+            for key, entries in new.items():
+                recordings.setdefault(key, []).extend(entries)
+            handle, temporary = tempfile.mkstemp(dir=directory,
+                                                 suffix='.tmp')
+            try:
+                with os.fdopen(handle, 'wb') as raw, gzip.GzipFile(
+                        fileobj=raw, mode='wb') as cassette:
+                    for key, entries in recordings.items():
+                        for entry in entries:
+                            cassette.write(json.dumps(
+                                dict(entry, key=key), sort_keys=True,
+                                separators=(',', ':')).encode('utf-8') +
+                                b'\n')
+                os.replace(temporary, self.path)
+            except BaseException:
+                os.remove(temporary)
+                raise
+        with self._lock:
+            self._saved = counts
+
+    def close(self):
+        """Writes the recordings if recording."""
+        if self.recording:
+            self.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
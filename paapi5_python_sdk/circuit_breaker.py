@@ -0,0 +1,250 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import collections
+import threading
+import time
+
+from paapi5_python_sdk.cassette import CassetteMiss
+from paapi5_python_sdk.concurrency import ConcurrencyLimitExceeded
+from paapi5_python_sdk.deadline import DeadlineExceeded
+from paapi5_python_sdk.rest import ApiException
+from paapi5_python_sdk.scheduler import RequestRejected
+
+# Raised by the SDK itself before anything is sent: they say nothing about
+# the health of the host.
+LOCAL_ERRORS = (CassetteMiss, ConcurrencyLimitExceeded, DeadlineExceeded,
+                RequestRejected)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+# Gauge values of `<name>.state.<host>/<region>`.
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(ApiException):
+    """Raised without calling PA-API while the circuit of a host/region is
+    open.
+
+    :param retry_after: seconds before the circuit lets a trial through.
+    """
+
+    def __init__(self, key, retry_after):
+        super(CircuitOpenError, self).__init__(
+            status=0, reason="Circuit open for %s/%s, retry in %.1f s"
+            % (key[0], key[1], retry_after))
+        self.key = key
+        self.retry_after = retry_after
+
+
+def is_upstream_failure(error):
+    """Default failure predicate: transport errors (timeouts, refused
+    connections) and 5xx responses. 4xx answers, throttling included, mean
+    the service is up and do not count; LOCAL_ERRORS are not outcomes of
+    the host at all, see CircuitBreaker.call."""
+    if isinstance(error, LOCAL_ERRORS):
+        return False
+    if isinstance(error, ApiException):
+        return not error.status or error.status >= 500
+    return True
+
+
+class _Circuit(object):
+
+    __slots__ = ('state', 'outcomes', 'opened_at', 'trials', 'successes')
+
+    def __init__(self, window):
+        self.state = CLOSED
+        self.outcomes = collections.deque(maxlen=window)
+        self.opened_at = None
+        self.trials = 0
+        self.successes = 0
+
+
+class CircuitBreaker(object):
+    """Fails fast on a host/region whose recent calls mostly fail or are
+    slow, instead of tying up workers until every call times out.
+
+    One circuit is kept per key (ApiClient uses `(host, region)`):
+
+    * closed: calls go through. Once `min_calls` outcomes are known, if
+      the share of failures over the last `window` calls reaches
+      `failure_rate`, or the share of calls slower than `slow_call_seconds`
+      reaches `slow_call_rate`, the circuit opens.
+    * open: calls raise CircuitOpenError immediately, for `open_seconds`.
+    * half open: up to `half_open_calls` trial calls go through, others are
+      rejected. One failed trial reopens the circuit; `half_open_calls`
+      successful trials close it.
+
+    LOCAL_ERRORS, raised by the client before anything reaches the host,
+    are neither successes nor failures: they are left out of the window,
+    and a trial ending with one frees its place for another trial.
+
+    Set on `Configuration.circuit_breaker`, shared by all ApiClients.
+    Counters in `metrics` under `<name>.`: rejected, opened, half_opened,
+    closed; gauge `<name>.state.<host>/<region>` (0 closed, 1 half open,
+    2 open).
+
+    :param is_failure: predicate on the exception raised by a call.
+    """
+
+    def __init__(self, failure_rate=0.5, slow_call_seconds=None,
+                 slow_call_rate=0.8, window=20, min_calls=10,
+                 open_seconds=30.0, half_open_calls=3,
+                 is_failure=is_upstream_failure, metrics=None,
+                 name='circuit_breaker', clock=time.time):
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.window = window
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.is_failure = is_failure
+        self.metrics = metrics
+        self.name = name
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._circuits = {}
+
+    def state(self, key):
+        """Returns the state of the circuit of `key`."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                return CLOSED
+            self._expire(key, circuit, self.clock())
+            return circuit.state
+
+    def call(self, key, send):
+        """Returns `send()` unless the circuit of `key` is open."""
+        trial = self._before_call(key)
+        started = self.clock()
+        try:
+            result = send()
+        except LOCAL_ERRORS:
+            # nothing was learnt about the host: no outcome, and the trial
+            # slot goes to the next call
+            self._release(key, trial)
+            raise
+        except Exception as error:
+            self._after_call(key, trial, self.is_failure(error),
+                             self.clock() - started)
+            raise
+        self._after_call(key, trial, False, self.clock() - started)
+        return result
+
+    def stats(self):
+        """Returns the state and recent failure rate of every circuit."""
+        now = self.clock()
+        with self._lock:
+            result = {}
+            for key, circuit in self._circuits.items():
+                self._expire(key, circuit, now)
+                outcomes = circuit.outcomes
+                result['%s/%s' % key] = {
+                    'state': circuit.state,
+                    'calls': len(outcomes),
+                    'failure_rate': round(float(sum(
+                        failed for failed, _ in outcomes)) / len(outcomes),
+                        4) if outcomes else None,
+                }
+            return result
+
+    def _before_call(self, key):
+        now = self.clock()
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                circuit = self._circuits[key] = _Circuit(self.window)
+            self._expire(key, circuit, now)
+            if circuit.state == CLOSED:
+                return False
+            if circuit.state == HALF_OPEN and \
+                    circuit.trials < self.half_open_calls:
+                circuit.trials += 1
+                return True
+            retry_after = 0.0
+            if circuit.state == OPEN:
+                retry_after = circuit.opened_at + self.open_seconds - now
+        self._count('rejected')
+        raise CircuitOpenError(key, max(retry_after, 0.0))
+
+    def _release(self, key, trial):
+        with self._lock:
+            circuit = self._circuits[key]
+            if trial and circuit.state == HALF_OPEN and circuit.trials > 0:
+                circuit.trials -= 1
+
+    def _after_call(self, key, trial, failed, latency):
+        slow = (self.slow_call_seconds is not None and
+                latency >= self.slow_call_seconds)
+        now = self.clock()
+        with self._lock:
+            circuit = self._circuits[key]
+            if circuit.state == HALF_OPEN and trial:
+                if failed or slow:
+                    self._set_state(key, circuit, OPEN, now)
+                else:
+                    circuit.successes += 1
+                    if circuit.successes >= self.half_open_calls:
+                        self._set_state(key, circuit, CLOSED, now)
+                return
+            if circuit.state != CLOSED:
+                # A call started before the circuit opened.
+                return
+            outcomes = circuit.outcomes
+            outcomes.append((failed, slow))
+            if len(outcomes) < self.min_calls:
+                return
+            failures = sum(failed for failed, _ in outcomes)
+            slow_calls = sum(slow for _, slow in outcomes)
+            if failures >= self.failure_rate * len(outcomes) or (
+                    self.slow_call_seconds is not None and
+                    slow_calls >= self.slow_call_rate * len(outcomes)):
+                self._set_state(key, circuit, OPEN, now)
+
+    def _expire(self, key, circuit, now):
+        if circuit.state == OPEN and \
+                now - circuit.opened_at >= self.open_seconds:
+            self._set_state(key, circuit, HALF_OPEN, now)
+
+    def _set_state(self, key, circuit, state, now):
+        circuit.state = state
+        circuit.trials = 0
+        circuit.successes = 0
+        if state == OPEN:
+            circuit.opened_at = now
+        if state == CLOSED:
+            circuit.outcomes.clear()
+        self._count({OPEN: 'opened', HALF_OPEN: 'half_opened',
+                     CLOSED: 'closed'}[state])
+        if self.metrics is not None:
+            self.metrics.set_gauge('%s.state.%s/%s' % ((self.name,) + key),
+                                   STATE_VALUES[state])
+
+    def _count(self, counter):
+        if self.metrics is not None:
+            self.metrics.incr('%s.%s' % (self.name, counter))
@@ -0,0 +1,208 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import collections
+import re
+
+from paapi5_python_sdk import models
+from paapi5_python_sdk.models.item import Item
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Numeric columns built by default: name -> (Item field, dtype).
+DEFAULT_COLUMNS = collections.OrderedDict([
+    ('price', ('offers.listings[0].price.amount', 'float64')),
+    ('savings_amount', ('offers.listings[0].price.savings.amount',
+                        'float64')),
+    ('savings_percentage', ('offers.listings[0].price.savings.percentage',
+                            'float64')),
+    ('lowest_price', ('offers.summaries[0].lowest_price.amount', 'float64')),
+    ('review_count', ('customer_reviews.count', 'int64')),
+    ('star_rating', ('customer_reviews.star_rating.value', 'float64')),
+    ('sales_rank', ('browse_node_info.website_sales_rank.sales_rank',
+                    'int64')),
+])
+
+_STEP = re.compile(r'^(\w+)(?:\[(\d+)\])?$')
+_LIST_TYPE = re.compile(r'^list\[(.+)\]$')
+_RESULT_KEYS = (('search_result', 'SearchResult'),
+                ('items_result', 'ItemsResult'),
+                ('variations_result', 'VariationsResult'))
+
+
+def _field_steps(field):
+    """Returns the steps of a field such as `offers.listings[0].price`, as
+    (attribute, JSON key) names and list indexes."""
+    model = Item
+    steps = []
+    for part in field.split('.'):
+        match = _STEP.match(part)
+        if match is None or model is None or \
+                match.group(1) not in model.swagger_types:
+            raise ValueError("`%s` is not an Item field." % field)
+        attribute = match.group(1)
+        steps.append((attribute, model.attribute_map[attribute]))
+        type_name = model.swagger_types[attribute]
+        list_type = _LIST_TYPE.match(type_name)
+        if match.group(2) is not None:
+            if list_type is None:
+                raise ValueError("`%s` of `%s` is not a list."
+                                 % (attribute, field))
+            steps.append(int(match.group(2)))
+        elif list_type is not None:
+            raise ValueError("`%s` of `%s` is a list: give an index."
+                             % (attribute, field))
+        model = getattr(models, list_type.group(1) if list_type
+                        else type_name, None)
+    return steps
+
+
+def _value(item, steps):
+    raw = isinstance(item, dict)
+    value = item
+    for step in steps:
+        if value is None:
+            return None
+        if isinstance(step, int):
+            value = value[step] if step < len(value) else None
+        elif raw:
+            value = value.get(step[1])
+        else:
+            value = getattr(value, step[0])
+    return value
+
+
+def response_items(response):
+    """Items of a SearchItems, GetItems or GetVariations response, either
+    deserialized or as the raw dict of its JSON."""
+    for attribute, key in _RESULT_KEYS:
+        if isinstance(response, dict):
+            result = response.get(key)
+            if result is not None:
+                return result.get('Items') or []
+        else:
+            result = getattr(response, attribute, None)
+            if result is not None:
+                return result.items or []
+    return []
+
+
+class ItemColumns(object):
+    """Columnar view of a list of items, for vectorized filtering and
+    sorting.
+
+    >>> table = ItemColumns.from_responses(responses)
+    >>> cheap = table.filter((table['price'] < 50) &
+    ...                      (table['star_rating'] >= 4))
+    >>> cheap.sort_by('savings_percentage', descending=True).asins[:10]
+
+    Each numeric column is a NumPy masked array, masked where the item
+    lacks the value; comparisons on masked entries stay masked, and
+    `filter` treats them as False. Items are taken as Item models or as the
+    raw dicts of their JSON (e.g. cached responses), which skips the
+    deserialization. Requires the numpy package.
+
+    :param items: Item models or raw item dicts.
+    :param columns: dict column name -> (Item field, NumPy dtype), fields
+        indexing lists as in `offers.listings[0].price.amount`; defaults to
+        DEFAULT_COLUMNS.
+    """
+
+    def __init__(self, items, columns=None):
+        if numpy is None:
+            raise ImportError("ItemColumns requires the numpy package.")
+        if columns is None:
+            columns = DEFAULT_COLUMNS
+        self.items = numpy.empty(len(items), dtype=object)
+        self.items[:] = list(items)
+        self.asins = numpy.array(
+            [_value(item, [('asin', 'ASIN')]) for item in items],
+            dtype=object)
+        self.columns = collections.OrderedDict()
+        for name, (field, dtype) in columns.items():
+            steps = _field_steps(field)
+            values = [_value(item, steps) for item in items]
+            mask = numpy.array([value is None for value in values],
+                               dtype=bool)
+            data = numpy.array([0 if value is None else value
+                                for value in values], dtype=dtype)
+            self.columns[name] = numpy.ma.MaskedArray(data, mask=mask)
+        self._index = None
+
+    @classmethod
+    def from_responses(cls, responses, columns=None):
+        """Builds the columns of the items of every response."""
+        return cls([item for response in responses
+                    for item in response_items(response)], columns)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @property
+    def index(self):
+        """dict ASIN -> row number, the first row for a repeated ASIN."""
+        if self._index is None:
+            index = {}
+            for row, asin in enumerate(self.asins):
+                index.setdefault(asin, row)
+            self._index = index
+        return self._index
+
+    def row(self, asin):
+        """Returns the column values of an item, None where missing."""
+        row = self.index[asin]
+        return dict(
+            [('asin', asin)] +
+            [(name, None if column.mask[row] else column.data[row].item())
+             for name, column in self.columns.items()])
+
+    def take(self, rows):
+        """Returns the ItemColumns of `rows`, an array of row numbers."""
+        taken = ItemColumns.__new__(ItemColumns)
+        taken.items = self.items[rows]
+        taken.asins = self.asins[rows]
+        taken.columns = collections.OrderedDict(
+            (name, column[rows]) for name, column in self.columns.items())
+        taken._index = None
+        return taken
+
+    def filter(self, condition):
+        """Returns the ItemColumns of the rows where `condition`, a boolean
+        (masked) array, is True; masked rows are dropped."""
+        condition = numpy.ma.filled(condition, False)
+        return self.take(numpy.flatnonzero(condition))
+
+    def sort_by(self, name, descending=False):
+        """Returns the ItemColumns sorted on a column, rows missing the
+        value last."""
+        column = self.columns[name]
+        order = numpy.ma.argsort(-column if descending else column,
+                                 kind='stable', endwith=True)
+        return self.take(order)
@@ -0,0 +1,126 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import json
+import threading
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class PayloadCodec(object):
+    """Encodes cache values into compact compressed bytes and back.
+
+    Values must be made of dicts, lists, strings, numbers, booleans and
+    None, e.g. a list of search results or the raw dict of a PA-API
+    response (`json.loads(response.data)`).
+
+    :param encoding: 'json' (default) or 'msgpack'.
+    :param compression: 'zlib', 'zstd' or None. Defaults to 'zstd' when the
+        `zstandard` package is installed, 'zlib' otherwise.
+    :param level: compression level; None uses the library default.
+    """
+
+    def __init__(self, encoding='json', compression=None, level=None):
+        if compression is None:
+            compression = 'zstd' if zstandard is not None else 'zlib'
+        if encoding not in ('json', 'msgpack'):
+            raise ValueError("encoding must be `json` or `msgpack`.")
+        if compression not in ('zlib', 'zstd', 'none'):
+            raise ValueError("compression must be `zlib`, `zstd` or `none`.")
+        if encoding == 'msgpack' and msgpack is None:
+            raise ImportError("msgpack encoding requires the msgpack package.")
+        if compression == 'zstd' and zstandard is None:
+            raise ImportError("zstd compression requires the zstandard "
+                              "package.")
+        self.encoding = encoding
+        self.compression = compression
+        self.level = level
+        self._local = threading.local()
+
+    @property
+    def name(self):
+        return self.encoding + '+' + self.compression
+
+    def encode(self, value):
+        """Returns `value` as compressed bytes."""
+        if self.encoding == 'msgpack':
+            data = msgpack.packb(value, use_bin_type=True)
+        else:
+            data = json.dumps(value, separators=(',', ':')).encode('utf8')
+
+        if self.compression == 'zlib':
+            if self.level is None:
+                return zlib.compress(data)
+            return zlib.compress(data, self.level)
+        if self.compression == 'zstd':
+            return self._zstd_compressor().compress(data)
+        return data
+
+    def decode(self, data):
+        """Returns the value encoded in `data`."""
+        if self.compression == 'zlib':
+            data = zlib.decompress(data)
+        elif self.compression == 'zstd':
+            data = self._zstd_decompressor().decompress(data)
+
+        if self.encoding == 'msgpack':
+            return msgpack.unpackb(data, raw=False)
+        return json.loads(data.decode('utf8'))
+
+    def _zstd_compressor(self):
+        # zstandard (de)compressor objects must not be shared between
+        # threads, so each thread gets its own pair.
+        compressor = getattr(self._local, 'compressor', None)
+        if compressor is None:
+            if self.level is None:
+                compressor = zstandard.ZstdCompressor()
+            else:
+                compressor = zstandard.ZstdCompressor(level=self.level)
+            self._local.compressor = compressor
+        return compressor
+
+    def _zstd_decompressor(self):
+        decompressor = getattr(self._local, 'decompressor', None)
+        if decompressor is None:
+            decompressor = self._local.decompressor = \
+                zstandard.ZstdDecompressor()
+        return decompressor
+
+
+def available_codecs():
+    """Returns one PayloadCodec per encoding/compression pair usable here."""
+    encodings = ['json'] + (['msgpack'] if msgpack is not None else [])
+    compressions = ['none', 'zlib'] + (['zstd'] if zstandard is not None
+                                       else [])
+    return [PayloadCodec(encoding, compression)
+            for encoding in encodings for compression in compressions]
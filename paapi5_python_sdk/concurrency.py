@@ -0,0 +1,203 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import threading
+import time
+
+from paapi5_python_sdk.rest import ApiException
+
+THROTTLING_ERROR_CODES = frozenset(['TooManyRequests'])
+
+
+class ConcurrencyLimitExceeded(ApiException):
+    """Raised when a call waited `max_wait` seconds for a free slot."""
+
+    def __init__(self, limit, waited):
+        super(ConcurrencyLimitExceeded, self).__init__(
+            status=0, reason="No free slot within %.3f s (limit %d)"
+            % (waited, limit))
+        self.limit = limit
+
+
+def is_throttled(error):
+    """Default throttling predicate: a 429 answer, or a TooManyRequests
+    error code."""
+    return isinstance(error, ApiException) and (
+        error.status == 429 or
+        bool(THROTTLING_ERROR_CODES.intersection(error.error_codes())))
+
+
+class ConcurrencyLimiter(object):
+    """Bounds the number of requests in flight, adapting the bound to the
+    throttling feedback of PA-API (additive increase, multiplicative
+    decrease).
+
+    Each successful call faster than `latency_threshold` raises the limit
+    by `increase / limit`, i.e. by `increase` once a whole limit's worth of
+    calls succeeded. A throttled call multiplies it by `decrease`; calls
+    that were already in flight when the limit was cut do not cut it
+    again, so one burst of 429s counts once. Other errors and slow calls
+    leave the limit unchanged. The limit stays within
+    [`min_limit`, `max_limit`].
+
+    Calls beyond the limit wait for a slot, at most `max_wait` seconds
+    (None waits as long as needed) or the time their deadline leaves, and
+    then raise ConcurrencyLimitExceeded.
+
+    Set on `Configuration.concurrency_limiter` and share the instance
+    between the ApiClients of one account: the quota is per account.
+    Counters in `metrics` under `<name>.`: requests, throttled, decreases,
+    rejected; gauges limit and in_flight.
+
+    :param is_throttle: predicate on the exception raised by a call.
+    """
+
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=64,
+                 increase=1.0, decrease=0.5, latency_threshold=None,
+                 max_wait=None, is_throttle=is_throttled, metrics=None,
+                 name='concurrency'):
+        if not 0 < decrease < 1:
+            raise ValueError("Invalid value for `decrease`, must be "
+                             "between 0 and 1")
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Invalid limits, must satisfy 1 <= min_limit "
+                             "<= initial_limit <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_threshold = latency_threshold
+        self.max_wait = max_wait
+        self.is_throttle = is_throttle
+        self.metrics = metrics
+        self.name = name
+        self._condition = threading.Condition()
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._decreased_at = 0
+        self._started = 0
+        self._counters = {'requests': 0, 'throttled': 0, 'decreases': 0,
+                          'rejected': 0}
+        self._publish()
+
+    @property
+    def limit(self):
+        """Current number of requests allowed in flight."""
+        with self._condition:
+            return int(self._limit)
+
+    @property
+    def in_flight(self):
+        with self._condition:
+            return self._in_flight
+
+    def call(self, send, timeout=None):
+        """Returns `send()` once a slot is free.
+
+        :param timeout: maximal wait in seconds, on top of `max_wait`.
+        :raises ConcurrencyLimitExceeded: if no slot freed up in time.
+        """
+        ticket = self._acquire(timeout)
+        started = time.time()
+        try:
+            result = send()
+        except Exception as error:
+            self._release(ticket, throttled=self.is_throttle(error),
+                          healthy=False)
+            raise
+        latency = time.time() - started
+        self._release(ticket, throttled=False, healthy=(
+            self.latency_threshold is None or
+            latency < self.latency_threshold))
+        return result
+
+    def stats(self):
+        """Returns the current limit, the requests in flight and the
+        counters."""
+        with self._condition:
+            stats = dict(self._counters)
+            stats['limit'] = int(self._limit)
+            stats['in_flight'] = self._in_flight
+            return stats
+
+    def _acquire(self, timeout):
+        waits = [wait for wait in (self.max_wait, timeout) if wait is not None]
+        started = time.time()
+        expires_at = started + min(waits) if waits else None
+        self._count('requests')
+        with self._condition:
+            self._counters['requests'] += 1
+            while self._in_flight >= int(self._limit):
+                remaining = None
+                if expires_at is not None:
+                    remaining = expires_at - time.time()
+                    if remaining <= 0:
+                        self._counters['rejected'] += 1
+                        rejected_at = int(self._limit)
+                        break
+                self._condition.wait(remaining)
+            else:
+                self._in_flight += 1
+                self._started += 1
+                rejected_at = None
+            ticket = self._started
+        if rejected_at is not None:
+            self._count('rejected')
+            raise ConcurrencyLimitExceeded(rejected_at, time.time() - started)
+        self._publish()
+        return ticket
+
+    def _release(self, ticket, throttled, healthy):
+        decreased = False
+        with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                self._counters['throttled'] += 1
+                limit = max(float(self.min_limit),
+                            self._limit * self.decrease)
+                if ticket > self._decreased_at and limit < self._limit:
+                    self._limit = limit
+                    self._decreased_at = self._started
+                    self._counters['decreases'] += 1
+                    decreased = True
+            elif healthy:
+                self._limit = min(float(self.max_limit),
+                                  self._limit + self.increase / self._limit)
+            self._condition.notify_all()
+        if throttled:
+            self._count('throttled')
+        if decreased:
+            self._count('decreases')
+        self._publish()
+
+    def _publish(self):
+        if self.metrics is not None:
+            with self._condition:
+                limit, in_flight = int(self._limit), self._in_flight
+            self.metrics.set_gauge(self.name + '.limit', limit)
+            self.metrics.set_gauge(self.name + '.in_flight', in_flight)
+
+    def _count(self, counter):
+        if self.metrics is not None:
+            self.metrics.incr('%s.%s' % (self.name, counter))
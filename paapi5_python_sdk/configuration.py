@@ -61,6 +61,27 @@ class Configuration(six.with_metaclass(TypeWithDefault, object)):
         """Constructor"""
         # Default Base url
         self.host = "https://webservices.amazon.com"
+        # Scheme used to reach the ApiClient host. Only local stand-ins of
+        # the service (e.g. benchmarks.simulator) should use "http".
+        self.scheme = "https"
+        # paapi5_python_sdk.cassette.Cassette recording or replaying the
+        # responses of the REST client, None to always use the network.
+        self.cassette = None
+        # paapi5_python_sdk.hedging.HedgingPolicy sending a duplicate of
+        # slow requests, None to never hedge.
+        self.hedging = None
+        # paapi5_python_sdk.circuit_breaker.CircuitBreaker failing fast on
+        # a failing host/region, None to always call the service.
+        self.circuit_breaker = None
+        # paapi5_python_sdk.concurrency.ConcurrencyLimiter adapting the
+        # number of requests in flight to throttling, None for no bound.
+        self.concurrency_limiter = None
+        # paapi5_python_sdk.scheduler.PriorityScheduler ordering the calls
+        # by lane (see `_priority`), None to send them in arrival order.
+        self.scheduler = None
+        # paapi5_python_sdk.credentials.CredentialPool signing each request
+        # with one of several credentials, None to use the client's keys.
+        self.credential_pool = None
 
         # Logging Settings
         self.logger = {}
@@ -0,0 +1,260 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import collections
+import json
+import re
+import threading
+import time
+
+from paapi5_python_sdk import serializer
+from paapi5_python_sdk.concurrency import is_throttled
+from paapi5_python_sdk.rest import ApiException
+
+# PA-API error codes blaming the credential itself rather than the call.
+CREDENTIAL_ERROR_CODES = frozenset([
+    'AccessDenied', 'AccessDeniedAwsUsers', 'IncompleteSignature',
+    'InvalidAssociate', 'InvalidPartnerTag', 'InvalidSignature',
+    'UnrecognizedClient',
+])
+# The PartnerTag member of an encoded request, its JSON string in group 1.
+_PARTNER_TAG = re.compile(br'"PartnerTag"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+def is_credential_failure(error):
+    """Default predicate of errors that disable a credential: 401/403
+    answers and the PA-API codes of CREDENTIAL_ERROR_CODES."""
+    return isinstance(error, ApiException) and (
+        error.status in (401, 403) or
+        bool(CREDENTIAL_ERROR_CODES.intersection(error.error_codes())))
+
+
+class Credential(object):
+    """An access key pair and the partner tags it may use.
+
+    :param partner_tag: partner tag of the marketplaces not in
+        `partner_tags`.
+    :param tps: requests per second allotted to this credential by PA-API.
+    :param partner_tags: dict marketplace code -> partner tag, for the
+        accounts with a tag per marketplace.
+    """
+
+    def __init__(self, access_key, secret_key, partner_tag, tps=1.0,
+                 partner_tags=None):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.partner_tag = partner_tag
+        self.tps = tps
+        self.partner_tags = dict(partner_tags or {})
+
+    def partner_tag_for(self, marketplace):
+        """Returns the partner tag to use on the marketplace of code
+        `marketplace` (None for the client's own host)."""
+        return self.partner_tags.get(marketplace, self.partner_tag)
+
+    def __repr__(self):
+        # never print the secret key
+        return 'Credential(%s, %s, tps=%s)' % (self.access_key,
+                                               self.partner_tag, self.tps)
+
+
+def parse_credentials(spec):
+    """Parses `access_key:secret_key:partner_tags[:tps]` entries separated
+    by commas into a list of Credential.
+
+    `partner_tags` is a partner tag, optionally followed by per-marketplace
+    tags separated by semicolons: `xx-21;fr=xx-fr-21;de=xx-de-21`.
+    """
+    credentials = []
+    for entry in spec.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        fields = entry.split(':')
+        if len(fields) not in (3, 4):
+            raise ValueError("Invalid credential, expected "
+                             "access_key:secret_key:partner_tags[:tps]")
+        tps = float(fields[3]) if len(fields) == 4 else 1.0
+        tags = fields[2].split(';')
+        if any('=' not in tag for tag in tags[1:]):
+            raise ValueError("Invalid partner tags, expected "
+                             "partner_tag[;code=partner_tag...]")
+        partner_tags = dict(tag.split('=', 1) for tag in tags[1:])
+        credentials.append(Credential(fields[0], fields[1], tags[0], tps,
+                                      partner_tags=partner_tags))
+    return credentials
+
+
+def with_partner_tag(body, partner_tag):
+    """Returns the encoded request `body` with its PartnerTag set to
+    `partner_tag`, unchanged if it already is.
+
+    The tag is patched into the bytes, as PreparedRequest patches its
+    fields: the rest of the body stays the bytes the serializer produced,
+    and nothing is decoded but the old tag.
+    """
+    match = _PARTNER_TAG.search(body)
+    if match is None:
+        document = json.loads(body.decode('utf-8'))
+        document['PartnerTag'] = partner_tag
+        return serializer.dumps(document).encode('utf-8')
+    if json.loads(match.group(1).decode('utf-8')) == partner_tag:
+        return body
+    return body[:match.start(1)] + \
+        serializer.dumps(partner_tag).encode('utf-8') + body[match.end(1):]
+
+
+class _CredentialState(object):
+
+    __slots__ = ('credential', 'in_flight', 'started', 'throttled_until',
+                 'disabled_until', 'counters')
+
+    def __init__(self, credential):
+        self.credential = credential
+        self.in_flight = 0
+        self.started = collections.deque()
+        self.throttled_until = 0.0
+        self.disabled_until = 0.0
+        self.counters = collections.Counter()
+
+    def available_at(self):
+        return max(self.throttled_until, self.disabled_until)
+
+    def load(self, now):
+        while self.started and self.started[0] <= now - 1.0:
+            self.started.popleft()
+        # requests still in flight after a second count as well
+        return float(max(len(self.started), self.in_flight)) / \
+            self.credential.tps
+
+
+class CredentialPool(object):
+    """Spreads the requests of an ApiClient over several credentials, each
+    with its own PA-API quota.
+
+    Each request goes to the least loaded available credential: the one
+    with the fewest requests started over the last second (or in flight,
+    if more), relative to its `tps`. A throttled credential (429) is
+    skipped for `throttle_cooldown` seconds; one failing with an
+    authentication or partner tag error is skipped for
+    `failure_cooldown` seconds. When every credential is skipped, the one
+    available first is used anyway.
+
+    Set on `Configuration.credential_pool`: ApiClient then signs each
+    request with the chosen credential, and rewrites the PartnerTag of the
+    body to the partner tag of that credential for the marketplace of the
+    client (`Credential.partner_tag_for(ApiClient.marketplace)`), so both
+    always match. Counters in `metrics` under `<name>.<access key>.`:
+    requests, throttled, failures.
+
+    :param credentials: list of Credential.
+    """
+
+    def __init__(self, credentials, throttle_cooldown=1.0,
+                 failure_cooldown=300.0, is_failure=is_credential_failure,
+                 is_throttle=is_throttled, metrics=None, name='credentials',
+                 clock=time.time):
+        if not credentials:
+            raise ValueError("Invalid value for `credentials`, must not be "
+                             "empty")
+        self.throttle_cooldown = throttle_cooldown
+        self.failure_cooldown = failure_cooldown
+        self.is_failure = is_failure
+        self.is_throttle = is_throttle
+        self.metrics = metrics
+        self.name = name
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._states = [_CredentialState(credential)
+                        for credential in credentials]
+
+    @property
+    def credentials(self):
+        return [state.credential for state in self._states]
+
+    def call(self, send):
+        """Returns `send(credential)` with the least loaded credential."""
+        state = self._acquire()
+        try:
+            result = send(state.credential)
+        except Exception as error:
+            self._release(state, error)
+            raise
+        self._release(state, None)
+        return result
+
+    def _acquire(self):
+        now = self.clock()
+        with self._lock:
+            available = [state for state in self._states
+                         if state.available_at() <= now]
+            if available:
+                state = min(available, key=lambda state: state.load(now))
+            else:
+                state = min(self._states,
+                            key=lambda state: state.available_at())
+            state.in_flight += 1
+            state.started.append(now)
+            state.counters['requests'] += 1
+        self._count(state, 'requests')
+        return state
+
+    def _release(self, state, error):
+        counter = None
+        if error is not None:
+            if self.is_throttle(error):
+                counter = 'throttled'
+            elif self.is_failure(error):
+                counter = 'failures'
+        now = self.clock()
+        with self._lock:
+            state.in_flight -= 1
+            if counter == 'throttled':
+                state.throttled_until = now + self.throttle_cooldown
+            elif counter == 'failures':
+                state.disabled_until = now + self.failure_cooldown
+            if counter is not None:
+                state.counters[counter] += 1
+        if counter is not None:
+            self._count(state, counter)
+
+    def stats(self):
+        """Returns, per access key, the partner tag, the current load, the
+        requests in flight, the counters and whether it is available."""
+        now = self.clock()
+        with self._lock:
+            return {state.credential.access_key: {
+                'partner_tag': state.credential.partner_tag,
+                'load': round(state.load(now), 4),
+                'in_flight': state.in_flight,
+                'available': state.available_at() <= now,
+                'requests': state.counters['requests'],
+                'throttled': state.counters['throttled'],
+                'failures': state.counters['failures'],
+            } for state in self._states}
+
+    def _count(self, state, counter):
+        if self.metrics is not None:
+            self.metrics.incr('%s.%s.%s' % (
+                self.name, state.credential.access_key, counter))
@@ -0,0 +1,86 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import time
+
+from paapi5_python_sdk.rest import ApiException
+
+
+class DeadlineExceeded(ApiException):
+    """Raised instead of starting a call once its deadline has passed."""
+
+    def __init__(self, budget):
+        super(DeadlineExceeded, self).__init__(
+            status=0, reason="Deadline of %.3f s exceeded" % budget)
+        self.budget = budget
+
+
+class Deadline(object):
+    """Time budget shared by every call of one operation.
+
+    >>> deadline = Deadline(5.0)
+    >>> api.search_items(request, _deadline=deadline)
+
+    Each call made with `_deadline` gets the time left as its request
+    timeout (or its own `_request_timeout` if shorter), and raises
+    DeadlineExceeded without touching the network once nothing is left.
+    Passing the same Deadline to every page of a search bounds the whole
+    search, not each page.
+
+    :param seconds: budget, from now.
+    """
+
+    def __init__(self, seconds, clock=time.time):
+        self.budget = seconds
+        self.clock = clock
+        self.expires_at = clock() + seconds
+
+    def remaining(self):
+        """Returns the seconds left, 0 once expired."""
+        return max(0.0, self.expires_at - self.clock())
+
+    @property
+    def expired(self):
+        return self.clock() >= self.expires_at
+
+    def check(self):
+        """Raises DeadlineExceeded if the deadline has passed."""
+        if self.expired:
+            raise DeadlineExceeded(self.budget)
+
+    def timeout(self, request_timeout=None):
+        """Returns `request_timeout` capped to the time left.
+
+        :param request_timeout: None, total seconds, or a
+            (connection, read) pair as accepted by `_request_timeout`.
+        :raises DeadlineExceeded: if no time is left.
+        """
+        remaining = self.expires_at - self.clock()
+        if remaining <= 0:
+            raise DeadlineExceeded(self.budget)
+        if request_timeout is None:
+            return remaining
+        if isinstance(request_timeout, tuple):
+            return tuple(min(value, remaining) for value in request_timeout)
+        return min(request_timeout, remaining)
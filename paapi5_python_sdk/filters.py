@@ -0,0 +1,187 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import copy
+import math
+
+from paapi5_python_sdk.models.search_items_resource import SearchItemsResource
+
+# PA-API only accepts MinReviewsRating values 1 to 4.
+MAX_REVIEWS_RATING_FILTER = 4
+
+
+class SearchFilter(object):
+    """Conditions on search results, pushed down to SearchItems where the
+    request has a matching field and checked locally otherwise.
+
+    >>> item_filter = SearchFilter(min_price=25, min_reviews_rating=4.5,
+    ...                            delivery_flags=[DeliveryFlag.PRIME],
+    ...                            min_review_count=100)
+    >>> results = search_pages(api, request, pages=10, target=50,
+    ...                        item_filter=item_filter)
+
+    Every item the service filters out is an item that no page has to
+    carry, so the pushed-down conditions cut pages rather than items. Only
+    the residual conditions are checked on the items received: the review
+    count, the fraction of a star rating that MinReviewsRating cannot
+    express, and `predicates`.
+
+    :param min_price: lowest price, in currency units (e.g. 25 for 25.00
+        EUR); sent as MinPrice.
+    :param max_price: highest price, in currency units; sent as MaxPrice.
+    :param denomination: lowest denominations per currency unit, in which
+        PA-API expects prices (100 for cents, 1 for JPY).
+    :param min_reviews_rating: lowest star rating; its integer part (at
+        most 4) is sent as MinReviewsRating, the rest is checked locally.
+    :param min_saving_percent: sent as MinSavingPercent.
+    :param delivery_flags: list of DeliveryFlag, sent as DeliveryFlags.
+    :param availability: Availability, sent as Availability.
+    :param merchant: Merchant, sent as Merchant.
+    :param condition: Condition, sent as Condition.
+    :param min_review_count: lowest number of customer reviews, checked
+        locally.
+    :param predicates: callables(item) returning False for the items to
+        drop, checked locally.
+    """
+
+    def __init__(self, min_price=None, max_price=None, denomination=100,
+                 min_reviews_rating=None, min_saving_percent=None,
+                 delivery_flags=None, availability=None, merchant=None,
+                 condition=None, min_review_count=None, predicates=()):
+        self.min_price = min_price
+        self.max_price = max_price
+        self.denomination = denomination
+        self.min_reviews_rating = min_reviews_rating
+        self.min_saving_percent = min_saving_percent
+        self.delivery_flags = delivery_flags
+        self.availability = availability
+        self.merchant = merchant
+        self.condition = condition
+        self.min_review_count = min_review_count
+        self.predicates = tuple(predicates)
+
+    def request_fields(self):
+        """Returns the SearchItemsRequest fields the filter sets, as a dict
+        attribute name -> value."""
+        fields = {
+            'min_price': self._denominated(self.min_price, math.ceil),
+            'max_price': self._denominated(self.max_price, math.floor),
+            'min_saving_percent': self.min_saving_percent,
+            'delivery_flags': list(self.delivery_flags)
+            if self.delivery_flags else None,
+            'availability': self.availability,
+            'merchant': self.merchant,
+            'condition': self.condition,
+        }
+        if self.min_reviews_rating is not None and \
+                self.min_reviews_rating >= 1:
+            fields['min_reviews_rating'] = min(
+                int(self.min_reviews_rating), MAX_REVIEWS_RATING_FILTER)
+        return {name: value for name, value in fields.items()
+                if value is not None}
+
+    def residual(self):
+        """Returns the conditions left to check locally, as a list of
+        callables(item)."""
+        checks = []
+        pushed = self.request_fields().get('min_reviews_rating')
+        if self.min_reviews_rating is not None and \
+                self.min_reviews_rating != pushed:
+            checks.append(self._has_rating)
+        if self.min_review_count is not None:
+            checks.append(self._has_review_count)
+        return checks + list(self.predicates)
+
+    def with_denomination(self, denomination, rate=1):
+        """Returns the filter with prices sent in `denomination`, e.g. the
+        `Marketplace.denomination` of the marketplace searched.
+
+        Only the unit changes: `min_price=25` stays 25 of the currency of
+        the marketplace (25 EUR, 25 GBP, 25 JPY...). To compare prices
+        across currencies, `rate` multiplies them, e.g. the exchange rate
+        from the currency the filter was written in.
+        """
+        if denomination == self.denomination and rate == 1:
+            return self
+        item_filter = copy.copy(self)
+        item_filter.denomination = denomination
+        if rate != 1:
+            if self.min_price is not None:
+                item_filter.min_price = self.min_price * rate
+            if self.max_price is not None:
+                item_filter.max_price = self.max_price * rate
+        return item_filter
+
+    def resources(self):
+        """Returns the SearchItemsResource values the local checks read,
+        besides whatever `predicates` need."""
+        resources = []
+        residual = self.residual()
+        if self._has_rating in residual:
+            resources.append(SearchItemsResource.CUSTOMERREVIEWS_STARRATING)
+        if self._has_review_count in residual:
+            resources.append(SearchItemsResource.CUSTOMERREVIEWS_COUNT)
+        return resources
+
+    def apply(self, request):
+        """Returns a copy of `request` with the filter fields set and the
+        resources of the local checks added."""
+        request = copy.copy(request)
+        for name, value in self.request_fields().items():
+            setattr(request, name, value)
+        missing = [resource for resource in self.resources()
+                   if resource not in (request.resources or ())]
+        if missing:
+            request.resources = list(request.resources or ()) + missing
+        return request
+
+    def check(self, request):
+        """Raises ValueError unless `request` carries the filter fields,
+        i.e. comes from `apply`."""
+        for name, value in self.request_fields().items():
+            if getattr(request, name) != value:
+                raise ValueError("`%s` of the request is %r, the filter "
+                                 "pushes down %r; prepare the request "
+                                 "returned by SearchFilter.apply()."
+                                 % (name, getattr(request, name), value))
+
+    def matches(self, item):
+        """True if `item` passes the residual conditions."""
+        return all(check(item) for check in self.residual())
+
+    def _denominated(self, amount, rounding):
+        if amount is None:
+            return None
+        return int(rounding(round(amount * self.denomination, 6)))
+
+    def _has_rating(self, item):
+        reviews = item.customer_reviews
+        rating = reviews.star_rating if reviews is not None else None
+        return rating is not None and rating.value is not None and \
+            rating.value >= self.min_reviews_rating
+
+    def _has_review_count(self, item):
+        reviews = item.customer_reviews
+        return reviews is not None and reviews.count is not None and \
+            reviews.count >= self.min_review_count
@@ -0,0 +1,220 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import collections
+import math
+import threading
+import time
+
+
+class _Race(object):
+    """Outcomes of the attempts of one hedged call, first success wins."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.winner = None
+        self.errors = []
+        self.finished = 0
+
+    def run(self, attempt, send, on_done):
+        started = time.time()
+        try:
+            result = send()
+        except Exception as error:
+            on_done(time.time() - started, False)
+            with self.condition:
+                self.errors.append((attempt, error))
+                self.finished += 1
+                self.condition.notify_all()
+            return
+        on_done(time.time() - started, True)
+        with self.condition:
+            if self.winner is None:
+                self.winner = (attempt, result)
+            self.finished += 1
+            self.condition.notify_all()
+
+    def wait(self, attempts, timeout=None):
+        """Waits until a winner or `attempts` outcomes, or `timeout`.
+        Returns True once the race is decided."""
+        with self.condition:
+            if timeout is not None:
+                deadline = time.time() + timeout
+            while self.winner is None and self.finished < attempts:
+                if timeout is None:
+                    self.condition.wait()
+                    continue
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+            return True
+
+
+class HedgingPolicy(object):
+    """Sends a duplicate of a request that is slower than usual and keeps
+    whichever response arrives first.
+
+    The hedge is sent once a request has been outstanding longer than the
+    `percentile` of the latencies observed over the last `window` requests,
+    so with percentile=95 about one request in twenty is hedged. At most
+    `max_hedge_rate` of the requests of the window are hedged, which bounds
+    the extra quota used when the whole service slows down rather than a
+    few requests. No hedge is sent before `min_samples` latencies are
+    known.
+
+    Set on `Configuration.hedging`; ApiClient then routes every request
+    through `call()`. The losing request is not cancelled (urllib3 cannot
+    abort it), its response is discarded. Error responses do not win: if
+    the first attempt to finish fails, the other one is awaited.
+
+    Counters, in `metrics` under `<name>.`: requests, hedges, hedge_wins,
+    primary_wins, rate_limited; gauge delay_ms.
+
+    :param percentile: latency percentile after which to hedge.
+    :param max_hedge_rate: maximal fraction of hedged requests.
+    :param min_delay: lower bound of the hedging delay, in seconds.
+    :param window: number of recent requests the percentile and the hedge
+        rate are computed over.
+    :param min_samples: latencies needed before hedging.
+    """
+
+    def __init__(self, percentile=95.0, max_hedge_rate=0.05, min_delay=0.02,
+                 window=1000, min_samples=20, metrics=None, name='hedging'):
+        if not 0 < percentile < 100:
+            raise ValueError("Invalid value for `percentile`, must be "
+                             "between 0 and 100")
+        self.percentile = percentile
+        self.max_hedge_rate = max_hedge_rate
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.metrics = metrics
+        self.name = name
+        self._lock = threading.Lock()
+        self._latencies = collections.deque(maxlen=window)
+        # one [hedged] cell per call, marked by the call itself
+        self._hedged = collections.deque(maxlen=window)
+        self._delay = None
+        self._stale = 0
+        self._counters = collections.Counter()
+
+    def _incr(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+        if self.metrics is not None:
+            self.metrics.incr('%s.%s' % (self.name, counter))
+
+    def observe(self, latency, success=True):
+        """Records the latency of a finished attempt."""
+        if not success:
+            return
+        with self._lock:
+            self._latencies.append(latency)
+            self._stale += 1
+
+    def delay(self):
+        """Returns the current hedging delay in seconds, None while too few
+        latencies are known."""
+        with self._lock:
+            count = len(self._latencies)
+            if count < self.min_samples:
+                return None
+            # Sorting the window on every call would cost more than the
+            # request bookkeeping; refresh it every few observations.
+            if self._delay is None or self._stale >= max(1, count // 20):
+                ordered = sorted(self._latencies)
+                rank = int(math.ceil(self.percentile / 100.0 * count)) - 1
+                self._delay = max(self.min_delay, ordered[rank])
+                self._stale = 0
+            delay = self._delay
+        if self.metrics is not None:
+            self.metrics.set_gauge(self.name + '.delay_ms',
+                                   round(delay * 1000.0, 3))
+        return delay
+
+    def _allow_hedge(self, slot):
+        with self._lock:
+            hedges = sum(1 for hedged in self._hedged if hedged[0])
+            allowed = hedges + 1 <= self.max_hedge_rate * max(
+                len(self._hedged), self.min_samples)
+            if allowed:
+                slot[0] = True
+            return allowed
+
+    def call(self, send):
+        """Returns `send()`, hedged with a second `send()` if the first is
+        slower than the hedging delay."""
+        self._incr('requests')
+        slot = [False]
+        with self._lock:
+            self._hedged.append(slot)
+        delay = self.delay()
+        if delay is None:
+            started = time.time()
+            result = send()
+            self.observe(time.time() - started)
+            return result
+
+        race = _Race()
+        self._start(race, 'primary', send)
+        attempts = 1
+        if not race.wait(attempts, timeout=delay):
+            if self._allow_hedge(slot):
+                self._incr('hedges')
+                self._start(race, 'hedge', send)
+                attempts = 2
+            else:
+                self._incr('rate_limited')
+        race.wait(attempts)
+
+        if race.winner is not None:
+            attempt, result = race.winner
+            if attempts == 2:
+                self._incr('hedge_wins' if attempt == 'hedge'
+                           else 'primary_wins')
+            return result
+        raise race.errors[0][1]
+
+    def _start(self, race, attempt, send):
+        thread = threading.Thread(target=race.run,
+                                  args=(attempt, send, self.observe))
+        thread.daemon = True
+        thread.start()
+
+    def stats(self):
+        """Returns the counters and the share of hedges that won."""
+        with self._lock:
+            counters = dict(self._counters)
+            delay = self._delay
+        hedges = counters.get('hedges', 0)
+        return {
+            'requests': counters.get('requests', 0),
+            'hedges': hedges,
+            'hedge_wins': counters.get('hedge_wins', 0),
+            'primary_wins': counters.get('primary_wins', 0),
+            'rate_limited': counters.get('rate_limited', 0),
+            'hedge_win_rate': round(float(counters.get('hedge_wins', 0)) /
+                                    hedges, 4) if hedges else None,
+            'delay_ms': None if delay is None else round(delay * 1000.0, 3),
+        }
@@ -0,0 +1,240 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import collections
+import threading
+
+from paapi5_python_sdk.api.default_api import DefaultApi
+from paapi5_python_sdk.api_client import ApiClient
+from paapi5_python_sdk.pagination import search_pages
+from paapi5_python_sdk.prepared_request import PreparedRequest
+
+
+# Lowest denominations per unit of the currencies that are not counted in
+# hundredths, in which PA-API expects MinPrice and MaxPrice.
+CURRENCY_DENOMINATIONS = {'JPY': 1}
+
+
+class Marketplace(object):
+    """A PA-API locale: the host and region to call, and the marketplace
+    and currency of its offers.
+
+    :param code: short name, e.g. "fr".
+    :param marketplace: value of the Marketplace request parameter,
+        derived from the host by default ("www.amazon.fr").
+    :ivar denomination: lowest denominations per unit of `currency`
+        (100 for cents, 1 for JPY).
+    """
+
+    def __init__(self, code, host, region, currency, marketplace=None):
+        self.code = code
+        self.host = host
+        self.region = region
+        self.currency = currency
+        if marketplace is None:
+            marketplace = 'www.' + host.split('.', 1)[1]
+        self.marketplace = marketplace
+        self.denomination = CURRENCY_DENOMINATIONS.get(currency, 100)
+
+    def __repr__(self):
+        return 'Marketplace(%s, %s, %s)' % (self.code, self.host, self.region)
+
+
+# https://webservices.amazon.com/paapi5/documentation/common-request-parameters.html#host-and-region  # noqa: E501
+MARKETPLACES = collections.OrderedDict(
+    (marketplace.code, marketplace) for marketplace in [
+        Marketplace('ae', 'webservices.amazon.ae', 'eu-west-1', 'AED'),
+        Marketplace('au', 'webservices.amazon.com.au', 'us-west-2', 'AUD'),
+        Marketplace('be', 'webservices.amazon.com.be', 'eu-west-1', 'EUR'),
+        Marketplace('br', 'webservices.amazon.com.br', 'us-east-1', 'BRL'),
+        Marketplace('ca', 'webservices.amazon.ca', 'us-east-1', 'CAD'),
+        Marketplace('de', 'webservices.amazon.de', 'eu-west-1', 'EUR'),
+        Marketplace('eg', 'webservices.amazon.eg', 'eu-west-1', 'EGP'),
+        Marketplace('es', 'webservices.amazon.es', 'eu-west-1', 'EUR'),
+        Marketplace('fr', 'webservices.amazon.fr', 'eu-west-1', 'EUR'),
+        Marketplace('in', 'webservices.amazon.in', 'eu-west-1', 'INR'),
+        Marketplace('it', 'webservices.amazon.it', 'eu-west-1', 'EUR'),
+        Marketplace('jp', 'webservices.amazon.co.jp', 'us-west-2', 'JPY'),
+        Marketplace('mx', 'webservices.amazon.com.mx', 'us-east-1', 'MXN'),
+        Marketplace('nl', 'webservices.amazon.nl', 'eu-west-1', 'EUR'),
+        Marketplace('pl', 'webservices.amazon.pl', 'eu-west-1', 'PLN'),
+        Marketplace('sa', 'webservices.amazon.sa', 'eu-west-1', 'SAR'),
+        Marketplace('se', 'webservices.amazon.se', 'eu-west-1', 'SEK'),
+        Marketplace('sg', 'webservices.amazon.sg', 'us-west-2', 'SGD'),
+        Marketplace('tr', 'webservices.amazon.com.tr', 'eu-west-1', 'TRY'),
+        Marketplace('uk', 'webservices.amazon.co.uk', 'eu-west-1', 'GBP'),
+        Marketplace('us', 'webservices.amazon.com', 'us-east-1', 'USD'),
+    ])
+
+
+def register_marketplace(marketplace):
+    """Adds or replaces a marketplace of the registry, e.g. to point a
+    code at a local simulator."""
+    MARKETPLACES[marketplace.code] = marketplace
+
+
+def get_marketplace(code):
+    """Returns the registered Marketplace of `code`.
+
+    :raises ValueError: for an unknown code.
+    """
+    marketplace = MARKETPLACES.get(code)
+    if marketplace is None:
+        raise ValueError("Invalid marketplace `%s`, must be one of %s"
+                         % (code, ', '.join(MARKETPLACES)))
+    return marketplace
+
+
+class MarketplaceResults(object):
+    """Outcome of a search run on several marketplaces.
+
+    :ivar results: OrderedDict code -> PageResults, for the marketplaces
+        that answered.
+    :ivar errors: dict code -> exception, for the marketplaces that failed.
+    """
+
+    def __init__(self):
+        self.results = collections.OrderedDict()
+        self.errors = {}
+
+    @property
+    def complete(self):
+        """True if every marketplace answered with every page."""
+        return not self.errors and all(
+            result.complete for result in self.results.values())
+
+    def items(self):
+        """Returns (marketplace code, item) pairs, marketplace by
+        marketplace."""
+        return [(code, item) for code, result in self.results.items()
+                for item in result.items]
+
+
+class MarketplaceSearch(object):
+    """Runs the same SearchItemsRequest on several marketplaces at once.
+
+    >>> search = MarketplaceSearch(access_key, secret_key,
+    ...                            ['fr', 'de', 'it', 'es'])
+    >>> results = search.search_items(request, pages=2)
+    >>> for code, item in results.items(): ...
+
+    Each marketplace gets its own ApiClient, hence its own connection
+    pool, kept for the lifetime of the MarketplaceSearch. Marketplaces are
+    searched in parallel, so a search takes as long as the slowest
+    marketplace. The Marketplace parameter of the request is set for each
+    marketplace, and so is its PartnerTag when `partner_tags` has one for
+    it (associate tags are usually per marketplace). With a credential
+    pool, the tag of the chosen credential for the marketplace is sent
+    instead, see `Credential.partner_tags`. The prices of an `item_filter`
+    are sent in the smallest unit of the currency of each marketplace; they
+    are amounts of that currency unless `exchange_rate` converts them.
+
+    :param marketplaces: codes (see MARKETPLACES) or Marketplace objects.
+    :param partner_tags: dict code -> partner tag.
+    :param configuration: Configuration shared by the clients.
+    :param apis: dict code -> DefaultApi of the marketplace, to reuse
+        clients kept by the caller instead of creating them.
+    """
+
+    def __init__(self, access_key, secret_key, marketplaces,
+                 partner_tags=None, configuration=None, apis=None):
+        self.marketplaces = collections.OrderedDict()
+        for marketplace in marketplaces:
+            if not isinstance(marketplace, Marketplace):
+                marketplace = get_marketplace(marketplace)
+            self.marketplaces[marketplace.code] = marketplace
+        self.partner_tags = dict(partner_tags or {})
+        apis = apis or {}
+        self.apis = collections.OrderedDict(
+            (code, apis[code] if code in apis else DefaultApi(
+                api_client=ApiClient(
+                    access_key=access_key, secret_key=secret_key,
+                    host=marketplace.host, region=marketplace.region,
+                    configuration=configuration)))
+            for code, marketplace in self.marketplaces.items())
+        for code, api in self.apis.items():
+            api.api_client.marketplace = code
+
+    def search_items(self, request, pages=1, marketplaces=None,
+                     exchange_rate=None, **kwargs):
+        """Searches `pages` pages of `request` on each marketplace.
+
+        :param request: SearchItemsRequest.
+        :param marketplaces: codes to search, all of them by default.
+        :param exchange_rate: callable(currency) returning the amount of
+            `currency` worth one unit of the prices of `item_filter`; by
+            default these prices are taken as is in every currency.
+        :param kwargs: extra arguments of `search_pages` (item_filter,
+            deadline, concurrency, partial, retries, ...).
+        :return: MarketplaceResults, marketplaces in the given order.
+        """
+        codes = list(marketplaces or self.marketplaces)
+        item_filter = kwargs.pop('item_filter', None)
+        fields = ['item_page', 'marketplace']
+        if self.partner_tags:
+            fields.append('partner_tag')
+        # one encoding per currency, usually a single one
+        prepared = {}
+        for code in codes:
+            marketplace = self.marketplaces[code]
+            if marketplace.currency not in prepared:
+                local_filter = None
+                variant = request
+                if item_filter is not None:
+                    local_filter = item_filter.with_denomination(
+                        marketplace.denomination,
+                        rate=exchange_rate(marketplace.currency)
+                        if exchange_rate is not None else 1)
+                    variant = local_filter.apply(request)
+                prepared[marketplace.currency] = (
+                    PreparedRequest(variant, fields=fields), local_filter)
+        outcome = MarketplaceResults()
+        gathered = {}
+
+        def search(code):
+            values = {'marketplace': self.marketplaces[code].marketplace}
+            if self.partner_tags:
+                values['partner_tag'] = self.partner_tags.get(
+                    code, request.partner_tag)
+            variant, local_filter = prepared[
+                self.marketplaces[code].currency]
+            try:
+                gathered[code] = search_pages(
+                    self.apis[code], variant.with_defaults(**values), pages,
+                    item_filter=local_filter, **kwargs)
+            except Exception as error:
+                outcome.errors[code] = error
+
+        threads = [threading.Thread(target=search, args=(code,))
+                   for code in codes]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for code in codes:
+            if code in gathered:
+                outcome.results[code] = gathered[code]
+        return outcome
+
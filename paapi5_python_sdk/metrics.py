@@ -0,0 +1,73 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import threading
+
+
+class MetricsRegistry(object):
+    """Thread-safe store of named counters and gauges.
+
+    Counters only ever go up (hits, misses, errors); gauges hold the last
+    value that was set (queue depth, current limit). `snapshot()` returns
+    plain dicts so the result can be handed straight to a JSON encoder.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+
+    def incr(self, name, value=1):
+        """Adds `value` to the counter `name`."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name, value):
+        """Sets the gauge `name` to `value`."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def counter(self, name):
+        """Returns the current value of the counter `name`."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def gauge(self, name, default=None):
+        """Returns the current value of the gauge `name`."""
+        with self._lock:
+            return self._gauges.get(name, default)
+
+    def snapshot(self):
+        """Returns a copy of all counters and gauges."""
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+            }
+
+    def reset(self):
+        """Drops every counter and gauge."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
@@ -26,93 +26,135 @@ from __future__ import absolute_import
 """
 
 
-# import models into model package
-from paapi5_python_sdk.models.availability import Availability
-from paapi5_python_sdk.models.browse_node import BrowseNode
-from paapi5_python_sdk.models.browse_node_ancestor import BrowseNodeAncestor
-from paapi5_python_sdk.models.browse_node_child import BrowseNodeChild
-from paapi5_python_sdk.models.browse_node_info import BrowseNodeInfo
-from paapi5_python_sdk.models.browse_nodes_result import BrowseNodesResult
-from paapi5_python_sdk.models.by_line_info import ByLineInfo
-from paapi5_python_sdk.models.classifications import Classifications
-from paapi5_python_sdk.models.condition import Condition
-from paapi5_python_sdk.models.content_info import ContentInfo
-from paapi5_python_sdk.models.content_rating import ContentRating
-from paapi5_python_sdk.models.contributor import Contributor
-from paapi5_python_sdk.models.customer_reviews import CustomerReviews
-from paapi5_python_sdk.models.delivery_flag import DeliveryFlag
-from paapi5_python_sdk.models.dimension_based_attribute import DimensionBasedAttribute
-from paapi5_python_sdk.models.duration_price import DurationPrice
-from paapi5_python_sdk.models.error_data import ErrorData
-from paapi5_python_sdk.models.external_ids import ExternalIds
-from paapi5_python_sdk.models.get_browse_nodes_request import GetBrowseNodesRequest
-from paapi5_python_sdk.models.get_browse_nodes_resource import GetBrowseNodesResource
-from paapi5_python_sdk.models.get_browse_nodes_response import GetBrowseNodesResponse
-from paapi5_python_sdk.models.get_items_request import GetItemsRequest
-from paapi5_python_sdk.models.get_items_resource import GetItemsResource
-from paapi5_python_sdk.models.get_items_response import GetItemsResponse
-from paapi5_python_sdk.models.get_variations_request import GetVariationsRequest
-from paapi5_python_sdk.models.get_variations_resource import GetVariationsResource
-from paapi5_python_sdk.models.get_variations_response import GetVariationsResponse
-from paapi5_python_sdk.models.image_size import ImageSize
-from paapi5_python_sdk.models.image_type import ImageType
-from paapi5_python_sdk.models.images import Images
-from paapi5_python_sdk.models.item import Item
-from paapi5_python_sdk.models.item_id_type import ItemIdType
-from paapi5_python_sdk.models.item_info import ItemInfo
-from paapi5_python_sdk.models.items_result import ItemsResult
-from paapi5_python_sdk.models.language_type import LanguageType
-from paapi5_python_sdk.models.languages import Languages
-from paapi5_python_sdk.models.manufacture_info import ManufactureInfo
-from paapi5_python_sdk.models.max_price import MaxPrice
-from paapi5_python_sdk.models.merchant import Merchant
-from paapi5_python_sdk.models.min_price import MinPrice
-from paapi5_python_sdk.models.min_reviews_rating import MinReviewsRating
-from paapi5_python_sdk.models.min_saving_percent import MinSavingPercent
-from paapi5_python_sdk.models.multi_valued_attribute import MultiValuedAttribute
-from paapi5_python_sdk.models.offer_availability import OfferAvailability
-from paapi5_python_sdk.models.offer_condition import OfferCondition
-from paapi5_python_sdk.models.offer_condition_note import OfferConditionNote
-from paapi5_python_sdk.models.offer_count import OfferCount
-from paapi5_python_sdk.models.offer_delivery_info import OfferDeliveryInfo
-from paapi5_python_sdk.models.offer_listing import OfferListing
-from paapi5_python_sdk.models.offer_loyalty_points import OfferLoyaltyPoints
-from paapi5_python_sdk.models.offer_merchant_info import OfferMerchantInfo
-from paapi5_python_sdk.models.offer_price import OfferPrice
-from paapi5_python_sdk.models.offer_program_eligibility import OfferProgramEligibility
-from paapi5_python_sdk.models.offer_promotion import OfferPromotion
-from paapi5_python_sdk.models.offer_savings import OfferSavings
-from paapi5_python_sdk.models.offer_shipping_charge import OfferShippingCharge
-from paapi5_python_sdk.models.offer_sub_condition import OfferSubCondition
-from paapi5_python_sdk.models.offer_summary import OfferSummary
-from paapi5_python_sdk.models.offers import Offers
-from paapi5_python_sdk.models.partner_type import PartnerType
-from paapi5_python_sdk.models.price import Price
-from paapi5_python_sdk.models.price_type import PriceType
-from paapi5_python_sdk.models.product_advertising_api_client_exception import ProductAdvertisingAPIClientException
-from paapi5_python_sdk.models.product_advertising_api_service_exception import ProductAdvertisingAPIServiceException
-from paapi5_python_sdk.models.product_info import ProductInfo
-from paapi5_python_sdk.models.properties import Properties
-from paapi5_python_sdk.models.rating import Rating
-from paapi5_python_sdk.models.refinement import Refinement
-from paapi5_python_sdk.models.refinement_bin import RefinementBin
-from paapi5_python_sdk.models.rental_offer_listing import RentalOfferListing
-from paapi5_python_sdk.models.rental_offers import RentalOffers
-from paapi5_python_sdk.models.search_items_request import SearchItemsRequest
-from paapi5_python_sdk.models.search_items_resource import SearchItemsResource
-from paapi5_python_sdk.models.search_items_response import SearchItemsResponse
-from paapi5_python_sdk.models.search_refinements import SearchRefinements
-from paapi5_python_sdk.models.search_result import SearchResult
-from paapi5_python_sdk.models.single_boolean_valued_attribute import SingleBooleanValuedAttribute
-from paapi5_python_sdk.models.single_integer_valued_attribute import SingleIntegerValuedAttribute
-from paapi5_python_sdk.models.single_string_valued_attribute import SingleStringValuedAttribute
-from paapi5_python_sdk.models.sort_by import SortBy
-from paapi5_python_sdk.models.technical_info import TechnicalInfo
-from paapi5_python_sdk.models.trade_in_info import TradeInInfo
-from paapi5_python_sdk.models.trade_in_price import TradeInPrice
-from paapi5_python_sdk.models.unit_based_attribute import UnitBasedAttribute
-from paapi5_python_sdk.models.variation_attribute import VariationAttribute
-from paapi5_python_sdk.models.variation_dimension import VariationDimension
-from paapi5_python_sdk.models.variation_summary import VariationSummary
-from paapi5_python_sdk.models.variations_result import VariationsResult
-from paapi5_python_sdk.models.website_sales_rank import WebsiteSalesRank
+import importlib
+import sys
+
+# Model classes are imported on first access (PEP 562 module __getattr__)
+# instead of all at once with the package: most callers only ever touch a
+# handful of them, and every import adds to process start-up time. This
+# registry maps each class to its module; ApiClient resolves response types
+# through it as well.
+_MODEL_MODULES = {
+    'Availability': 'availability',
+    'BrowseNode': 'browse_node',
+    'BrowseNodeAncestor': 'browse_node_ancestor',
+    'BrowseNodeChild': 'browse_node_child',
+    'BrowseNodeInfo': 'browse_node_info',
+    'BrowseNodesResult': 'browse_nodes_result',
+    'ByLineInfo': 'by_line_info',
+    'Classifications': 'classifications',
+    'Condition': 'condition',
+    'ContentInfo': 'content_info',
+    'ContentRating': 'content_rating',
+    'Contributor': 'contributor',
+    'CustomerReviews': 'customer_reviews',
+    'DeliveryFlag': 'delivery_flag',
+    'DimensionBasedAttribute': 'dimension_based_attribute',
+    'DurationPrice': 'duration_price',
+    'ErrorData': 'error_data',
+    'ExternalIds': 'external_ids',
+    'GetBrowseNodesRequest': 'get_browse_nodes_request',
+    'GetBrowseNodesResource': 'get_browse_nodes_resource',
+    'GetBrowseNodesResponse': 'get_browse_nodes_response',
+    'GetItemsRequest': 'get_items_request',
+    'GetItemsResource': 'get_items_resource',
+    'GetItemsResponse': 'get_items_response',
+    'GetVariationsRequest': 'get_variations_request',
+    'GetVariationsResource': 'get_variations_resource',
+    'GetVariationsResponse': 'get_variations_response',
+    'ImageSize': 'image_size',
+    'ImageType': 'image_type',
+    'Images': 'images',
+    'Item': 'item',
+    'ItemIdType': 'item_id_type',
+    'ItemInfo': 'item_info',
+    'ItemsResult': 'items_result',
+    'LanguageType': 'language_type',
+    'Languages': 'languages',
+    'ManufactureInfo': 'manufacture_info',
+    'MaxPrice': 'max_price',
+    'Merchant': 'merchant',
+    'MinPrice': 'min_price',
+    'MinReviewsRating': 'min_reviews_rating',
+    'MinSavingPercent': 'min_saving_percent',
+    'MultiValuedAttribute': 'multi_valued_attribute',
+    'OfferAvailability': 'offer_availability',
+    'OfferCondition': 'offer_condition',
+    'OfferConditionNote': 'offer_condition_note',
+    'OfferCount': 'offer_count',
+    'OfferDeliveryInfo': 'offer_delivery_info',
+    'OfferListing': 'offer_listing',
+    'OfferLoyaltyPoints': 'offer_loyalty_points',
+    'OfferMerchantInfo': 'offer_merchant_info',
+    'OfferPrice': 'offer_price',
+    'OfferProgramEligibility': 'offer_program_eligibility',
+    'OfferPromotion': 'offer_promotion',
+    'OfferSavings': 'offer_savings',
+    'OfferShippingCharge': 'offer_shipping_charge',
+    'OfferSubCondition': 'offer_sub_condition',
+    'OfferSummary': 'offer_summary',
+    'Offers': 'offers',
+    'PartnerType': 'partner_type',
+    'Price': 'price',
+    'PriceType': 'price_type',
+    'ProductAdvertisingAPIClientException': 'product_advertising_api_client_exception',
+    'ProductAdvertisingAPIServiceException': 'product_advertising_api_service_exception',
+    'ProductInfo': 'product_info',
+    'Properties': 'properties',
+    'Rating': 'rating',
+    'Refinement': 'refinement',
+    'RefinementBin': 'refinement_bin',
+    'RentalOfferListing': 'rental_offer_listing',
+    'RentalOffers': 'rental_offers',
+    'SearchItemsRequest': 'search_items_request',
+    'SearchItemsResource': 'search_items_resource',
+    'SearchItemsResponse': 'search_items_response',
+    'SearchRefinements': 'search_refinements',
+    'SearchResult': 'search_result',
+    'SingleBooleanValuedAttribute': 'single_boolean_valued_attribute',
+    'SingleIntegerValuedAttribute': 'single_integer_valued_attribute',
+    'SingleStringValuedAttribute': 'single_string_valued_attribute',
+    'SortBy': 'sort_by',
+    'TechnicalInfo': 'technical_info',
+    'TradeInInfo': 'trade_in_info',
+    'TradeInPrice': 'trade_in_price',
+    'UnitBasedAttribute': 'unit_based_attribute',
+    'VariationAttribute': 'variation_attribute',
+    'VariationDimension': 'variation_dimension',
+    'VariationSummary': 'variation_summary',
+    'VariationsResult': 'variations_result',
+    'WebsiteSalesRank': 'website_sales_rank',
+}
+
+__all__ = sorted(_MODEL_MODULES)
+
+
+def get_model(name):
+    """Returns the model class `name`, importing its module if needed.
+
+    :raises AttributeError: if `name` is not a model of this package.
+    """
+    try:
+        module_name = _MODEL_MODULES[name]
+    except KeyError:
+        raise AttributeError(
+            "module %r has no attribute %r" % (__name__, name))
+    try:
+        return globals()[name]
+    except KeyError:
+        pass
+    klass = getattr(importlib.import_module(__name__ + '.' + module_name),
+                    name)
+    globals()[name] = klass
+    return klass
+
+
+if sys.version_info >= (3, 7):
+    __getattr__ = get_model
+
+    def __dir__():
+        return sorted(set(globals()) | set(_MODEL_MODULES))
+else:
+    # No module __getattr__ before Python 3.7: import everything up front.
+    for _name in __all__:
+        get_model(_name)
@@ -0,0 +1,374 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import collections
+import threading
+import time
+
+from paapi5_python_sdk.cassette import CassetteMiss
+from paapi5_python_sdk.circuit_breaker import CircuitOpenError
+from paapi5_python_sdk.deadline import DeadlineExceeded
+from paapi5_python_sdk.prepared_request import PreparedRequest
+from paapi5_python_sdk.rest import ApiException
+
+# Error codes meaning "no such page": pagination stops there.
+LAST_PAGE_ERROR_CODES = frozenset(['NoResults'])
+
+
+def search_result_items(response):
+    """Items of a SearchItemsResponse, [] if it has none."""
+    result = response.search_result
+    return (result.items if result is not None else None) or []
+
+
+def asin_key(item):
+    """Dedup key of an item: its ASIN."""
+    return item.asin
+
+
+def parent_asin_key(item):
+    """Dedup key collapsing the variations of a product: the ParentASIN of
+    an item, its ASIN if it has none."""
+    return item.parent_asin or item.asin
+
+
+def is_retryable(error):
+    """Default retry predicate: throttling (429), 5xx responses and
+    transport errors. Other 4xx answers would fail again, an open circuit
+    rejects the retry as well, and a cassette has no other recording."""
+    if isinstance(error, (CassetteMiss, CircuitOpenError)):
+        return False
+    if isinstance(error, ApiException):
+        return not error.status or error.status == 429 or error.status >= 500
+    return True
+
+
+def variations_result_items(response):
+    """Items of a GetVariationsResponse, [] if it has none."""
+    result = response.variations_result
+    return (result.items if result is not None else None) or []
+
+
+class PageResults(object):
+    """Pages gathered by `fetch_pages`.
+
+    :ivar responses: dict page number -> response, for the pages fetched.
+    :ivar errors: dict page number -> exception, for the pages that failed
+        (partial mode only), after their last retry.
+    :ivar last_page: last page holding results, None if not reached.
+    :ivar deadline_exceeded: True if the deadline stopped the fetching
+        before every page was fetched.
+    :ivar retries: number of page fetches retried.
+    :ivar target_reached: True if the fetching stopped because `target`
+        unique items were gathered.
+    :ivar pages_saved: pages of the budget left unfetched because the
+        target was reached.
+    """
+
+    def __init__(self, items=search_result_items, unique_by=None,
+                 keep=None):
+        self.responses = {}
+        self.errors = {}
+        self.last_page = None
+        self.deadline_exceeded = False
+        self.retries = 0
+        self.target_reached = False
+        self.pages_saved = 0
+        self._items = items
+        self._unique_by = unique_by
+        self._keep = keep
+
+    @property
+    def pages(self):
+        """Fetched page numbers, in order."""
+        return sorted(self.responses)
+
+    @property
+    def complete(self):
+        """True if no page was left out."""
+        return not self.deadline_exceeded and not self.errors
+
+    @property
+    def items(self):
+        """Items of every fetched page, in page order, without those
+        rejected by `keep`; with `unique_by`, only the first item of each
+        key."""
+        items = [item for page in self.pages
+                 for item in self._items(self.responses[page])]
+        if self._keep is not None:
+            items = [item for item in items if self._keep(item)]
+        if self._unique_by is None:
+            return items
+        seen = set()
+        unique = []
+        for item in items:
+            key = self._unique_by(item)
+            if key not in seen:
+                seen.add(key)
+                unique.append(item)
+        return unique
+
+    @property
+    def duplicates(self):
+        """Number of items dropped by `unique_by`."""
+        return sum(len(self._items(response))
+                   for response in self.responses.values()) - \
+            self.rejected - len(self.items)
+
+    @property
+    def rejected(self):
+        """Number of items dropped by `keep`."""
+        if self._keep is None:
+            return 0
+        return sum(1 for response in self.responses.values()
+                   for item in self._items(response) if not self._keep(item))
+
+    def page_errors(self):
+        """Returns the errors of the failed pages as JSON-ready dicts:
+        page, status (None for non-API errors), PA-API error codes and
+        message."""
+        report = []
+        for page in sorted(self.errors):
+            error = self.errors[page]
+            if isinstance(error, ApiException):
+                report.append({'page': page, 'status': error.status,
+                               'codes': error.error_codes(),
+                               'message': error.reason})
+            else:
+                report.append({'page': page, 'status': None, 'codes': [],
+                               'message': str(error)})
+        return report
+
+
+def fetch_pages(fetch, pages, items=search_result_items, deadline=None,
+                concurrency=1, partial=False, retries=0, retry_delay=0.0,
+                retry_on=is_retryable, unique_by=None, target=None,
+                keep=None):
+    """Fetches pages 1 to `pages` with `fetch(page)`, stopping at the last
+    page holding results, and returns a PageResults.
+
+    Up to `concurrency` pages are fetched at a time. Once `deadline` (a
+    Deadline) has passed, pages not yet started are given up, and the pages
+    already fetched are returned with `deadline_exceeded` set; a call cut
+    short by its deadline-derived timeout counts the same way.
+
+    A page failing with an error accepted by `retry_on` is fetched again
+    after the other pages, up to `retries` times, `retry_delay` seconds
+    later. A page that still fails is raised once the pages in flight are
+    done; with `partial`, it is recorded in `errors` instead and the other
+    pages are still fetched, unless no page at all succeeded, in which case
+    the first error is raised. A 4xx error `retry_on` rejects means the
+    request itself is wrong: like NoResults, it ends the pagination at its
+    page, so a bad query costs one call rather than one per page.
+
+    With `unique_by` (e.g. `asin_key`, or `parent_asin_key` to collapse
+    variations), items repeated across pages are dropped from
+    `PageResults.items`. With `target`, no new page is started once that
+    many unique items were gathered, so the pages up to `pages` are only
+    paid for when needed. With `keep`, the items it rejects are left out of
+    `PageResults.items` and do not count toward `target`.
+
+    :param fetch: callable(page number) returning the page response.
+    :param items: callable(response) returning the items of a page; an
+        empty page ends the pagination, as does a NoResults error.
+    :param unique_by: callable(item) returning its dedup key.
+    :param target: number of unique items after which to stop.
+    :param keep: callable(item) returning False for the items to drop.
+    """
+    result = PageResults(items, unique_by, keep)
+    lock = threading.Lock()
+    pending = collections.deque(range(1, pages + 1))
+    attempts = collections.Counter()
+    errors = []
+    # keys of every item fetched so far, whatever their page
+    seen = set()
+
+    def worker():
+        while True:
+            with lock:
+                if errors or result.deadline_exceeded or \
+                        result.target_reached or not pending:
+                    return
+                page = pending.popleft()
+                if result.last_page is not None and page > result.last_page:
+                    continue
+                attempts[page] += 1
+                retry = attempts[page] > 1
+            if retry and retry_delay:
+                time.sleep(retry_delay if deadline is None else
+                           min(retry_delay, deadline.remaining()))
+            if deadline is not None and deadline.expired:
+                with lock:
+                    result.deadline_exceeded = True
+                return
+            try:
+                response = fetch(page)
+            except Exception as error:
+                with lock:
+                    if isinstance(error, DeadlineExceeded) or (
+                            deadline is not None and deadline.expired):
+                        result.deadline_exceeded = True
+                    elif isinstance(error, ApiException) and \
+                            LAST_PAGE_ERROR_CODES.intersection(
+                                error.error_codes()):
+                        _end_at(result, page - 1)
+                    elif attempts[page] <= retries and retry_on(error):
+                        result.retries += 1
+                        pending.append(page)
+                    elif partial:
+                        result.errors[page] = error
+                        if _is_request_error(error, retry_on):
+                            # the next pages would fail the same way
+                            _end_at(result, page)
+                    else:
+                        errors.append(error)
+                continue
+            with lock:
+                result.errors.pop(page, None)
+                page_items = items(response)
+                if page_items:
+                    result.responses[page] = response
+                else:
+                    _end_at(result, page - 1)
+                if target is not None:
+                    if keep is not None:
+                        page_items = [item for item in page_items
+                                      if keep(item)]
+                    seen.update(unique_by(item) if unique_by is not None
+                                else (page, index)
+                                for index, item in enumerate(page_items))
+                    if len(seen) >= target:
+                        result.target_reached = True
+
+    if concurrency <= 1:
+        worker()
+    else:
+        threads = [threading.Thread(target=worker)
+                   for _ in range(min(concurrency, pages))]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+    if result.last_page is not None:
+        for pages_by_number in (result.responses, result.errors):
+            for page in [page for page in pages_by_number
+                         if page > result.last_page]:
+                del pages_by_number[page]
+    if result.errors and not result.responses:
+        raise result.errors[min(result.errors)]
+    if result.target_reached:
+        result.pages_saved = pages - len(attempts)
+    return result
+
+
+def _is_request_error(error, retry_on):
+    """True for a 4xx answer that is not worth retrying (e.g.
+    InvalidParameterValue, InvalidPartnerTag): the request itself is
+    wrong."""
+    return isinstance(error, ApiException) and error.status is not None \
+        and 400 <= error.status < 500 and not retry_on(error)
+
+
+def _end_at(result, last_page):
+    if result.last_page is None or last_page < result.last_page:
+        result.last_page = last_page
+
+
+def search_pages(api, request, pages, deadline=None, concurrency=1,
+                 partial=False, retries=0, retry_delay=0.0, unique_by=None,
+                 target=None, item_filter=None, **kwargs):
+    """Fetches up to `pages` pages of a search and returns a PageResults.
+
+    >>> results = search_pages(api, search_items_request, pages=10,
+    ...                        deadline=Deadline(8.0), partial=True)
+    >>> results.items, results.complete, results.page_errors()
+
+    :param api: DefaultApi.
+    :param request: SearchItemsRequest, or a PreparedRequest of one with
+        `item_page` patchable; its own `item_page` is ignored.
+    :param deadline: Deadline bounding the whole search.
+    :param partial: keep the pages that succeeded when others fail.
+    :param retries: times a failed page is fetched again.
+    :param unique_by: dedup key of the items, see `fetch_pages`.
+    :param target: unique items after which to stop fetching pages.
+    :param item_filter: SearchFilter; its conditions are pushed down into
+        the request and only its residual ones are checked on the items.
+        A PreparedRequest must then be prepared from `item_filter.apply()`.
+    :param kwargs: extra arguments of `DefaultApi.search_items`.
+    """
+    keep = None
+    if item_filter is not None:
+        if isinstance(request, PreparedRequest):
+            item_filter.check(request.request)
+        else:
+            request = item_filter.apply(request)
+        if item_filter.residual():
+            keep = item_filter.matches
+    if not isinstance(request, PreparedRequest):
+        request = PreparedRequest(request, fields=('item_page',))
+
+    def fetch(page):
+        return api.search_items(request.body(item_page=page),
+                                _deadline=deadline, **kwargs)
+
+    return fetch_pages(fetch, pages, search_result_items, deadline,
+                       concurrency, partial, retries, retry_delay,
+                       unique_by=unique_by, target=target, keep=keep)
+
+
+def variation_pages(api, request, deadline=None, concurrency=4, **kwargs):
+    """Fetches every page of a GetVariations call and returns a
+    PageResults.
+
+    The first page gives `VariationSummary.page_count`; the other pages are
+    then fetched `concurrency` at a time, so a family of any size takes
+    about two round trips. Items are deduplicated by ASIN.
+
+    :param api: DefaultApi.
+    :param request: GetVariationsRequest, or a PreparedRequest of one with
+        `variation_page` patchable; its own `variation_page` is ignored.
+    :param deadline: Deadline bounding the whole crawl.
+    :param kwargs: extra arguments of `DefaultApi.get_variations`.
+    """
+    if not isinstance(request, PreparedRequest):
+        request = PreparedRequest(request, fields=('variation_page',))
+
+    def fetch(page):
+        return api.get_variations(request.body(variation_page=page),
+                                  _deadline=deadline, **kwargs)
+
+    first = fetch(1)
+    summary = first.variations_result.variation_summary \
+        if first.variations_result is not None else None
+    page_count = (summary.page_count if summary is not None else None) or 1
+
+    def fetch_rest(page):
+        return first if page == 1 else fetch(page)
+
+    return fetch_pages(fetch_rest, page_count, variations_result_items,
+                       deadline, concurrency, unique_by=asin_key)
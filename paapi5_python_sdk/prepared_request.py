@@ -0,0 +1,160 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import copy
+
+from paapi5_python_sdk import serializer
+
+# Separators of serializer.dumps, as json.dumps uses by default.
+_ITEM_SEPARATOR = b', '
+_KEY_SEPARATOR = ': '
+
+
+class PreparedRequest(object):
+    """A request model encoded once, from which variants are derived by
+    patching a few fields into the cached encoding.
+
+    >>> prepared = PreparedRequest(search_items_request)
+    >>> for page in range(1, 11):
+    ...     api.search_items(prepared.body(item_page=page))
+
+    The request is serialized a single time with a placeholder in each
+    patchable field, and the resulting JSON is split around the
+    placeholders. `body()` only encodes the patched values and joins the
+    cached segments, so the bytes it returns are identical to serializing
+    a copy of the request with those fields set, without building that
+    copy. The returned bytes can be passed to any `DefaultApi` operation in
+    place of the request model. A field whose value is None is left out of
+    the body, as serialization leaves out None members, so fields unset in
+    the request (e.g. `keywords` of a browse node search) can be prepared.
+
+    :param request: swagger request model, e.g. SearchItemsRequest.
+    :param fields: attribute names that variants may change.
+    """
+
+    def __init__(self, request, fields=('item_page', 'keywords')):
+        for field in fields:
+            if field not in request.swagger_types:
+                raise ValueError("`%s` is not an attribute of %s."
+                                 % (field, type(request).__name__))
+        self.request = request
+        self.fields = tuple(fields)
+        self._defaults = {field: getattr(request, field) for field in fields}
+
+        template = copy.copy(request)
+        placeholders = {}
+        for field in self.fields:
+            placeholder = u'\x00paapi5-prepared:%s\x00' % field
+            # Set the private slot directly: setters may reject the
+            # placeholder (e.g. required or numeric fields).
+            setattr(template, '_' + field, placeholder)
+            placeholders[serializer.dumps(placeholder)] = field
+        encoded = serializer.dumps(template)
+
+        # segments hold the text between the members of the prepared
+        # fields; each member is its key (in _keys) and its value
+        self._segments = []
+        self._slots = []
+        self._keys = []
+        position = 0
+        while True:
+            found = [(encoded.find(token, position), token)
+                     for token in placeholders]
+            found = [(index, token) for index, token in found if index >= 0]
+            if not found:
+                break
+            index, token = min(found)
+            field = placeholders[token]
+            key = serializer.dumps(request.attribute_map[field]) + \
+                _KEY_SEPARATOR
+            self._segments.append(
+                encoded[position:index - len(key)].encode('utf-8'))
+            self._slots.append(field)
+            self._keys.append(key.encode('utf-8'))
+            position = index + len(token)
+        self._segments.append(encoded[position:].encode('utf-8'))
+
+    def body(self, **values):
+        """Returns the encoded request body with `values` patched in.
+
+        Fields not given keep the value they had in the prepared request.
+
+        :param values: new values of some of the prepared `fields`.
+        :return: UTF-8 encoded JSON body.
+        """
+        for field in values:
+            if field not in self._defaults:
+                raise ValueError("`%s` was not prepared as a patchable field."
+                                 % field)
+        parts = []
+        # True once a None member was dropped right after the opening brace:
+        # the separator that followed it goes too
+        drop_separator = False
+        for segment, field, key in zip(self._segments, self._slots,
+                                       self._keys):
+            if drop_separator:
+                segment = segment[len(_ITEM_SEPARATOR):]
+                drop_separator = False
+            value = values.get(field, self._defaults[field])
+            if value is None:
+                if segment.endswith(_ITEM_SEPARATOR):
+                    parts.append(segment[:-len(_ITEM_SEPARATOR)])
+                else:
+                    parts.append(segment)
+                    drop_separator = True
+                continue
+            parts.append(segment)
+            parts.append(key)
+            parts.append(serializer.dumps(value).encode('utf-8'))
+        last = self._segments[-1]
+        if drop_separator and last.startswith(_ITEM_SEPARATOR):
+            last = last[len(_ITEM_SEPARATOR):]
+        parts.append(last)
+        return b''.join(parts)
+
+    def with_defaults(self, **values):
+        """Returns a PreparedRequest sharing this one's encoding, in which
+        `values` replace the defaults of some prepared fields.
+
+        >>> french = prepared.with_defaults(marketplace='www.amazon.fr')
+        >>> french.body(item_page=2)
+        """
+        for field in values:
+            if field not in self._defaults:
+                raise ValueError("`%s` was not prepared as a patchable field."
+                                 % field)
+        derived = copy.copy(self)
+        derived._defaults = dict(self._defaults, **values)
+        return derived
+
+    def request_for(self, **values):
+        """Returns a copy of the request model with `values` applied.
+
+        Useful when a caller needs the model itself (e.g. to log it or to
+        read `item_page` back); sending it costs a full serialization.
+        """
+        request = copy.deepcopy(self.request)
+        for field, value in values.items():
+            setattr(request, field, value)
+        return request
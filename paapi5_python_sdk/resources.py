@@ -0,0 +1,226 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import logging
+import re
+import threading
+
+from paapi5_python_sdk import models
+from paapi5_python_sdk.models.item import Item
+from paapi5_python_sdk.models.search_items_resource import SearchItemsResource
+
+logger = logging.getLogger(__name__)
+
+# Item attributes returned whatever the requested resources.
+ALWAYS_RETURNED = frozenset([('asin',), ('detail_page_url',)])
+
+_INDEX = re.compile(r'\[[^\]]*\]')
+_LIST_TYPE = re.compile(r'^list\[(.+)\]$')
+
+_paths = {}
+_paths_lock = threading.Lock()
+
+
+def resource_paths(resource_type=SearchItemsResource):
+    """Returns the model path of every item resource of `resource_type`, as
+    a dict resource -> tuple of Item attribute names.
+
+    `Offers.Listings.Price` maps to ('offers', 'listings', 'price'): the
+    path follows the `attribute_map` of the models from Item down, lists
+    being traversed. Resources that are not part of an item (e.g.
+    SearchRefinements) are left out.
+    """
+    with _paths_lock:
+        paths = _paths.get(resource_type)
+        if paths is None:
+            paths = _paths[resource_type] = {}
+            for name in dir(resource_type):
+                value = getattr(resource_type, name)
+                if name.isupper() and isinstance(value, str):
+                    path = _model_path(value.split('.'))
+                    if path is not None:
+                        paths[value] = path
+    return paths
+
+
+def _model_path(keys):
+    model = Item
+    path = []
+    for key in keys:
+        if model is None:
+            return None
+        attributes = {json_key: attribute for attribute, json_key
+                      in model.attribute_map.items()}
+        if key not in attributes:
+            return None
+        attribute = attributes[key]
+        path.append(attribute)
+        type_name = model.swagger_types[attribute]
+        match = _LIST_TYPE.match(type_name)
+        if match:
+            type_name = match.group(1)
+        model = getattr(models, type_name, None)
+    return tuple(path)
+
+
+def field_path(field):
+    """Returns the tuple of attribute names of a dotted field, list indexes
+    such as `[0]` or `[*]` being dropped."""
+    return tuple(_INDEX.sub('', field).split('.'))
+
+
+def resources_for(fields, resource_type=SearchItemsResource):
+    """Returns the smallest list of resources returning `fields`.
+
+    >>> resources_for(['item_info.title.display_value',
+    ...                'offers.listings[0].price.display_amount',
+    ...                'images.primary.large.url'])
+    ['Images.Primary.Large', 'ItemInfo.Title', 'Offers.Listings.Price']
+
+    A field inside a resource needs that resource (the most specific one
+    when resources are nested); a field holding several resources, such as
+    `images.primary`, needs all of them.
+
+    :param fields: dotted Item attribute paths.
+    :param resource_type: SearchItemsResource, GetItemsResource, ...
+    :return: resource values, sorted.
+    :raises ValueError: for a field no resource returns.
+    """
+    paths = resource_paths(resource_type)
+    selected = set()
+    for field in fields:
+        path = field_path(field)
+        if path in ALWAYS_RETURNED:
+            continue
+        containing = [resource for resource, resource_path in paths.items()
+                      if path[:len(resource_path)] == resource_path]
+        if containing:
+            selected.add(max(containing, key=lambda resource:
+                             len(paths[resource])))
+            continue
+        contained = [resource for resource, resource_path in paths.items()
+                     if resource_path[:len(path)] == path]
+        if not contained:
+            raise ValueError("No %s returns `%s`."
+                             % (resource_type.__name__, field))
+        selected.update(contained)
+    return sorted(selected)
+
+
+class ResourceUsage(object):
+    """Records which parts of the items are read, to find the resources
+    requested but never used.
+
+    >>> usage = ResourceUsage(request.resources)
+    >>> rows = format_items(usage.track(items))
+    >>> usage.log_unused()
+    ['BrowseNodeInfo.WebsiteSalesRank', 'ItemInfo.ExternalIds']
+
+    `track` wraps the items in proxies that forward every attribute and
+    note the paths read; a resource counts as used once a value inside it
+    was read. Reading a non-model attribute (e.g. `to_dict()`) counts as
+    reading everything below. Meant for debugging: the proxies are not
+    Item instances and cost a little on every access.
+
+    :param resources: the resources requested.
+    :param resource_type: SearchItemsResource, GetItemsResource, ...
+    """
+
+    def __init__(self, resources, resource_type=SearchItemsResource):
+        self.resources = list(resources or ())
+        self.resource_type = resource_type
+        self._reads = set()
+
+    def track(self, items):
+        """Returns proxies of `items` recording what is read."""
+        return [_track(item, (), self._reads) for item in items]
+
+    def tracked(self, function):
+        """Returns `function` reading the item it is called with through a
+        proxy, so that what a dedup key or a filter reads counts as used.
+
+        >>> item_filter.matches = usage.tracked(item_filter.matches)
+        """
+        reads = self._reads
+
+        def tracked(item):
+            return function(_track(item, (), reads))
+        return tracked
+
+    def unused(self):
+        """Returns the requested item resources none of whose values were
+        read."""
+        paths = resource_paths(self.resource_type)
+        reads = list(self._reads)
+        return [resource for resource in self.resources
+                if resource in paths and
+                not any(_covers(read, paths[resource]) for read in reads)]
+
+    def log_unused(self):
+        """Logs and returns `unused()`."""
+        unused = self.unused()
+        if unused:
+            logger.warning("Resources fetched but never read: %s",
+                           ", ".join(unused))
+        return unused
+
+
+def _covers(read, resource_path):
+    if read and read[-1] == '*':
+        read = read[:-1]
+        return resource_path[:len(read)] == read or \
+            read[:len(resource_path)] == resource_path
+    return read[:len(resource_path)] == resource_path
+
+
+def _track(value, path, reads):
+    if hasattr(value, 'swagger_types'):
+        return _Tracked(value, path, reads)
+    if isinstance(value, list) and \
+            any(hasattr(element, 'swagger_types') for element in value):
+        return [_track(element, path, reads) for element in value]
+    reads.add(path)
+    return value
+
+
+class _Tracked(object):
+    """Proxy of a model recording the attribute paths read."""
+
+    __slots__ = ('_model', '_path', '_reads')
+
+    def __init__(self, model, path, reads):
+        object.__setattr__(self, '_model', model)
+        object.__setattr__(self, '_path', path)
+        object.__setattr__(self, '_reads', reads)
+
+    def __getattr__(self, name):
+        value = getattr(self._model, name)
+        if name not in self._model.swagger_types:
+            self._reads.add(self._path + ('*',))
+            return value
+        return _track(value, self._path + (name,), self._reads)
+
+    def __repr__(self):
+        self._reads.add(self._path + ('*',))
+        return repr(self._model)
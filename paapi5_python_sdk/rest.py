@@ -31,6 +31,7 @@ import json
 import logging
 import re
 import ssl
+import time
 
 import certifi
 # python 2 and python 3 compatibility library
@@ -85,6 +86,9 @@ class RESTClientObject(object):
             # if not set certificate file, use Mozilla's root certificates.
             ca_certs = certifi.where()
 
+        # Record/replay of responses, see paapi5_python_sdk.cassette
+        self.cassette = configuration.cassette
+
         addition_pool_args = {}
         if configuration.assert_hostname is not None:
             addition_pool_args['assert_hostname'] = configuration.assert_hostname  # noqa: E501
@@ -120,7 +124,7 @@ class RESTClientObject(object):
 
     def request(self, method, url, query_params=None, headers=None,
                 body=None, post_params=None, _preload_content=True,
-                _request_timeout=None):
+                _request_timeout=None, _retries=None):
         """Perform requests.
 
         :param method: http request method
@@ -138,6 +142,8 @@ class RESTClientObject(object):
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
                                  (connection, read) timeouts.
+        :param _retries: urllib3 `retries` of this request (e.g. False to
+                         make a single try); None keeps the pool default.
         """
         method = method.upper()
         assert method in ['GET', 'HEAD', 'DELETE', 'POST', 'PUT',
@@ -153,7 +159,7 @@ class RESTClientObject(object):
 
         timeout = None
         if _request_timeout:
-            if isinstance(_request_timeout, (int, ) if six.PY3 else (int, long)):  # noqa: E501,F821
+            if isinstance(_request_timeout, (int, float) if six.PY3 else (int, long, float)):  # noqa: E501,F821
                 timeout = urllib3.Timeout(total=_request_timeout)
             elif (isinstance(_request_timeout, tuple) and
                   len(_request_timeout) == 2):
@@ -163,6 +169,17 @@ class RESTClientObject(object):
         if 'Content-Type' not in headers:
             headers['Content-Type'] = 'application/json'
 
+        cassette = self.cassette
+        if cassette is not None and cassette.replaying:
+            r = cassette.replay(method, url, headers, body)
+            if r is None:
+                from paapi5_python_sdk.cassette import CassetteMiss
+                raise CassetteMiss(method, url, cassette.path)
+            if not 200 <= r.status <= 299:
+                raise ApiException(http_resp=r)
+            return r
+
+        started = time.time()
         try:
             # For `POST`, `PUT`, `PATCH`, `OPTIONS`, `DELETE`
             if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
@@ -170,13 +187,16 @@ class RESTClientObject(object):
                     url += '?' + urlencode(query_params)
                 if re.search('json', headers['Content-Type'], re.IGNORECASE):
                     request_body = None
-                    if body is not None:
+                    if isinstance(body, bytes):
+                        request_body = body
+                    elif body is not None:
                         request_body = json.dumps(body)
                     r = self.pool_manager.request(
                         method, url,
                         body=request_body,
                         preload_content=_preload_content,
                         timeout=timeout,
+                        retries=_retries,
                         headers=headers)
                 elif headers['Content-Type'] == 'application/x-www-form-urlencoded':  # noqa: E501
                     r = self.pool_manager.request(
@@ -185,6 +205,7 @@ class RESTClientObject(object):
                         encode_multipart=False,
                         preload_content=_preload_content,
                         timeout=timeout,
+                        retries=_retries,
                         headers=headers)
                 elif headers['Content-Type'] == 'multipart/form-data':
                     # must del headers['Content-Type'], or the correct
@@ -197,6 +218,7 @@ class RESTClientObject(object):
                         encode_multipart=True,
                         preload_content=_preload_content,
                         timeout=timeout,
+                        retries=_retries,
                         headers=headers)
                 # Pass a `string` parameter directly in the body to support
                 # other content types than Json when `body` argument is
@@ -208,6 +230,7 @@ class RESTClientObject(object):
                         body=request_body,
                         preload_content=_preload_content,
                         timeout=timeout,
+                        retries=_retries,
                         headers=headers)
                 else:
                     # Cannot generate the request from given parameters
@@ -221,6 +244,7 @@ class RESTClientObject(object):
                                               fields=query_params,
                                               preload_content=_preload_content,
                                               timeout=timeout,
+                                              retries=_retries,
                                               headers=headers)
         except urllib3.exceptions.SSLError as e:
             msg = "{0}\n{1}".format(type(e).__name__, str(e))
@@ -237,74 +261,89 @@ class RESTClientObject(object):
             # log response body
             logger.debug("response body: %s", r.data)
 
+            if cassette is not None and cassette.recording:
+                cassette.record(method, url, headers, body, r,
+                                time.time() - started)
+
         if not 200 <= r.status <= 299:
             raise ApiException(http_resp=r)
 
         return r
 
     def GET(self, url, headers=None, query_params=None, _preload_content=True,
-            _request_timeout=None):
+            _request_timeout=None, _retries=None):
         return self.request("GET", url,
                             headers=headers,
                             _preload_content=_preload_content,
                             _request_timeout=_request_timeout,
+                            _retries=_retries,
                             query_params=query_params)
 
     def HEAD(self, url, headers=None, query_params=None, _preload_content=True,
-             _request_timeout=None):
+             _request_timeout=None, _retries=None):
         return self.request("HEAD", url,
                             headers=headers,
                             _preload_content=_preload_content,
                             _request_timeout=_request_timeout,
+                            _retries=_retries,
                             query_params=query_params)
 
     def OPTIONS(self, url, headers=None, query_params=None, post_params=None,
-                body=None, _preload_content=True, _request_timeout=None):
+                body=None, _preload_content=True, _request_timeout=None,
+                _retries=None):
         return self.request("OPTIONS", url,
                             headers=headers,
                             query_params=query_params,
                             post_params=post_params,
                             _preload_content=_preload_content,
                             _request_timeout=_request_timeout,
+                            _retries=_retries,
                             body=body)
 
     def DELETE(self, url, headers=None, query_params=None, body=None,
-               _preload_content=True, _request_timeout=None):
+               _preload_content=True, _request_timeout=None, _retries=None):
         return self.request("DELETE", url,
                             headers=headers,
                             query_params=query_params,
                             _preload_content=_preload_content,
                             _request_timeout=_request_timeout,
+                            _retries=_retries,
                             body=body)
 
     def POST(self, url, headers=None, query_params=None, post_params=None,
-             body=None, _preload_content=True, _request_timeout=None):
+             body=None, _preload_content=True, _request_timeout=None,
+             _retries=None):
         return self.request("POST", url,
                             headers=headers,
                             query_params=query_params,
                             post_params=post_params,
                             _preload_content=_preload_content,
                             _request_timeout=_request_timeout,
+                            _retries=_retries,
                             body=body)
 
     def PUT(self, url, headers=None, query_params=None, post_params=None,
-            body=None, _preload_content=True, _request_timeout=None):
+            body=None, _preload_content=True, _request_timeout=None,
+            _retries=None):
         return self.request("PUT", url,
                             headers=headers,
                             query_params=query_params,
                             post_params=post_params,
                             _preload_content=_preload_content,
                             _request_timeout=_request_timeout,
+                            _retries=_retries,
                             body=body)
 
     def PATCH(self, url, headers=None, query_params=None, post_params=None,
-              body=None, _preload_content=True, _request_timeout=None):
+              body=None, _preload_content=True, _request_timeout=None,
+              _retries=None):
         return self.request("PATCH", url,
                             headers=headers,
                             query_params=query_params,
                             post_params=post_params,
                             _preload_content=_preload_content,
                             _request_timeout=_request_timeout,
+                            _retries=_retries,
                             body=body)
 
 
@@ -322,6 +361,27 @@ class ApiException(Exception):
             self.body = None
             self.headers = None
 
+    def error_codes(self):
+        """Returns the PA-API error codes found in the response body.
+
+        PA-API reports failures as `{"Errors": [{"Code": ..., "Message": ...}]}`.
+        An empty list is returned when the body is missing or not in that
+        format (e.g. transport errors raised with `status=0`).
+        """
+        body = self.body
+        if not body:
+            return []
+        if isinstance(body, bytes):
+            body = body.decode('utf8', 'replace')
+        try:
+            errors = json.loads(body).get('Errors')
+        except (ValueError, AttributeError):
+            return []
+        if not isinstance(errors, list):
+            return []
+        return [error['Code'] for error in errors
+                if isinstance(error, dict) and error.get('Code')]
+
     def __str__(self):
         """Custom error messages for exception"""
         error_message = "({0})\n"\
@@ -0,0 +1,212 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import collections
+import threading
+import time
+
+from paapi5_python_sdk.rest import ApiException
+
+INTERACTIVE = 'interactive'
+NORMAL = 'normal'
+BACKGROUND = 'background'
+LANES = (INTERACTIVE, NORMAL, BACKGROUND)
+
+
+class RequestRejected(ApiException):
+    """Raised without calling PA-API when a lane queue is full, or when a
+    queued call could not start in time."""
+
+    def __init__(self, lane, reason):
+        super(RequestRejected, self).__init__(
+            status=0, reason="%s request rejected: %s" % (lane, reason))
+        self.lane = lane
+
+
+class _Waiter(object):
+
+    __slots__ = ('event', 'granted')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+
+
+class PriorityScheduler(object):
+    """Orders the calls sharing one PA-API quota by lane, so that
+    interactive calls are not stuck behind a batch job.
+
+    At most `max_in_flight` calls run at a time (or the current limit of
+    `limiter`, a ConcurrencyLimiter, if lower). A call starts right away if
+    a slot is free and nothing is queued; otherwise it waits in the queue
+    of its lane. Each freed slot goes to a queued call, lanes taking turns
+    in proportion to their `weights` (smooth weighted round robin): with
+    the default weights and every lane busy, interactive calls get 8 slots
+    out of 12 and background calls still get 1. A lane whose queue holds
+    `max_queue_depth[lane]` calls rejects new ones with RequestRejected.
+
+    Set on `Configuration.scheduler`; callers pick a lane with the
+    `_priority` argument of the DefaultApi methods (default `NORMAL`).
+    Counters in `metrics` under `<name>.`: requests.<lane>, queued.<lane>,
+    rejected.<lane>; gauges queue_depth.<lane> and in_flight.
+
+    :param weights: dict lane -> share of the slots when lanes compete.
+    :param max_queue_depth: dict lane -> maximal queued calls, None or
+        missing for no bound.
+    """
+
+    def __init__(self, max_in_flight=8, weights=None, max_queue_depth=None,
+                 limiter=None, metrics=None, name='scheduler'):
+        self.max_in_flight = max_in_flight
+        self.weights = dict(weights or {INTERACTIVE: 8, NORMAL: 3,
+                                        BACKGROUND: 1})
+        if not self.weights or min(self.weights.values()) <= 0:
+            raise ValueError("Invalid value for `weights`, must be positive")
+        if max_queue_depth is None:
+            max_queue_depth = {NORMAL: 100, BACKGROUND: 20}
+        self.max_queue_depth = dict(max_queue_depth)
+        self.limiter = limiter
+        self.metrics = metrics
+        self.name = name
+        self._lock = threading.Lock()
+        self._queues = collections.OrderedDict(
+            (lane, collections.deque()) for lane in self.weights)
+        self._current = dict.fromkeys(self.weights, 0)
+        self._in_flight = 0
+        self._counters = collections.Counter()
+        self._wait = collections.Counter()
+
+    def call(self, send, lane=NORMAL, timeout=None):
+        """Returns `send()` once the scheduler lets the call of `lane` run.
+
+        :param timeout: maximal time to wait in the queue, in seconds.
+        :raises RequestRejected: if the lane queue is full or `timeout`
+            passed before the call could start.
+        """
+        if lane not in self._queues:
+            raise ValueError("Invalid lane `%s`, must be one of %s"
+                             % (lane, ', '.join(self._queues)))
+        self._enter(lane, timeout)
+        try:
+            return send()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._dispatch()
+            self._publish()
+
+    def _capacity(self):
+        if self.limiter is None:
+            return self.max_in_flight
+        return min(self.max_in_flight, self.limiter.limit)
+
+    def _enter(self, lane, timeout):
+        self._count('requests.' + lane)
+        started = time.time()
+        with self._lock:
+            self._counters['requests.' + lane] += 1
+            queue = self._queues[lane]
+            if self._in_flight < self._capacity() and \
+                    not any(self._queues.values()):
+                self._in_flight += 1
+                return
+            depth = self.max_queue_depth.get(lane)
+            if depth is not None and len(queue) >= depth:
+                self._counters['rejected.' + lane] += 1
+                rejected = "queue full (%d)" % depth
+            else:
+                waiter = _Waiter()
+                queue.append(waiter)
+                self._counters['queued.' + lane] += 1
+                rejected = None
+                # the limiter may have raised the capacity since the last
+                # call finished
+                self._dispatch()
+        if rejected is not None:
+            self._count('rejected.' + lane)
+            raise RequestRejected(lane, rejected)
+        self._count('queued.' + lane)
+        self._publish()
+
+        waiter.event.wait(timeout)
+        with self._lock:
+            if not waiter.granted:
+                queue.remove(waiter)
+                self._counters['rejected.' + lane] += 1
+            self._wait[lane] += time.time() - started
+        if not waiter.granted:
+            self._count('rejected.' + lane)
+            self._publish()
+            raise RequestRejected(lane, "not started within %.3f s"
+                                  % timeout)
+
+    def _dispatch(self):
+        # Called with the lock held.
+        while self._in_flight < self._capacity():
+            lanes = [lane for lane, queue in self._queues.items() if queue]
+            if not lanes:
+                return
+            total = 0
+            for lane in lanes:
+                self._current[lane] += self.weights[lane]
+                total += self.weights[lane]
+            chosen = max(lanes, key=lambda lane: self._current[lane])
+            self._current[chosen] -= total
+            waiter = self._queues[chosen].popleft()
+            waiter.granted = True
+            self._in_flight += 1
+            waiter.event.set()
+
+    def stats(self):
+        """Returns, per lane, the calls seen, queued and rejected, the
+        current queue depth and the mean queueing time of queued calls."""
+        with self._lock:
+            lanes = {}
+            for lane, queue in self._queues.items():
+                queued = self._counters['queued.' + lane]
+                lanes[lane] = {
+                    'requests': self._counters['requests.' + lane],
+                    'queued': queued,
+                    'rejected': self._counters['rejected.' + lane],
+                    'queue_depth': len(queue),
+                    'mean_wait_ms': round(self._wait[lane] * 1000.0 /
+                                          queued, 3) if queued else None,
+                }
+            return {'in_flight': self._in_flight, 'lanes': lanes}
+
+    def _publish(self):
+        if self.metrics is None:
+            return
+        with self._lock:
+            depths = [(lane, len(queue))
+                      for lane, queue in self._queues.items()]
+            in_flight = self._in_flight
+        for lane, depth in depths:
+            self.metrics.set_gauge('%s.queue_depth.%s' % (self.name, lane),
+                                   depth)
+        self.metrics.set_gauge(self.name + '.in_flight', in_flight)
+
+    def _count(self, counter):
+        if self.metrics is not None:
+            self.metrics.incr('%s.%s' % (self.name, counter))
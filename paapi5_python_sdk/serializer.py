@@ -0,0 +1,409 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+ProductAdvertisingAPI
+
+https://webservices.amazon.com/paapi5/documentation/index.html
+
+"""
+
+import datetime
+import json
+import re
+
+import paapi5_python_sdk.models
+
+# Same escaping as json.dumps() with its default ensure_ascii=True.
+_encode_str = json.encoder.encode_basestring_ascii
+_INFINITY = float('inf')
+_LIST_TYPE = re.compile(r'list\[(.*)\]')
+_PRIMITIVES = frozenset([str, int, float, bool, bytes])
+
+KEY_STYLES = ('api', 'snake')
+
+
+def _model_class(swagger_type):
+    """Returns the model class named `swagger_type`, None for other types."""
+    if not isinstance(swagger_type, str):
+        return swagger_type
+    klass = getattr(paapi5_python_sdk.models, swagger_type, None)
+    if klass is not None and hasattr(klass, 'swagger_types'):
+        return klass
+    return None
+
+
+class _Encoder(object):
+    """JSON writer for swagger models, compiled once per model class.
+
+    :param key_style: 'api' writes the PA-API keys of `attribute_map`
+        (PascalCase), 'snake' the python attribute names.
+    :param skip_none: leave out attributes whose value is None.
+    :param separators: (item separator, key separator), as for json.dumps.
+    """
+
+    def __init__(self, key_style='api', skip_none=True,
+                 separators=(', ', ': ')):
+        if key_style not in KEY_STYLES:
+            raise ValueError("key_style must be one of %s." % (KEY_STYLES,))
+        self.key_style = key_style
+        self.skip_none = skip_none
+        self.item_separator, self.key_separator = separators
+        # model class -> emitter(obj, parts), filled on first use.
+        self._emitters = {}
+        # model class -> emitter(raw dict, parts) renaming the API keys.
+        self._raw_emitters = {}
+        self.write_value = self._make_value_writer()
+
+    def dumps(self, obj):
+        parts = []
+        self.write_value(obj, parts)
+        return ''.join(parts)
+
+    def emitter_for(self, klass):
+        emitter = self._emitters.get(klass)
+        if emitter is None:
+            emitter = self._emitters[klass] = self._compile(klass)
+        return emitter
+
+    def _name(self, klass, attr):
+        if self.key_style == 'api':
+            return klass.attribute_map[attr]
+        return attr
+
+    def _key(self, klass, attr):
+        return _encode_str(self._name(klass, attr)) + self.key_separator
+
+    def _compile(self, klass):
+        """Builds the emitter of a model class.
+
+        Generated models keep attribute `foo` in `self._foo` behind a
+        property, so the emitter reads the instance dict directly instead
+        of going through the property (and `getattr`) twice per attribute.
+        """
+        fields = tuple(
+            ('_' + attr, self._key(klass, attr), self._field_writer(attr_type))
+            for attr, attr_type in klass.swagger_types.items())
+        item_separator = self.item_separator
+        skip_none = self.skip_none
+
+        def emit(obj, parts):
+            values = obj.__dict__
+            separator = '{'
+            for private_name, key, write in fields:
+                value = values[private_name]
+                if value is not None:
+                    parts.append(separator)
+                    parts.append(key)
+                    write(value, parts)
+                    separator = item_separator
+                elif not skip_none:
+                    parts.append(separator)
+                    parts.append(key)
+                    parts.append('null')
+                    separator = item_separator
+            parts.append('{}' if separator == '{' else '}')
+        return emit
+
+    def _field_writer(self, swagger_type):
+        """Picks a writer specialised for the declared type of an attribute.
+
+        Values of another type than declared (e.g. an int given for
+        `MinPrice`) fall back to the generic writer, so the output never
+        depends on the declaration being accurate.
+        """
+        write_value = self.write_value
+        if swagger_type == 'str':
+            def write_str(value, parts):
+                if value.__class__ is str:
+                    parts.append(_encode_str(value))
+                else:
+                    write_value(value, parts)
+            return write_str
+        match = _LIST_TYPE.match(swagger_type)
+        if match:
+            write_item = self._field_writer(match.group(1))
+            item_separator = self.item_separator
+
+            def write_list(value, parts):
+                if value.__class__ is not list:
+                    write_value(value, parts)
+                    return
+                separator = '['
+                for item in value:
+                    parts.append(separator)
+                    write_item(item, parts)
+                    separator = item_separator
+                parts.append('[]' if separator == '[' else ']')
+            return write_list
+        klass = _model_class(swagger_type)
+        if klass is not None and klass.swagger_types:
+            emitter_for = self.emitter_for
+
+            def write_model(value, parts):
+                if value.__class__ is klass:
+                    emitter_for(klass)(value, parts)
+                else:
+                    write_value(value, parts)
+            return write_model
+        # Primitives and enum-like models (SearchItemsResource,
+        # Availability, ...), which are used through their string constants.
+        return write_value
+
+    def _make_value_writer(self):
+        """Returns the generic writer, with the separators bound as locals
+        since it runs for every value without a specialised writer."""
+        item_separator = self.item_separator
+        key_separator = self.key_separator
+        emitter_for = self.emitter_for
+        json_separators = (item_separator, key_separator)
+        default = self._default
+
+        def write_value(value, parts):
+            cls = value.__class__
+            if cls is str:
+                parts.append(_encode_str(value))
+            elif value is None:
+                parts.append('null')
+            elif cls is bool:
+                parts.append('true' if value else 'false')
+            elif cls is int:
+                parts.append(int.__repr__(value))
+            elif cls is float:
+                if value != value or value in (_INFINITY, -_INFINITY):
+                    parts.append(json.dumps(value))
+                else:
+                    parts.append(float.__repr__(value))
+            elif cls is list or cls is tuple:
+                separator = '['
+                for item in value:
+                    parts.append(separator)
+                    write_value(item, parts)
+                    separator = item_separator
+                parts.append('[]' if separator == '[' else ']')
+            elif cls is dict and all(key.__class__ is str for key in value):
+                separator = '{'
+                for key, item in value.items():
+                    parts.append(separator)
+                    parts.append(_encode_str(key))
+                    parts.append(key_separator)
+                    write_value(item, parts)
+                    separator = item_separator
+                parts.append('{}' if separator == '{' else '}')
+            elif isinstance(value, (datetime.datetime, datetime.date)):
+                parts.append(_encode_str(value.isoformat()))
+            elif hasattr(cls, 'swagger_types') and \
+                    hasattr(cls, 'attribute_map'):
+                emitter_for(cls)(value, parts)
+            else:
+                parts.append(json.dumps(value, default=default,
+                                        separators=json_separators))
+        return write_value
+
+    def write_raw(self, data, swagger_type, parts):
+        """Writes raw PA-API data (as parsed from the response body),
+        renaming its keys after the models of `swagger_type`."""
+        if data.__class__ is list:
+            match = _LIST_TYPE.match(swagger_type) \
+                if isinstance(swagger_type, str) else None
+            item_type = match.group(1) if match else swagger_type
+            separator = '['
+            for item in data:
+                parts.append(separator)
+                self.write_raw(item, item_type, parts)
+                separator = self.item_separator
+            parts.append('[]' if separator == '[' else ']')
+            return
+        klass = _model_class(swagger_type)
+        if data.__class__ is dict and klass is not None and \
+                klass.swagger_types:
+            emitter = self._raw_emitters.get(klass)
+            if emitter is None:
+                emitter = self._raw_emitters[klass] = self._compile_raw(klass)
+            emitter(data, parts)
+        else:
+            self.write_value(data, parts)
+
+    def _compile_raw(self, klass):
+        fields = {klass.attribute_map[attr]: (self._key(klass, attr), attr_type)
+                  for attr, attr_type in klass.swagger_types.items()}
+        item_separator = self.item_separator
+        key_separator = self.key_separator
+        skip_none = self.skip_none
+        write_raw = self.write_raw
+
+        def emit(data, parts):
+            separator = '{'
+            for json_key, value in data.items():
+                if value is None and skip_none:
+                    continue
+                parts.append(separator)
+                field = fields.get(json_key)
+                if field is None:
+                    # Keys this SDK version does not know are kept as is.
+                    parts.append(_encode_str(json_key))
+                    parts.append(key_separator)
+                    write_raw(value, None, parts)
+                else:
+                    parts.append(field[0])
+                    write_raw(value, field[1], parts)
+                separator = item_separator
+            parts.append('{}' if separator == '{' else '}')
+        return emit
+
+    def _default(self, obj):
+        """`json.dumps` hook mirroring ApiClient.sanitize_for_serialization."""
+        if isinstance(obj, (datetime.datetime, datetime.date)):
+            return obj.isoformat()
+        if hasattr(obj, 'swagger_types') and hasattr(obj, 'attribute_map'):
+            return {self._name(obj, attr): getattr(obj, attr)
+                    for attr in obj.swagger_types
+                    if not (self.skip_none and getattr(obj, attr) is None)}
+        raise TypeError("Object of type %s is not JSON serializable"
+                        % type(obj).__name__)
+
+
+# Request bodies: same document as json.dumps(sanitize_for_serialization()).
+_WIRE = _Encoder()
+# Output documents, keyed by (key_style, skip_none); compact separators.
+_OUTPUT = {}
+
+
+def dumps(obj):
+    """Serializes a request model (or any JSON-compatible value) to JSON.
+
+    The output is byte for byte what
+    `json.dumps(ApiClient.sanitize_for_serialization(obj))` returns, but it
+    is written straight from the model attributes: no intermediate dict is
+    built, and the attribute/key/type walk of each model class is done
+    once and reused.
+
+    :param obj: swagger model, list, dict or primitive value.
+    :return: JSON document as str.
+    """
+    return _WIRE.dumps(obj)
+
+
+def serializer_for(klass):
+    """Returns the compiled `obj -> JSON str` function of a model class."""
+    emitter = _WIRE.emitter_for(klass)
+
+    def serialize(obj):
+        parts = []
+        emitter(obj, parts)
+        return ''.join(parts)
+    return serialize
+
+
+def to_json(obj, key_style='api', skip_none=True, response_type=None):
+    """Encodes a response model tree, or a raw response, to JSON bytes.
+
+    The document is written straight from the models, without building the
+    nested dicts of `to_dict()` first, with compact separators.
+
+    :param obj: swagger model (e.g. a GetItemsResponse), or the raw
+        response as returned by PA-API (bytes, str or parsed dict).
+    :param key_style: 'api' for the PA-API keys (`ItemInfo`), 'snake' for
+        the python attribute names (`item_info`).
+    :param skip_none: leave out attributes whose value is None.
+    :param response_type: model class, or its name, describing a raw
+        response; required to rename the keys of raw data to 'snake'.
+    :return: UTF-8 encoded JSON.
+    :raises ValueError: for raw data in 'snake' style without
+        `response_type`.
+    """
+    encoder = _OUTPUT.get((key_style, skip_none))
+    if encoder is None:
+        encoder = _OUTPUT[(key_style, skip_none)] = _Encoder(
+            key_style, skip_none, separators=(',', ':'))
+
+    if isinstance(obj, (bytes, str)):
+        if key_style == 'api':
+            # The raw body already is the API document.
+            return obj if isinstance(obj, bytes) else obj.encode('utf-8')
+        obj = json.loads(obj)
+    if key_style == 'snake' and response_type is None and (
+            isinstance(obj, dict) or (isinstance(obj, list) and any(
+                isinstance(value, (dict, list)) for value in obj))):
+        # Raw data carries the API keys only; the model type says how to
+        # rename them.
+        raise ValueError("Renaming the keys of a raw response to 'snake' "
+                         "requires its response_type.")
+    parts = []
+    if isinstance(obj, (dict, list)) and response_type is not None:
+        encoder.write_raw(obj, response_type, parts)
+    else:
+        encoder.write_value(obj, parts)
+    return ''.join(parts).encode('utf-8')
+
+
+# model class -> converter(obj) returning what obj.to_dict() returns.
+_DICT_CONVERTERS = {}
+
+
+def to_dict(obj):
+    """Returns what `obj.to_dict()` returns, for any swagger model.
+
+    The generated `to_dict()` walks `swagger_types` through `getattr`,
+    `map(lambda ...)` and `hasattr(x, "to_dict")` at every level; this
+    version reads the attribute slots directly and only dispatches on the
+    type of each value.
+    """
+    cls = obj.__class__
+    converter = _DICT_CONVERTERS.get(cls)
+    if converter is None:
+        converter = _DICT_CONVERTERS[cls] = _compile_to_dict(cls)
+    return converter(obj)
+
+
+def _convert_item(value):
+    # Mirrors `x.to_dict() if hasattr(x, "to_dict") else x`.
+    if value is None or value.__class__ in _PRIMITIVES:
+        return value
+    if hasattr(value.__class__, 'swagger_types'):
+        return to_dict(value)
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    return value
+
+
+def _compile_to_dict(klass):
+    if issubclass(klass, dict) or not hasattr(klass, 'swagger_types'):
+        return lambda obj: obj.to_dict()
+    fields = tuple((attr, '_' + attr) for attr in klass.swagger_types)
+
+    def convert(obj):
+        values = obj.__dict__
+        result = {}
+        for attr, private_name in fields:
+            value = values[private_name]
+            cls = value.__class__
+            if value is None or cls in _PRIMITIVES:
+                result[attr] = value
+            elif hasattr(cls, 'swagger_types'):
+                result[attr] = to_dict(value)
+            elif isinstance(value, list):
+                result[attr] = [_convert_item(item) for item in value]
+            elif hasattr(value, 'to_dict'):
+                result[attr] = value.to_dict()
+            elif isinstance(value, dict):
+                result[attr] = {key: _convert_item(item)
+                                for key, item in value.items()}
+            else:
+                result[attr] = value
+        return result
+    return convert
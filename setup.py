@@ -36,6 +36,11 @@ VERSION = "1.1.0"
 # http://pypi.python.org/pypi/setuptools
 
 REQUIRES = ["urllib3 >= 1.15", "six >= 1.10", "certifi", "python-dateutil"]
+EXTRAS_REQUIRE = {
+    "zstd": ["zstandard"],
+    "msgpack": ["msgpack"],
+    "columns": ["numpy"],
+}
 
 
 def read(fname):
@@ -62,6 +67,7 @@ setup(
         "searchitems",
     ],
     install_requires=REQUIRES,
+    extras_require=EXTRAS_REQUIRE,
     packages=find_packages(),
     license="Apache License 2.0",
     include_package_data=True,
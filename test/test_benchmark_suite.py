@@ -0,0 +1,55 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import io
+import unittest
+
+from benchmarks import suite
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """Benchmark suite unit test stubs"""
+
+    def test_run_filtered(self):
+        results = suite.run(filters=["sign", "deserialize.GetItems"],
+                            repeat=1, min_time=0.01, out=io.StringIO())
+        self.assertEqual(sorted(results),
+                         ["deserialize.GetItemsResponse",
+                          "deserialize.GetItemsResponse.generated",
+                          "sign.search_items"])
+        for result in results.values():
+            self.assertGreater(result["ops_per_sec"], 0)
+            self.assertGreater(result["peak_bytes"], 0)
+
+    def test_compare(self):
+        baseline = {"a": {"ops_per_sec": 100.0, "peak_bytes": 1000},
+                    "b": {"ops_per_sec": 100.0, "peak_bytes": 1000}}
+        results = {"a": {"ops_per_sec": 95.0, "peak_bytes": 1050},
+                   "b": {"ops_per_sec": 50.0, "peak_bytes": 2000},
+                   "c": {"ops_per_sec": 1.0}}
+        regressions = suite.compare(results, baseline, tolerance=0.1)
+        self.assertEqual([name for name, _ in regressions], ["b", "b"])
+
+
+if __name__ == '__main__':
+    unittest.main()
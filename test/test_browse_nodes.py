@@ -0,0 +1,169 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.simulator import PaapiSimulator
+from paapi5_python_sdk.api.default_api import DefaultApi
+from paapi5_python_sdk.browse_nodes import (BrowseNodeCrawler,
+                                            BrowseNodeGraph)
+from test.helpers import FakeClock
+
+
+def taxonomy():
+    return {
+        "1": ["11", "12"],
+        "11": ["111", "112"],
+        "12": [],
+        "111": [],
+        "112": [],
+        "2": ["21"],
+        "21": [],
+    }
+
+
+class TestBrowseNodeCrawler(unittest.TestCase):
+    """BrowseNodeCrawler unit test stubs"""
+
+    def setUp(self):
+        self.simulator = PaapiSimulator(taxonomy=taxonomy()).start()
+        self.api = DefaultApi(api_client=self.simulator.api_client())
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.simulator.stop()
+
+    def crawler(self, **options):
+        return BrowseNodeCrawler(self.api, "dummy-21", clock=self.clock,
+                                 **options)
+
+    def requests(self):
+        return self.simulator.metrics.counter("requests.GetBrowseNodes")
+
+    def test_crawl(self):
+        graph = self.crawler().crawl(["1", "2"])
+        self.assertEqual(len(graph), 7)
+        # one call per level
+        self.assertEqual(self.requests(), 3)
+        self.assertEqual(sorted(graph.roots()), ["1", "2"])
+        self.assertEqual(graph.children("11"), ("111", "112"))
+        self.assertEqual(graph.ancestors("112"), ["11", "1"])
+        self.assertEqual(graph.descendants("1"), ["11", "12", "111", "112"])
+        self.assertEqual(graph.descendants("1", max_depth=1), ["11", "12"])
+        self.assertEqual(graph.path("111"), [
+            "Catégorie 1", "Catégorie 11", "Catégorie 111"])
+
+    def test_batches(self):
+        graph = self.crawler(batch_size=2, concurrency=2).crawl(["1", "2"])
+        self.assertEqual(len(graph), 7)
+        # levels of 2, 3 and 2 nodes
+        self.assertEqual(self.requests(), 4)
+
+    def test_max_depth(self):
+        graph = self.crawler(max_depth=1).crawl(["1"])
+        self.assertTrue(graph.get("11").expanded)
+        self.assertFalse(graph.get("111").expanded)
+        self.assertEqual(graph.path("111")[-1], "Catégorie 111")
+
+    def test_crawl_from_inner_node(self):
+        graph = self.crawler().crawl(["11"])
+        self.assertEqual(graph.path("112"), [
+            "Catégorie 1", "Catégorie 11", "Catégorie 112"])
+        self.assertFalse(graph.get("1").expanded)
+
+    def test_refresh(self):
+        crawler = self.crawler()
+        graph = crawler.crawl(["1", "2"])
+        self.simulator.taxonomy.update({"11": ["111"], "12": ["121"],
+                                        "121": ["1211"], "1211": []})
+        del self.simulator.taxonomy["112"]
+        report = crawler.refresh(graph)
+        self.assertEqual(report.checked, 7)
+        self.assertEqual(sorted(report.changed), ["11", "12"])
+        self.assertEqual(report.added, 2)
+        self.assertEqual(report.removed, 1)
+        self.assertNotIn("112", graph)
+        self.assertEqual(graph.ancestors("1211"), ["121", "12", "1"])
+        self.assertTrue(graph.get("1211").expanded)
+
+    def test_refresh_only_stale_nodes(self):
+        crawler = self.crawler()
+        graph = crawler.crawl(["1", "2"])
+        requests = self.requests()
+        self.clock.now += 50
+        self.assertEqual(crawler.refresh(graph, max_age=100).checked, 0)
+        self.assertEqual(self.requests(), requests)
+        self.clock.now += 100
+        self.assertEqual(crawler.refresh(graph, max_age=100).checked, 7)
+
+    def test_removed_node(self):
+        crawler = self.crawler()
+        graph = crawler.crawl(["1", "2"])
+        del self.simulator.taxonomy["2"]
+        report = crawler.refresh(graph, node_ids=["2", "1"])
+        self.assertEqual(report.changed, ["2"])
+        self.assertEqual(report.removed, 2)
+        self.assertEqual(graph.roots(), ["1"])
+
+
+class TestBrowseNodeGraph(unittest.TestCase):
+    """BrowseNodeGraph unit test stubs"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_and_load(self):
+        with PaapiSimulator(taxonomy=taxonomy()) as simulator:
+            api = DefaultApi(api_client=simulator.api_client())
+            graph = BrowseNodeCrawler(api, "dummy-21", max_depth=1).crawl(
+                ["1"])
+        path = os.path.join(self.directory, "taxonomy.json.gz")
+        graph.save(path)
+        loaded = BrowseNodeGraph.load(path)
+        self.assertEqual(len(loaded), len(graph))
+        for node in graph:
+            other = loaded.get(node.id)
+            self.assertEqual(
+                (other.name, other.parent, other.children, other.sales_rank,
+                 other.fetched_at),
+                (node.name, node.parent, node.children, node.sales_rank,
+                 node.fetched_at))
+
+    def test_remove(self):
+        graph = BrowseNodeGraph()
+        with PaapiSimulator(taxonomy=taxonomy()) as simulator:
+            api = DefaultApi(api_client=simulator.api_client())
+            BrowseNodeCrawler(api, "dummy-21").crawl(["1"], graph)
+        self.assertEqual(graph.remove("11"), 3)
+        self.assertEqual(graph.children("1"), ("12",))
+        self.assertEqual(graph.remove("11"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+# flake8: noqa
+
+from __future__ import absolute_import
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import json
+import threading
+import unittest
+
+from benchmarks.simulator import PaapiSimulator, load_service
+from paapi5_python_sdk.cache import ResponseCache
+from paapi5_python_sdk.circuit_breaker import CircuitOpenError
+from paapi5_python_sdk.rest import ApiException
+from test.helpers import FakeClock
+
+
+def api_exception(code, status=404):
+    exception = ApiException(status=status, reason="Error")
+    exception.body = '{"Errors": [{"Code": "%s", "Message": "..."}]}' % code
+    return exception
+
+
+class TestResponseCache(unittest.TestCase):
+    """ResponseCache unit tests"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(ttl=10, stale_ttl=100, negative_ttl=50,
+                                   clock=self.clock)
+
+    def test_fresh_hit_does_not_reload(self):
+        calls = []
+        loader = lambda: calls.append(1) or len(calls)
+        self.assertEqual(self.cache.get_or_load("k", loader), 1)
+        self.clock.now += 5
+        self.assertEqual(self.cache.get_or_load("k", loader), 1)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cache.stats()["counters"]["hits"], 1)
+
+    def test_stale_entry_is_served_and_refreshed_in_background(self):
+        self.cache.get_or_load("k", lambda: "old")
+        self.clock.now += 20
+        refreshed = threading.Event()
+
+        def loader():
+            refreshed.set()
+            return "new"
+
+        self.assertEqual(self.cache.get_or_load("k", loader), "old")
+        self.assertTrue(refreshed.wait(5))
+        for _ in range(100):
+            if not self.cache.stats()["entries"][0]["refreshing"]:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(self.cache.get_or_load("k", loader), "new")
+        self.assertEqual(self.cache.stats()["counters"]["stale_hits"], 1)
+
+    def test_staleness_is_reported_per_entry(self):
+        self.cache.get_or_load("k", lambda: "v")
+        self.clock.now += 25
+        entry = self.cache.stats()["entries"][0]
+        self.assertTrue(entry["stale"])
+        self.assertEqual(entry["staleness"], 15)
+
+    def test_concurrent_misses_share_one_load(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "v"
+
+        results = []
+        first = threading.Thread(
+            target=lambda: results.append(self.cache.get_or_load("k", loader)))
+        first.start()
+        started.wait(5)
+        second = threading.Thread(
+            target=lambda: results.append(self.cache.get_or_load("k", loader)))
+        second.start()
+        release.set()
+        first.join(5)
+        second.join(5)
+        self.assertEqual(results, ["v", "v"])
+        self.assertEqual(len(calls), 1)
+
+    def test_deterministic_errors_are_cached(self):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            raise api_exception("NoResults")
+
+        for _ in range(3):
+            with self.assertRaises(ApiException):
+                self.cache.get_or_load("k", loader)
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(self.cache.stats()["entries"][0]["negative"])
+
+        self.clock.now += 60
+        with self.assertRaises(ApiException):
+            self.cache.get_or_load("k", loader)
+        self.assertEqual(len(calls), 2)
+
+    def test_negative_values_use_the_negative_ttl(self):
+        cache = ResponseCache(ttl=10, stale_ttl=100, negative_ttl=50,
+                              clock=self.clock,
+                              is_negative=lambda value: not value)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return []
+
+        self.assertEqual(cache.get_or_load("k", loader), [])
+        self.assertTrue(cache.stats()["entries"][0]["negative"])
+        self.clock.now += 40
+        cache.get_or_load("k", loader)
+        self.assertEqual(len(calls), 1)
+        self.clock.now += 20
+        cache.get_or_load("k", loader)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(cache.stats()["counters"]["negative_stores"], 2)
+
+    def test_transient_errors_are_not_cached(self):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            raise api_exception("TooManyRequests", status=429)
+
+        for _ in range(2):
+            with self.assertRaises(ApiException):
+                self.cache.get_or_load("k", loader)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResponseCache(max_entries=2, clock=self.clock)
+        for key in ("a", "b", "c"):
+            cache.get_or_load(key, lambda: key)
+        self.assertEqual([entry["key"] for entry in cache.stats()["entries"]],
+                         ["b", "c"])
+
+    def test_expired_entry_is_served_on_listed_errors(self):
+        cache = ResponseCache(ttl=10, stale_ttl=100, clock=self.clock,
+                              serve_expired_on=(CircuitOpenError,))
+        cache.get_or_load("k", lambda: "old")
+        self.clock.now += 200
+
+        def loader():
+            raise CircuitOpenError(("host", "region"), 5.0)
+
+        self.assertEqual(cache.get_or_load("k", loader), "old")
+        self.assertEqual(cache.stats()["counters"]["expired_hits"], 1)
+        with self.assertRaises(CircuitOpenError):
+            cache.get_or_load("other", loader)
+
+        def down():
+            raise api_exception("InternalFailure", status=500)
+        with self.assertRaises(ApiException):
+            cache.get_or_load("k", down)
+
+
+class TestSearchCache(unittest.TestCase):
+    """/search cache unit tests"""
+
+    def setUp(self):
+        self.simulator = PaapiSimulator(total_results=0).start()
+        self.service = load_service(self.simulator)
+        self.service.SEARCH_CACHE.clear()
+        self.client = self.service.app.test_client()
+
+    def tearDown(self):
+        self.service.SEARCH_CACHE.clear()
+        self.simulator.stop()
+
+    def test_no_results_are_cached_with_the_negative_ttl(self):
+        for _ in range(2):
+            response = self.client.get("/search?keywords=introuvable")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.data), [])
+        self.assertEqual(
+            self.simulator.metrics.counter("requests.SearchItems"), 1)
+        entry, = self.service.SEARCH_CACHE.stats()["entries"]
+        self.assertTrue(entry["negative"])
+        stored = list(self.service.SEARCH_CACHE._entries.values())[0]
+        self.assertEqual(stored.fresh_until - stored.stored_at,
+                         self.service.SEARCH_CACHE.negative_ttl)
+
+
+if __name__ == "__main__":
+    unittest.main()
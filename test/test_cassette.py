@@ -0,0 +1,166 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.fixtures import search_items_request
+from benchmarks.simulator import (PaapiSimulator, SIMULATOR_ACCESS_KEY,
+                                  SIMULATOR_SECRET_KEY)
+from paapi5_python_sdk.api.default_api import DefaultApi
+from paapi5_python_sdk.api_client import ApiClient
+from paapi5_python_sdk.cassette import (Cassette, CassetteMiss,
+                                        RecordedResponse, canonical_body)
+from paapi5_python_sdk.circuit_breaker import CircuitBreaker
+from paapi5_python_sdk.configuration import Configuration
+from paapi5_python_sdk.metrics import MetricsRegistry
+from paapi5_python_sdk.pagination import search_pages
+from paapi5_python_sdk.rest import ApiException
+
+
+class TestCassette(unittest.TestCase):
+    """Cassette recording, replay and file merging tests"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "search.jsonl.gz")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def api(self, simulator, cassette):
+        configuration = Configuration()
+        configuration.cassette = cassette
+        return DefaultApi(api_client=simulator.api_client(
+            configuration=configuration))
+
+    def test_record_then_replay(self):
+        with PaapiSimulator(total_results=20) as simulator:
+            with Cassette(self.path, mode="record") as cassette:
+                api = self.api(simulator, cassette)
+                recorded = api.search_items(search_items_request(item_page=2))
+                with self.assertRaises(ApiException):
+                    api.search_items(search_items_request(item_page=3))
+            self.assertEqual(len(cassette), 2)
+
+        with gzip.open(self.path, "rt") as recording:
+            content = recording.read()
+        for secret in (SIMULATOR_ACCESS_KEY, SIMULATOR_SECRET_KEY,
+                       "Signature", "PartnerTag"):
+            self.assertNotIn(secret, content)
+
+        delays = []
+        cassette = Cassette(self.path, latency_scale=2.0, sleep=delays.append)
+        # The simulator is stopped: responses come from the cassette.
+        api = self.api(simulator, cassette)
+        request = search_items_request(item_page=2)
+        request.partner_tag = "other-21"
+        replayed = api.search_items(request)
+        self.assertEqual(replayed.to_dict(), recorded.to_dict())
+        self.assertEqual(len(delays), 1)
+        self.assertGreater(delays[0], 0)
+
+        with self.assertRaises(ApiException) as context:
+            api.search_items(search_items_request(item_page=3))
+        self.assertEqual(context.exception.status, 404)
+        self.assertEqual(context.exception.error_codes(), ["NoResults"])
+
+        with self.assertRaises(CassetteMiss):
+            api.search_items(search_items_request(item_page=4))
+
+    def test_misses_are_not_retried_nor_counted_by_the_breaker(self):
+        with Cassette(self.path, mode="record"):
+            pass
+        metrics = MetricsRegistry()
+        configuration = Configuration()
+        configuration.cassette = Cassette(self.path, latency_scale=0,
+                                          metrics=metrics)
+        configuration.circuit_breaker = CircuitBreaker(min_calls=1)
+        api = DefaultApi(api_client=ApiClient(
+            access_key="key", secret_key="secret", host="127.0.0.1:9",
+            region="eu-west-1", configuration=configuration))
+        with self.assertRaises(CassetteMiss):
+            search_pages(api, search_items_request(), pages=1, retries=3)
+        self.assertEqual(metrics.counter("cassette.misses"), 1)
+        self.assertEqual(configuration.circuit_breaker.stats(), {
+            "127.0.0.1:9/eu-west-1": {"state": "closed", "calls": 0,
+                                      "failure_rate": None}})
+
+    def test_hosts_do_not_share_recordings(self):
+        cassette = Cassette(self.path, mode="record")
+        for host in ("webservices.amazon.fr", "webservices.amazon.de"):
+            cassette.record(
+                "POST", "https://%s/paapi5/searchitems" % host, {},
+                {"Keywords": "a"},
+                RecordedResponse(200, "OK", '"%s"' % host, {}), 0.1)
+        cassette.close()
+        replay = Cassette(self.path, latency_scale=0)
+        for host in ("webservices.amazon.de", "webservices.amazon.fr"):
+            self.assertEqual(replay.replay(
+                "POST", "https://%s/paapi5/searchitems" % host, {},
+                {"Keywords": "a"}).data, '"%s"' % host)
+
+    def test_workers_recording_the_same_cassette(self):
+        def response(data):
+            return RecordedResponse(200, "OK", data,
+                                    {"content-type": "application/json"})
+
+        first = Cassette(self.path, mode="record")
+        second = Cassette(self.path, mode="record")
+        first.record("POST", "/paapi5/searchitems", {}, {"Keywords": "a"},
+                     response('{"a": 1}'), 0.1)
+        second.record("POST", "/paapi5/searchitems", {}, {"Keywords": "b"},
+                      response('{"b": 1}'), 0.1)
+        first.close()
+        second.close()
+        # saving again only adds what was recorded since
+        first.record("POST", "/paapi5/searchitems", {}, {"Keywords": "a"},
+                     response('{"a": 2}'), 0.1)
+        first.close()
+
+        replay = Cassette(self.path, latency_scale=0)
+        self.assertEqual(len(replay), 3)
+        self.assertEqual(replay.replay("POST", "/paapi5/searchitems", {},
+                                       {"Keywords": "b"}).data, '{"b": 1}')
+        self.assertEqual(
+            [replay.replay("POST", "/paapi5/searchitems", {},
+                           {"Keywords": "a"}).data for _ in range(2)],
+            ['{"a": 1}', '{"a": 2}'])
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ["search.jsonl.gz", "search.jsonl.gz.lock"])
+
+    def test_canonical_body(self):
+        self.assertEqual(canonical_body(b'{"b": 1, "PartnerTag": "x", "a": [2]}'),
+                         '{"a":[2],"b":1}')
+        self.assertEqual(canonical_body({"a": 1}), '{"a":1}')
+        self.assertEqual(canonical_body(None), '')
+
+    def test_invalid_mode(self):
+        self.assertRaises(ValueError, Cassette, self.path, mode="live")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import unittest
+
+from benchmarks.fixtures import search_items_request
+from benchmarks.simulator import PaapiSimulator
+from paapi5_python_sdk.api.default_api import DefaultApi
+from paapi5_python_sdk.circuit_breaker import (CLOSED, HALF_OPEN, OPEN,
+                                               CircuitBreaker,
+                                               CircuitOpenError)
+from paapi5_python_sdk.concurrency import ConcurrencyLimitExceeded
+from paapi5_python_sdk.configuration import Configuration
+from paapi5_python_sdk.metrics import MetricsRegistry
+from paapi5_python_sdk.rest import ApiException
+from test.helpers import FakeClock
+
+KEY = ("webservices.amazon.fr", "eu-west-1")
+
+
+def fail(status=500):
+    def send():
+        raise ApiException(status=status, reason="Error")
+    return send
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """CircuitBreaker unit test stubs"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.metrics = MetricsRegistry()
+        self.breaker = CircuitBreaker(failure_rate=0.5, window=4, min_calls=4,
+                                      open_seconds=30, half_open_calls=2,
+                                      metrics=self.metrics, clock=self.clock)
+
+    def call(self, send, key=KEY):
+        try:
+            return self.breaker.call(key, send)
+        except ApiException as error:
+            return error
+
+    def test_opens_on_failure_rate(self):
+        for send in (lambda: "ok", fail(), lambda: "ok"):
+            self.call(send)
+        self.assertEqual(self.breaker.state(KEY), CLOSED)
+        self.call(fail())
+        self.assertEqual(self.breaker.state(KEY), OPEN)
+
+        calls = []
+        error = self.call(lambda: calls.append(1))
+        self.assertIsInstance(error, CircuitOpenError)
+        self.assertEqual(error.retry_after, 30)
+        self.assertEqual(calls, [])
+        self.assertEqual(self.metrics.counter("circuit_breaker.rejected"), 1)
+        self.assertEqual(self.metrics.gauge(
+            "circuit_breaker.state.webservices.amazon.fr/eu-west-1"), 2)
+        # Circuits are independent per host/region.
+        self.assertEqual(self.call(lambda: "ok", key=("h", "r")), "ok")
+
+    def test_client_errors_do_not_count(self):
+        for _ in range(8):
+            self.call(fail(status=429))
+            self.call(fail(status=404))
+        self.assertEqual(self.breaker.state(KEY), CLOSED)
+
+    def test_half_open_trials(self):
+        for _ in range(4):
+            self.call(fail())
+        self.clock.now += 30
+        self.assertEqual(self.breaker.state(KEY), HALF_OPEN)
+        self.assertEqual(self.call(lambda: "ok"), "ok")
+        self.assertEqual(self.breaker.state(KEY), HALF_OPEN)
+        self.assertEqual(self.call(lambda: "ok"), "ok")
+        self.assertEqual(self.breaker.state(KEY), CLOSED)
+
+        for _ in range(4):
+            self.call(fail())
+        self.clock.now += 30
+        self.call(fail())
+        self.assertEqual(self.breaker.state(KEY), OPEN)
+
+    def test_local_errors_are_not_outcomes(self):
+        def rejected():
+            raise ConcurrencyLimitExceeded(limit=2, waited=0.1)
+
+        for _ in range(8):
+            self.call(rejected)
+        self.assertEqual(self.breaker.stats()["%s/%s" % KEY]["calls"], 0)
+        for _ in range(4):
+            self.call(fail())
+        self.clock.now += 30
+        # rejected trials neither close the circuit nor keep their slot
+        for _ in range(4):
+            self.assertIsInstance(self.call(rejected),
+                                  ConcurrencyLimitExceeded)
+        self.assertEqual(self.breaker.state(KEY), HALF_OPEN)
+        self.call(fail())
+        self.assertEqual(self.breaker.state(KEY), OPEN)
+
+    def test_half_open_limits_concurrent_trials(self):
+        for _ in range(4):
+            self.call(fail())
+        self.clock.now += 30
+        nested = []
+
+        def trial():
+            nested.append(self.call(lambda: "second"))
+            nested.append(self.call(lambda: "third"))
+            return "first"
+
+        self.assertEqual(self.call(trial), "first")
+        self.assertEqual(nested[0], "second")
+        self.assertIsInstance(nested[1], CircuitOpenError)
+
+    def test_opens_on_slow_calls(self):
+        breaker = CircuitBreaker(slow_call_seconds=1.0, slow_call_rate=0.5,
+                                 window=2, min_calls=2, clock=self.clock)
+
+        def slow():
+            self.clock.now += 2
+            return "late"
+
+        breaker.call(KEY, slow)
+        breaker.call(KEY, slow)
+        self.assertEqual(breaker.state(KEY), OPEN)
+
+    def test_api_client(self):
+        breaker = CircuitBreaker(window=2, min_calls=2)
+        with PaapiSimulator(error_rate=1.0) as simulator:
+            configuration = Configuration()
+            configuration.circuit_breaker = breaker
+            api = DefaultApi(api_client=simulator.api_client(
+                configuration=configuration))
+            for _ in range(2):
+                self.assertRaises(ApiException, api.search_items,
+                                  search_items_request())
+            self.assertRaises(CircuitOpenError, api.search_items,
+                              search_items_request())
+            self.assertEqual(
+                simulator.metrics.counter("requests.SearchItems"), 2)
+            self.assertEqual(breaker.stats()[simulator.host + "/eu-west-1"]
+                             ["state"], OPEN)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+
+import unittest
+
+from benchmarks.fixtures import deserialize, search_items_response
+from paapi5_python_sdk import columns
+from paapi5_python_sdk.columns import ItemColumns, response_items
+
+
+def responses(count=3):
+    return [search_items_response(item_count=10, seed=seed)
+            for seed in range(count)]
+
+
+@unittest.skipIf(columns.numpy is None, "numpy is not installed")
+class TestItemColumns(unittest.TestCase):
+    """ItemColumns unit test stubs"""
+
+    def test_raw_and_deserialized_items_agree(self):
+        raw = responses()
+        models = [deserialize(response, 'SearchItemsResponse')
+                  for response in raw]
+        from_raw = ItemColumns.from_responses(raw)
+        from_models = ItemColumns.from_responses(models)
+        self.assertEqual(len(from_raw), 30)
+        for name in from_raw.columns:
+            self.assertEqual(from_raw[name].tolist(),
+                             from_models[name].tolist(), name)
+        self.assertEqual(list(from_raw.asins), list(from_models.asins))
+
+    def test_missing_values_are_masked(self):
+        raw = responses(1)
+        items = response_items(raw[0])
+        del items[1]["CustomerReviews"]
+        items[2]["Offers"]["Listings"][0]["Price"]["Savings"] = {
+            "Amount": 10.0, "Percentage": 20}
+        table = ItemColumns(items)
+        self.assertTrue(table['review_count'].mask[1])
+        self.assertFalse(table['review_count'].mask[0])
+        self.assertEqual(table['review_count'].dtype.kind, 'i')
+        self.assertEqual(table['savings_percentage'].count(), 1)
+        self.assertEqual(table.row(items[2]["ASIN"])["savings_percentage"],
+                         20)
+        self.assertIsNone(table.row(items[1]["ASIN"])["star_rating"])
+
+    def test_filter_and_sort(self):
+        table = ItemColumns.from_responses(responses())
+        selected = table.filter((table['price'] < 200) &
+                                (table['star_rating'] >= 3))
+        expected = [item for item in (
+            response_items(response)[index] for response in responses()
+            for index in range(10))
+            if item["Offers"]["Listings"][0]["Price"]["Amount"] < 200 and
+            item["CustomerReviews"]["StarRating"]["Value"] >= 3]
+        self.assertEqual(sorted(selected.asins),
+                         sorted(item["ASIN"] for item in expected))
+        ranked = selected.sort_by('review_count', descending=True)
+        counts = ranked['review_count'].tolist()
+        self.assertEqual(counts, sorted(counts, reverse=True))
+        self.assertEqual(ranked.items[0]["ASIN"], ranked.asins[0])
+
+    def test_missing_values_sort_last(self):
+        items = response_items(responses(1)[0])
+        del items[0]["BrowseNodeInfo"]
+        table = ItemColumns(items)
+        for descending in (False, True):
+            ordered = table.sort_by('sales_rank', descending=descending)
+            self.assertEqual(ordered.asins[-1], items[0]["ASIN"])
+
+    def test_index_by_asin(self):
+        table = ItemColumns.from_responses(responses())
+        self.assertEqual(table.index["B000001003"], 13)
+        self.assertEqual(table.row("B000001003")["price"],
+                         table['price'][13])
+
+    def test_custom_columns(self):
+        table = ItemColumns.from_responses(responses(1), columns={
+            'prime': ('offers.listings[0].delivery_info.is_prime_eligible',
+                      'bool')})
+        self.assertEqual(list(table.columns), ['prime'])
+        self.assertRaises(ValueError, ItemColumns, [], {
+            'price': ('offers.listings.price.amount', 'float64')})
+        self.assertRaises(ValueError, ItemColumns, [], {
+            'colour': ('item_info.colour', 'float64')})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+# flake8: noqa
+
+from __future__ import absolute_import
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import unittest
+
+from paapi5_python_sdk import compression
+from paapi5_python_sdk.cache import ResponseCache
+from paapi5_python_sdk.compression import PayloadCodec, available_codecs
+
+
+VALUE = [{"title": u"Casque sans fil é", "price": 25.5, "prime": True,
+          "ASIN": "B000000001", "image": None}] * 10
+
+
+class TestPayloadCodec(unittest.TestCase):
+    """PayloadCodec unit tests"""
+
+    def test_every_available_codec_round_trips(self):
+        for codec in available_codecs():
+            self.assertEqual(codec.decode(codec.encode(VALUE)), VALUE,
+                             codec.name)
+
+    def test_compressed_payload_is_smaller(self):
+        codec = PayloadCodec(compression="zlib")
+        plain = PayloadCodec(compression="none")
+        self.assertLess(len(codec.encode(VALUE)), len(plain.encode(VALUE)))
+
+    def test_missing_optional_dependency_is_reported(self):
+        if compression.zstandard is None:
+            with self.assertRaises(ImportError):
+                PayloadCodec(compression="zstd")
+        if compression.msgpack is None:
+            with self.assertRaises(ImportError):
+                PayloadCodec(encoding="msgpack")
+
+    def test_cache_keeps_values_encoded_until_hit(self):
+        cache = ResponseCache(codec=PayloadCodec(compression="zlib"))
+        self.assertEqual(cache.get_or_load("k", lambda: VALUE), VALUE)
+        self.assertIsInstance(cache._entries["k"].value, bytes)
+        self.assertEqual(cache.get_or_load("k", None), VALUE)
+        self.assertGreater(cache.stats()["bytes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import threading
+import time
+import unittest
+
+import urllib3
+
+from benchmarks.fixtures import search_items_request
+from benchmarks.simulator import PaapiSimulator, constant_latency
+from paapi5_python_sdk.api.default_api import DefaultApi
+from paapi5_python_sdk.circuit_breaker import CLOSED, CircuitBreaker
+from paapi5_python_sdk.concurrency import (ConcurrencyLimiter,
+                                           ConcurrencyLimitExceeded,
+                                           is_throttled)
+from paapi5_python_sdk.configuration import Configuration
+from paapi5_python_sdk.deadline import Deadline
+from paapi5_python_sdk.metrics import MetricsRegistry
+from paapi5_python_sdk.rest import ApiException
+
+
+def ok():
+    return "ok"
+
+
+def throttled():
+    raise ApiException(status=429, reason="Too Many Requests")
+
+
+class TestConcurrencyLimiter(unittest.TestCase):
+    """ConcurrencyLimiter unit test stubs"""
+
+    def setUp(self):
+        self.metrics = MetricsRegistry()
+
+    def test_additive_increase(self):
+        limiter = ConcurrencyLimiter(initial_limit=2, max_limit=4,
+                                     metrics=self.metrics)
+        for _ in range(3):
+            limiter.call(ok)
+        self.assertEqual(limiter.limit, 3)
+        for _ in range(50):
+            limiter.call(ok)
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(self.metrics.gauge("concurrency.limit"), 4)
+        self.assertEqual(self.metrics.counter("concurrency.requests"), 53)
+
+    def test_multiplicative_decrease(self):
+        limiter = ConcurrencyLimiter(initial_limit=8, metrics=self.metrics)
+        self.assertRaises(ApiException, limiter.call, throttled)
+        self.assertEqual(limiter.limit, 4)
+        self.assertRaises(ApiException, limiter.call, throttled)
+        self.assertRaises(ApiException, limiter.call, throttled)
+        self.assertRaises(ApiException, limiter.call, throttled)
+        self.assertEqual(limiter.limit, 1)
+        self.assertEqual(self.metrics.counter("concurrency.throttled"), 4)
+        self.assertEqual(self.metrics.counter("concurrency.decreases"), 3)
+
+    def test_other_errors_and_slow_calls_keep_the_limit(self):
+        limiter = ConcurrencyLimiter(initial_limit=2, latency_threshold=0.01)
+
+        def error():
+            raise ApiException(status=500, reason="Internal")
+
+        def slow():
+            time.sleep(0.02)
+
+        self.assertRaises(ApiException, limiter.call, error)
+        limiter.call(slow)
+        limiter.call(slow)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_burst_of_throttling_counts_once(self):
+        limiter = ConcurrencyLimiter(initial_limit=4)
+        release = threading.Event()
+        started = threading.Barrier(5)
+
+        def send():
+            started.wait()
+            release.wait()
+            throttled()
+
+        def run():
+            try:
+                limiter.call(send)
+            except ApiException:
+                pass
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        started.wait()
+        self.assertEqual(limiter.in_flight, 4)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(limiter.limit, 2)
+        self.assertEqual(limiter.stats()["throttled"], 4)
+        self.assertEqual(limiter.stats()["decreases"], 1)
+
+    def test_wait_for_a_slot(self):
+        limiter = ConcurrencyLimiter(initial_limit=1, max_limit=1,
+                                     max_wait=0.05, metrics=self.metrics)
+        release = threading.Event()
+        thread = threading.Thread(target=limiter.call, args=(release.wait,))
+        thread.start()
+        while limiter.in_flight < 1:
+            time.sleep(0.001)
+        self.assertRaises(ConcurrencyLimitExceeded, limiter.call, ok)
+        release.set()
+        thread.join()
+        self.assertEqual(limiter.call(ok), "ok")
+        self.assertEqual(self.metrics.counter("concurrency.rejected"), 1)
+
+    def test_is_throttled(self):
+        self.assertTrue(is_throttled(ApiException(status=429)))
+        self.assertFalse(is_throttled(ApiException(status=503)))
+        self.assertFalse(is_throttled(ValueError()))
+
+    def test_api_client_adapts_to_throttling(self):
+        with PaapiSimulator(tps=50) as simulator:
+            limiter = ConcurrencyLimiter(initial_limit=16)
+            configuration = Configuration()
+            configuration.concurrency_limiter = limiter
+            api = DefaultApi(api_client=simulator.api_client(
+                configuration=configuration))
+            peak = [0]
+
+            def search():
+                for _ in range(5):
+                    peak[0] = max(peak[0], limiter.in_flight)
+                    try:
+                        api.search_items(search_items_request())
+                    except ApiException as error:
+                        self.assertEqual(error.status, 429)
+
+            threads = [threading.Thread(target=search) for _ in range(16)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        stats = limiter.stats()
+        self.assertEqual(stats["requests"], 80)
+        self.assertGreater(stats["throttled"], 0)
+        self.assertLess(stats["limit"], 16)
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertLessEqual(peak[0], 16)
+
+    def test_slot_wait_counts_against_the_deadline(self):
+        with PaapiSimulator(latency=constant_latency(0.3)) as simulator:
+            configuration = Configuration()
+            configuration.concurrency_limiter = ConcurrencyLimiter(
+                initial_limit=1, max_limit=1)
+            api = DefaultApi(api_client=simulator.api_client(
+                configuration=configuration))
+            holder = threading.Thread(
+                target=api.search_items, args=(search_items_request(),))
+            holder.start()
+            while configuration.concurrency_limiter.in_flight < 1:
+                time.sleep(0.001)
+            started = time.time()
+            # about 0.3 s waiting for the slot, leaving 0.1 s for the call
+            with self.assertRaises((ApiException,
+                                    urllib3.exceptions.HTTPError)):
+                api.search_items(search_items_request(),
+                                 _deadline=Deadline(0.4))
+            elapsed = time.time() - started
+            holder.join()
+        self.assertLess(elapsed, 0.55)
+
+    def test_rejections_leave_the_circuit_closed(self):
+        with PaapiSimulator(latency=constant_latency(0.1)) as simulator:
+            breaker = CircuitBreaker(min_calls=2, window=10)
+            configuration = Configuration()
+            configuration.concurrency_limiter = ConcurrencyLimiter(
+                initial_limit=1, max_limit=1, max_wait=0.01)
+            configuration.circuit_breaker = breaker
+            api = DefaultApi(api_client=simulator.api_client(
+                configuration=configuration))
+            rejected = []
+
+            def search():
+                try:
+                    api.search_items(search_items_request())
+                except ConcurrencyLimitExceeded as error:
+                    rejected.append(error)
+
+            threads = [threading.Thread(target=search) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            key = (simulator.host, simulator.region)
+        self.assertEqual(len(rejected), 7)
+        # local backpressure says nothing about the health of the host
+        self.assertEqual(breaker.state(key), CLOSED)
+        self.assertEqual(breaker.stats()["%s/%s" % key]["failure_rate"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import json
+import threading
+import unittest
+
+from benchmarks.fixtures import search_items_request
+from benchmarks.simulator import PaapiSimulator
+from paapi5_python_sdk.api.default_api import DefaultApi
+from paapi5_python_sdk.configuration import Configuration
+from paapi5_python_sdk.credentials import (Credential, CredentialPool,
+                                           is_credential_failure,
+                                           parse_credentials,
+                                           with_partner_tag)
+from paapi5_python_sdk.metrics import MetricsRegistry
+from paapi5_python_sdk.prepared_request import PreparedRequest
+from paapi5_python_sdk.rest import ApiException
+from test.helpers import FakeClock
+
+
+def used(credential):
+    return credential.access_key
+
+
+def fail(status):
+    def send(credential):
+        raise ApiException(status=status, reason="Error")
+    return send
+
+
+class TestCredentialPool(unittest.TestCase):
+    """CredentialPool unit test stubs"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.metrics = MetricsRegistry()
+        self.pool = CredentialPool([
+            Credential("AK1", "SK1", "tag1-21", tps=1),
+            Credential("AK2", "SK2", "tag2-21", tps=2),
+        ], metrics=self.metrics, clock=self.clock)
+
+    def test_least_loaded_credential(self):
+        keys = [self.pool.call(used) for _ in range(3)]
+        # AK2 has twice the quota of AK1.
+        self.assertEqual(sorted(keys), ["AK1", "AK2", "AK2"])
+        self.clock.now += 1.5
+        self.assertEqual(self.pool.stats()["AK1"]["load"], 0.0)
+        self.assertEqual(self.metrics.counter("credentials.AK2.requests"), 2)
+
+    def test_throttled_credential_is_skipped(self):
+        self.pool = CredentialPool([Credential("AK1", "SK1", "tag1-21"),
+                                    Credential("AK2", "SK2", "tag2-21")],
+                                   throttle_cooldown=1.0, clock=self.clock)
+        self.assertEqual(self.pool.call(used), "AK1")
+        self.clock.now += 2
+        self.assertRaises(ApiException, self.pool.call, fail(429))
+        self.clock.now += 0.5
+        self.assertEqual(self.pool.call(used), "AK2")
+        self.clock.now += 0.6
+        self.assertEqual(self.pool.call(used), "AK1")
+        self.assertEqual(self.pool.stats()["AK1"]["throttled"], 1)
+
+    def test_failed_credential_is_disabled(self):
+        self.assertRaises(ApiException, self.pool.call, fail(401))
+        self.clock.now += 10
+        self.assertEqual([self.pool.call(used) for _ in range(3)],
+                         ["AK2", "AK2", "AK2"])
+        self.assertFalse(self.pool.stats()["AK1"]["available"])
+        self.assertEqual(self.metrics.counter("credentials.AK1.failures"), 1)
+
+    def test_every_credential_unavailable(self):
+        self.assertRaises(ApiException, self.pool.call, fail(401))
+        self.clock.now += 1
+        self.assertRaises(ApiException, self.pool.call, fail(401))
+        # AK1 failed first, so it is available first.
+        self.assertEqual(self.pool.call(used), "AK1")
+
+    def test_other_errors_keep_the_credential(self):
+        self.assertRaises(ApiException, self.pool.call, fail(500))
+        self.assertTrue(self.pool.stats()["AK2"]["available"])
+
+    def test_is_credential_failure(self):
+        error = ApiException(status=400, reason="Bad Request")
+        error.body = json.dumps({"Errors": [{"Code": "InvalidPartnerTag"}]})
+        self.assertTrue(is_credential_failure(error))
+        self.assertTrue(is_credential_failure(ApiException(status=403)))
+        self.assertFalse(is_credential_failure(ApiException(status=429)))
+
+    def test_parse_credentials(self):
+        credentials = parse_credentials("AK1:SK1:tag1-21, AK2:SK2:tag2-21:5")
+        self.assertEqual([(c.access_key, c.secret_key, c.partner_tag, c.tps)
+                          for c in credentials],
+                         [("AK1", "SK1", "tag1-21", 1.0),
+                          ("AK2", "SK2", "tag2-21", 5.0)])
+        self.assertRaises(ValueError, parse_credentials, "AK1:SK1")
+        self.assertNotIn("SK1", repr(credentials[0]))
+
+    def test_parse_per_marketplace_partner_tags(self):
+        credential, = parse_credentials("AK1:SK1:tag1-21;fr=tag1-fr-21:2")
+        self.assertEqual(credential.partner_tag_for("fr"), "tag1-fr-21")
+        self.assertEqual(credential.partner_tag_for("de"), "tag1-21")
+        self.assertEqual(credential.partner_tag_for(None), "tag1-21")
+        self.assertEqual(credential.tps, 2.0)
+        self.assertRaises(ValueError, parse_credentials, "AK1:SK1:tag1;fr")
+
+    def test_with_partner_tag(self):
+        body = json.dumps({"PartnerTag": "tag1-21", "Keywords": "x"}).encode()
+        self.assertIs(with_partner_tag(body, "tag1-21"), body)
+        self.assertEqual(json.loads(with_partner_tag(body, "tag2-21")),
+                         {"PartnerTag": "tag2-21", "Keywords": "x"})
+
+    def test_with_partner_tag_keeps_the_encoded_bytes(self):
+        request = search_items_request()
+        body = PreparedRequest(request, fields=("item_page",)).body()
+        request.partner_tag = 'tag"2-21'
+        expected = PreparedRequest(request, fields=("item_page",)).body()
+        self.assertEqual(with_partner_tag(body, 'tag"2-21'), expected)
+        self.assertEqual(
+            with_partner_tag(with_partner_tag(body, 'tag"2-21'), "dummy-21"),
+            body)
+
+
+class TestApiClientCredentialPool(unittest.TestCase):
+    """ApiClient with a CredentialPool unit test stubs"""
+
+    def test_requests_are_spread_over_the_pool(self):
+        credentials = {"AK%d" % i: "SK%d" % i for i in range(3)}
+        with PaapiSimulator(
+                credentials=credentials, tps=4,
+                partner_tags={key: key.lower() + "-21"
+                              for key in credentials}) as simulator:
+            pool = CredentialPool([
+                Credential(key, secret, key.lower() + "-21", tps=4)
+                for key, secret in sorted(credentials.items())])
+            configuration = Configuration()
+            configuration.credential_pool = pool
+            api_client = simulator.api_client(configuration=configuration)
+            api_client.access_key = api_client.secret_key = None
+            api = DefaultApi(api_client=api_client)
+            errors = []
+
+            def search():
+                try:
+                    api.search_items(search_items_request())
+                except ApiException as error:
+                    errors.append(error)
+
+            threads = [threading.Thread(target=search) for _ in range(12)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            by_key = {key: simulator.metrics.counter("requests_by_key." + key)
+                      for key in credentials}
+        # 12 requests within the same second would throttle a single key.
+        self.assertEqual([str(e) for e in errors], [])
+        self.assertEqual(by_key, {"AK0": 4, "AK1": 4, "AK2": 4})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import time
+import unittest
+
+from benchmarks.fixtures import search_items_request
+from benchmarks.simulator import PaapiSimulator, constant_latency
+from paapi5_python_sdk.api.default_api import DefaultApi
+from paapi5_python_sdk.deadline import Deadline, DeadlineExceeded
+from paapi5_python_sdk.pagination import fetch_pages, search_pages
+from paapi5_python_sdk.rest import ApiException
+from test.helpers import FakeClock, Page, page_items
+
+
+class TestDeadline(unittest.TestCase):
+    """Deadline unit test stubs"""
+
+    def test_timeout_is_capped_to_remaining_time(self):
+        clock = FakeClock()
+        deadline = Deadline(5.0, clock=clock)
+        self.assertEqual(deadline.timeout(), 5.0)
+        clock.now += 3
+        self.assertEqual(deadline.timeout(10), 2.0)
+        self.assertEqual(deadline.timeout(1), 1)
+        self.assertEqual(deadline.timeout((1, 10)), (1, 2.0))
+        clock.now += 2
+        self.assertTrue(deadline.expired)
+        self.assertEqual(deadline.remaining(), 0.0)
+        self.assertRaises(DeadlineExceeded, deadline.timeout)
+        self.assertRaises(DeadlineExceeded, deadline.check)
+
+    def test_expired_deadline_skips_the_call(self):
+        api = DefaultApi(access_key="key", secret_key="secret",
+                         host="127.0.0.1:9", region="eu-west-1")
+        with self.assertRaises(DeadlineExceeded) as context:
+            api.search_items(search_items_request(), _deadline=Deadline(0))
+        self.assertEqual(context.exception.status, 0)
+
+
+    def test_no_urllib3_retries_under_a_deadline(self):
+        with PaapiSimulator() as simulator:
+            api = DefaultApi(api_client=simulator.api_client())
+            pool_manager = api.api_client.rest_client.pool_manager
+            sent = []
+
+            def request(*args, **kwargs):
+                sent.append(kwargs.get("retries"))
+                return pool_request(*args, **kwargs)
+            pool_request = pool_manager.request
+            pool_manager.request = request
+            api.search_items(search_items_request(), _deadline=Deadline(5))
+            api.search_items(search_items_request())
+        # each urllib3 retry would get the whole capped timeout again
+        self.assertEqual(sent, [False, None])
+
+class TestFetchPages(unittest.TestCase):
+    """fetch_pages unit test stubs"""
+
+    def test_stops_at_last_page(self):
+        fetched = []
+
+        def fetch(page):
+            fetched.append(page)
+            return Page(["item %d" % page] if page <= 3 else [])
+
+        results = fetch_pages(fetch, 10, page_items)
+        self.assertEqual(fetched, [1, 2, 3, 4])
+        self.assertEqual(results.items, ["item 1", "item 2", "item 3"])
+        self.assertEqual(results.last_page, 3)
+        self.assertTrue(results.complete)
+
+    def test_deadline_keeps_gathered_pages(self):
+        clock = FakeClock()
+        deadline = Deadline(2.5, clock=clock)
+
+        def fetch(page):
+            clock.now += 1
+            return Page([page])
+
+        results = fetch_pages(fetch, 10, page_items, deadline=deadline)
+        self.assertEqual(results.pages, [1, 2, 3])
+        self.assertFalse(results.complete)
+        self.assertTrue(results.deadline_exceeded)
+
+    def test_errors_are_raised(self):
+        def fetch(page):
+            if page == 2:
+                raise ApiException(status=500, reason="Internal")
+            return Page([page])
+
+        self.assertRaises(ApiException, fetch_pages, fetch, 5, page_items)
+
+    def test_concurrent_fetch(self):
+        def fetch(page):
+            time.sleep(0.01)
+            return Page([page] if page <= 7 else [])
+
+        results = fetch_pages(fetch, 10, page_items, concurrency=4)
+        self.assertEqual(results.items, list(range(1, 8)))
+
+
+class TestSearchPages(unittest.TestCase):
+    """search_pages unit test stubs"""
+
+    def test_search_pages(self):
+        with PaapiSimulator(total_results=35) as simulator:
+            api = DefaultApi(api_client=simulator.api_client())
+            results = search_pages(api, search_items_request(), pages=10)
+        self.assertEqual(results.pages, [1, 2, 3, 4])
+        self.assertEqual(len(results.items), 35)
+        self.assertTrue(results.complete)
+
+    def test_search_pages_deadline(self):
+        with PaapiSimulator(latency=constant_latency(0.1)) as simulator:
+            api = DefaultApi(api_client=simulator.api_client())
+            started = time.time()
+            results = search_pages(api, search_items_request(), pages=10,
+                                   deadline=Deadline(0.25))
+            elapsed = time.time() - started
+        self.assertFalse(results.complete)
+        self.assertEqual(results.pages, [1, 2])
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
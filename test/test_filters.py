@@ -0,0 +1,168 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+
+import json
+import unittest
+
+from benchmarks.fixtures import search_items_request
+from benchmarks.simulator import PaapiSimulator, load_service
+from paapi5_python_sdk.api.default_api import DefaultApi
+from paapi5_python_sdk.filters import SearchFilter
+from paapi5_python_sdk.models.customer_reviews import CustomerReviews
+from paapi5_python_sdk.models.delivery_flag import DeliveryFlag
+from paapi5_python_sdk.models.item import Item
+from paapi5_python_sdk.models.rating import Rating
+from paapi5_python_sdk.models.search_items_resource import SearchItemsResource
+from paapi5_python_sdk.pagination import search_pages
+from paapi5_python_sdk.prepared_request import PreparedRequest
+
+
+def reviewed(count=None, rating=None):
+    return Item(asin="B000000001", customer_reviews=CustomerReviews(
+        count=count, star_rating=Rating(value=rating)))
+
+
+def rating_at_least(value):
+    def check(item):
+        return item.customer_reviews.star_rating.value >= value
+    return check
+
+
+class TestSearchFilter(unittest.TestCase):
+    """SearchFilter unit test stubs"""
+
+    def test_request_fields(self):
+        item_filter = SearchFilter(min_price=25, max_price=99.99,
+                                   min_reviews_rating=3,
+                                   delivery_flags=[DeliveryFlag.PRIME])
+        self.assertEqual(item_filter.request_fields(), {
+            'min_price': 2500, 'max_price': 9999, 'min_reviews_rating': 3,
+            'delivery_flags': [DeliveryFlag.PRIME]})
+        self.assertEqual(item_filter.residual(), [])
+        self.assertEqual(
+            SearchFilter(min_price=1500, denomination=1).request_fields(),
+            {'min_price': 1500})
+
+    def test_fractional_rating_is_partly_pushed_down(self):
+        item_filter = SearchFilter(min_reviews_rating=4.5)
+        self.assertEqual(item_filter.request_fields(),
+                         {'min_reviews_rating': 4})
+        self.assertTrue(item_filter.matches(reviewed(rating=4.6)))
+        self.assertFalse(item_filter.matches(reviewed(rating=4.2)))
+        self.assertFalse(item_filter.matches(Item(asin="B000000002")))
+        self.assertEqual(SearchFilter(min_reviews_rating=0.5).request_fields(),
+                         {})
+
+    def test_residual_conditions(self):
+        item_filter = SearchFilter(
+            min_review_count=100,
+            predicates=[lambda item: item.asin.startswith("B0")])
+        self.assertEqual(len(item_filter.residual()), 2)
+        self.assertTrue(item_filter.matches(reviewed(count=150)))
+        self.assertFalse(item_filter.matches(reviewed(count=50)))
+        self.assertFalse(item_filter.matches(reviewed()))
+
+    def test_apply(self):
+        request = search_items_request()
+        request.resources = [SearchItemsResource.ITEMINFO_TITLE]
+        item_filter = SearchFilter(min_price=40, min_review_count=10)
+        applied = item_filter.apply(request)
+        self.assertEqual(applied.min_price, 4000)
+        self.assertEqual(applied.resources,
+                         [SearchItemsResource.ITEMINFO_TITLE,
+                          SearchItemsResource.CUSTOMERREVIEWS_COUNT])
+        # the original request is left as is
+        self.assertEqual(request.min_price, 2500)
+        self.assertEqual(request.resources,
+                         [SearchItemsResource.ITEMINFO_TITLE])
+        item_filter.check(applied)
+        self.assertRaises(ValueError, item_filter.check, request)
+
+
+class TestPushDown(unittest.TestCase):
+    """Filter push-down unit test stubs"""
+
+    def search(self, item_filter, pages=20):
+        with PaapiSimulator(total_results=200,
+                            honour_filters=True) as simulator:
+            api = DefaultApi(api_client=simulator.api_client())
+            request = search_items_request()
+            request.min_price = None
+            results = search_pages(api, request, pages=pages, target=20,
+                                   item_filter=item_filter)
+            return results, simulator.metrics.counter("requests.SearchItems")
+
+    def test_pushed_down_filter_saves_pages(self):
+        pushed, pushed_requests = self.search(
+            SearchFilter(min_reviews_rating=4))
+        local, local_requests = self.search(
+            SearchFilter(predicates=[rating_at_least(4)]))
+        for results in (pushed, local):
+            self.assertGreaterEqual(len(results.items), 20)
+            self.assertTrue(results.target_reached)
+            for item in results.items:
+                self.assertGreaterEqual(
+                    item.customer_reviews.star_rating.value, 4)
+        self.assertEqual(pushed_requests, 2)
+        self.assertEqual(pushed.pages_saved, 18)
+        self.assertEqual(pushed.rejected, 0)
+        self.assertGreater(local_requests, 2 * pushed_requests)
+        self.assertEqual(local.pages_saved, 20 - local_requests)
+        self.assertGreater(local.rejected, 0)
+
+    def test_prepared_request_must_be_applied(self):
+        item_filter = SearchFilter(min_reviews_rating=4)
+        with PaapiSimulator() as simulator:
+            api = DefaultApi(api_client=simulator.api_client())
+            prepared = PreparedRequest(search_items_request(),
+                                       fields=('item_page',))
+            self.assertRaises(ValueError, search_pages, api, prepared, 1,
+                              item_filter=item_filter)
+            prepared = PreparedRequest(
+                item_filter.apply(search_items_request()),
+                fields=('item_page',))
+            results = search_pages(api, prepared, 1, item_filter=item_filter)
+        self.assertEqual(len(results.items), 10)
+
+
+class TestSearchFilters(unittest.TestCase):
+    """/search filter push-down unit test stubs"""
+
+    def test_only_prime_items(self):
+        with PaapiSimulator(honour_filters=True) as simulator:
+            service = load_service(simulator)
+            service.SEARCH_CACHE.clear()
+            response = service.app.test_client().get(
+                "/search?keywords=casque")
+            service.SEARCH_CACHE.clear()
+        self.assertEqual(response.status_code, 200)
+        results = json.loads(response.data)
+        self.assertTrue(results)
+        self.assertLess(len(results), 100)
+        for result in results:
+            self.assertTrue(result["prime_eligible"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import itertools
+import threading
+import time
+import unittest
+
+from benchmarks.fixtures import search_items_request
+from benchmarks.simulator import PaapiSimulator, constant_latency
+from paapi5_python_sdk.api.default_api import DefaultApi
+from paapi5_python_sdk.configuration import Configuration
+from paapi5_python_sdk.hedging import HedgingPolicy
+from paapi5_python_sdk.metrics import MetricsRegistry
+
+
+def warmed_up(**kwargs):
+    policy = HedgingPolicy(min_samples=10, min_delay=0.01, **kwargs)
+    for _ in range(10):
+        policy.observe(0.001)
+    return policy
+
+
+class TestHedgingPolicy(unittest.TestCase):
+    """HedgingPolicy unit test stubs"""
+
+    def slow_then_fast(self, first_delay=0.5, first_error=None):
+        attempts = itertools.count()
+        lock = threading.Lock()
+
+        def send():
+            with lock:
+                attempt = next(attempts)
+            if attempt == 0:
+                time.sleep(first_delay)
+                if first_error is not None:
+                    raise first_error
+                return "primary"
+            return "hedge"
+        return send
+
+    def test_no_hedge_before_min_samples(self):
+        policy = HedgingPolicy(min_samples=10)
+        self.assertIsNone(policy.delay())
+        self.assertEqual(policy.call(lambda: "done"), "done")
+        self.assertEqual(policy.stats()["hedges"], 0)
+
+    def test_hedge_wins(self):
+        metrics = MetricsRegistry()
+        policy = warmed_up(max_hedge_rate=1.0, metrics=metrics)
+        self.assertEqual(policy.delay(), 0.01)
+        self.assertEqual(policy.call(self.slow_then_fast()), "hedge")
+        stats = policy.stats()
+        self.assertEqual((stats["hedges"], stats["hedge_wins"]), (1, 1))
+        self.assertEqual(stats["hedge_win_rate"], 1.0)
+        self.assertEqual(metrics.counter("hedging.hedge_wins"), 1)
+
+    def test_fast_primary_is_not_hedged(self):
+        policy = warmed_up(max_hedge_rate=1.0)
+        self.assertEqual(policy.call(lambda: "primary"), "primary")
+        self.assertEqual(policy.stats()["hedges"], 0)
+
+    def test_hedge_rate_cap(self):
+        policy = warmed_up(max_hedge_rate=0.0)
+        self.assertEqual(policy.call(self.slow_then_fast(0.05)), "primary")
+        stats = policy.stats()
+        self.assertEqual((stats["hedges"], stats["rate_limited"]), (0, 1))
+
+    def test_hedge_rate_cap_under_concurrency(self):
+        policy = warmed_up(max_hedge_rate=0.1)
+
+        def slow():
+            time.sleep(0.1)
+            return "done"
+
+        threads = [threading.Thread(target=policy.call, args=(slow,))
+                   for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = policy.stats()
+        # at most 10% of the 20 calls of the window
+        self.assertLessEqual(stats["hedges"], 2)
+        self.assertEqual(stats["hedges"] + stats["rate_limited"], 20)
+
+    def test_error_does_not_win(self):
+        policy = warmed_up(max_hedge_rate=1.0)
+        send = self.slow_then_fast(0.05, first_error=IOError("reset"))
+        self.assertEqual(policy.call(send), "hedge")
+
+        def failing():
+            raise IOError("down")
+        self.assertRaises(IOError, policy.call, failing)
+
+    def test_api_client(self):
+        policy = warmed_up(max_hedge_rate=1.0)
+        with PaapiSimulator(latency=constant_latency(0.05)) as simulator:
+            configuration = Configuration()
+            configuration.hedging = policy
+            api = DefaultApi(api_client=simulator.api_client(
+                configuration=configuration))
+            response = api.search_items(search_items_request())
+        self.assertEqual(len(response.search_result.items), 10)
+        self.assertEqual(policy.stats()["hedges"], 1)
+        self.assertEqual(simulator.metrics.counter("requests.SearchItems"), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
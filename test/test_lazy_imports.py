@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+# flake8: noqa
+
+from __future__ import absolute_import
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+import paapi5_python_sdk
+import paapi5_python_sdk.models
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazyImports(unittest.TestCase):
+    """Lazy package attribute unit tests"""
+
+    def test_package_import_loads_no_model_or_client(self):
+        script = (
+            "import sys, paapi5_python_sdk\n"
+            "loaded = [name for name in sys.modules\n"
+            "          if name.startswith('paapi5_python_sdk.')]\n"
+            "assert loaded == ['paapi5_python_sdk.models'], loaded\n"
+            "assert 'urllib3' not in sys.modules\n"
+            "paapi5_python_sdk.Item\n"
+            "assert 'paapi5_python_sdk.models.item' in sys.modules\n"
+            "assert 'paapi5_python_sdk.models.get_items_response' "
+            "not in sys.modules\n")
+        subprocess.check_call([sys.executable, "-c", script], cwd=ROOT)
+
+    def test_api_import_loads_no_pagination_or_model(self):
+        script = (
+            "import sys\n"
+            "from paapi5_python_sdk.api.default_api import DefaultApi\n"
+            "assert 'paapi5_python_sdk.pagination' not in sys.modules\n"
+            "assert 'paapi5_python_sdk.models.variations_result' "
+            "not in sys.modules\n")
+        subprocess.check_call([sys.executable, "-c", script], cwd=ROOT)
+
+    def test_every_exported_name_resolves(self):
+        for name in paapi5_python_sdk.__all__:
+            self.assertIsNotNone(getattr(paapi5_python_sdk, name), name)
+        self.assertIs(paapi5_python_sdk.Item, paapi5_python_sdk.models.Item)
+        self.assertIn("SearchItemsRequest", dir(paapi5_python_sdk))
+
+    def test_submodules_reachable_as_attributes(self):
+        script = (
+            "import paapi5_python_sdk\n"
+            "assert paapi5_python_sdk.rest.ApiException\n"
+            "assert paapi5_python_sdk.api_client.ApiClient\n"
+            "assert paapi5_python_sdk.api.default_api.DefaultApi\n")
+        subprocess.check_call([sys.executable, "-c", script], cwd=ROOT)
+
+    def test_unknown_names_raise_attribute_error(self):
+        with self.assertRaises(AttributeError):
+            paapi5_python_sdk.NotAModel
+        with self.assertRaises(AttributeError):
+            paapi5_python_sdk.models.get_model("str")
+        # Module globals that are not models are not handed out either.
+        with self.assertRaises(AttributeError):
+            paapi5_python_sdk.models.get_model("sys")
+        with self.assertRaises(AttributeError):
+            paapi5_python_sdk.models.get_model("importlib")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,231 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import json
+import time
+import unittest
+
+from benchmarks.fixtures import search_items_request
+from benchmarks.simulator import (SIMULATOR_ACCESS_KEY, SIMULATOR_SECRET_KEY,
+                                  PaapiSimulator, constant_latency,
+                                  load_service)
+from paapi5_python_sdk.configuration import Configuration
+from paapi5_python_sdk.credentials import Credential, CredentialPool
+from paapi5_python_sdk.filters import SearchFilter
+from paapi5_python_sdk.marketplaces import (MARKETPLACES, Marketplace,
+                                            MarketplaceSearch,
+                                            get_marketplace,
+                                            register_marketplace)
+
+
+class TestMarketplaceRegistry(unittest.TestCase):
+    """Marketplace registry unit test stubs"""
+
+    def test_get_marketplace(self):
+        germany = get_marketplace("de")
+        self.assertEqual((germany.host, germany.region, germany.marketplace,
+                          germany.currency),
+                         ("webservices.amazon.de", "eu-west-1",
+                          "www.amazon.de", "EUR"))
+        self.assertEqual(get_marketplace("uk").marketplace,
+                         "www.amazon.co.uk")
+        self.assertRaises(ValueError, get_marketplace, "xx")
+
+    def test_denomination_follows_the_currency(self):
+        self.assertEqual(get_marketplace("fr").denomination, 100)
+        self.assertEqual(get_marketplace("jp").denomination, 1)
+
+    def test_register_marketplace(self):
+        register_marketplace(Marketplace("local", "127.0.0.1:8081",
+                                         "eu-west-1", "EUR",
+                                         marketplace="www.amazon.fr"))
+        try:
+            self.assertEqual(get_marketplace("local").host, "127.0.0.1:8081")
+        finally:
+            del MARKETPLACES["local"]
+
+
+class TestMarketplaceSearch(unittest.TestCase):
+    """MarketplaceSearch unit test stubs"""
+
+    def setUp(self):
+        self.simulators = {}
+
+    def tearDown(self):
+        for simulator in self.simulators.values():
+            simulator.stop()
+
+    def marketplace(self, code, currency="EUR", **options):
+        simulator = PaapiSimulator(**options).start()
+        self.simulators[code] = simulator
+        return Marketplace(code, simulator.host, simulator.region, currency,
+                           marketplace="www.amazon." + code)
+
+    def search(self, marketplaces, partner_tags=None, credential_pool=None):
+        configuration = Configuration()
+        configuration.scheme = "http"
+        configuration.credential_pool = credential_pool
+        return MarketplaceSearch(SIMULATOR_ACCESS_KEY, SIMULATOR_SECRET_KEY,
+                                 marketplaces, partner_tags=partner_tags,
+                                 configuration=configuration)
+
+    def sent_bodies(self, search):
+        """Records the request bodies each marketplace client sends."""
+        bodies = {}
+        for code, api in search.apis.items():
+            pool_manager = api.api_client.rest_client.pool_manager
+
+            def request(method, url, _send=pool_manager.request, _code=code,
+                        **kwargs):
+                bodies.setdefault(_code, []).append(
+                    json.loads(kwargs["body"].decode("utf-8")))
+                return _send(method, url, **kwargs)
+            pool_manager.request = request
+        return bodies
+
+    def test_marketplaces_are_searched_in_parallel(self):
+        search = self.search([
+            self.marketplace(code, latency=constant_latency(0.2),
+                             total_results=20)
+            for code in ("fr", "de", "it", "es")])
+        started = time.time()
+        results = search.search_items(search_items_request(), pages=1)
+        elapsed = time.time() - started
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(list(results.results), ["fr", "de", "it", "es"])
+        self.assertTrue(results.complete)
+        self.assertEqual(len(results.items()), 40)
+        self.assertEqual(results.items()[0][0], "fr")
+        self.assertEqual(results.items()[-1][0], "es")
+        for simulator in self.simulators.values():
+            self.assertEqual(
+                simulator.metrics.counter("requests.SearchItems"), 1)
+
+    def test_failed_marketplace(self):
+        search = self.search([self.marketplace("fr"),
+                              self.marketplace("de", error_rate=1.0)])
+        results = search.search_items(search_items_request(), pages=2,
+                                      marketplaces=["de", "fr"])
+        self.assertEqual(list(results.results), ["fr"])
+        self.assertEqual(results.errors["de"].status, 500)
+        self.assertFalse(results.complete)
+        self.assertEqual(len(results.items()), 20)
+
+    def test_prices_in_the_denomination_of_each_marketplace(self):
+        search = self.search([self.marketplace("fr"),
+                              self.marketplace("jp", currency="JPY")])
+        bodies = self.sent_bodies(search)
+        results = search.search_items(
+            search_items_request(), pages=1,
+            item_filter=SearchFilter(min_price=25, max_price=40.5))
+        self.assertTrue(results.complete)
+        self.assertEqual((bodies["fr"][0]["MinPrice"],
+                          bodies["fr"][0]["MaxPrice"]), (2500, 4050))
+        self.assertEqual((bodies["jp"][0]["MinPrice"],
+                          bodies["jp"][0]["MaxPrice"]), (25, 40))
+
+    def test_prices_converted_by_exchange_rate(self):
+        search = self.search([self.marketplace("fr"),
+                              self.marketplace("de"),
+                              self.marketplace("uk", currency="GBP"),
+                              self.marketplace("jp", currency="JPY")])
+        bodies = self.sent_bodies(search)
+        rates = {"EUR": 1.0, "GBP": 0.85, "JPY": 160.0}
+        search.search_items(search_items_request(), pages=1,
+                            item_filter=SearchFilter(min_price=25),
+                            exchange_rate=rates.get)
+        self.assertEqual({code: sent[0]["MinPrice"]
+                          for code, sent in bodies.items()},
+                         {"fr": 2500, "de": 2500, "uk": 2125, "jp": 4000})
+
+    def test_credential_pool_with_marketplace_partner_tags(self):
+        keys = {"AK1": "SK1", "AK2": "SK2"}
+        # each account has its own tag on "fr", a single tag elsewhere
+        pool = CredentialPool([
+            Credential(key, secret, key.lower() + "-21", tps=10,
+                       partner_tags={"fr": key.lower() + "-fr-21"})
+            for key, secret in sorted(keys.items())])
+        search = self.search(
+            [self.marketplace("fr", credentials=keys, total_results=40,
+                              partner_tags={key: key.lower() + "-fr-21"
+                                            for key in keys}),
+             self.marketplace("de", credentials=keys, total_results=40,
+                              partner_tags={key: key.lower() + "-21"
+                                            for key in keys})],
+            partner_tags={"fr": "ak1-fr-21"}, credential_pool=pool)
+        for api in search.apis.values():
+            api.api_client.access_key = api.api_client.secret_key = None
+        results = search.search_items(search_items_request(), pages=4,
+                                      concurrency=2)
+        self.assertEqual(results.errors, {})
+        self.assertTrue(results.complete)
+        self.assertEqual(len(results.items()), 80)
+        for key in keys:
+            self.assertEqual(pool.stats()[key]["failures"], 0)
+            self.assertGreater(sum(
+                simulator.metrics.counter("requests_by_key." + key)
+                for simulator in self.simulators.values()), 0)
+
+
+class TestServiceMarketplaces(unittest.TestCase):
+    """/search marketplaces unit test stubs"""
+
+    def setUp(self):
+        self.simulator = PaapiSimulator(total_results=20).start()
+        register_marketplace(Marketplace("local", self.simulator.host,
+                                         self.simulator.region, "EUR",
+                                         marketplace="www.amazon.fr"))
+        self.service = load_service(self.simulator)
+        self.service.SEARCH_CACHE.clear()
+        self.service.MARKETPLACE_APIS.clear()
+        self.client = self.service.app.test_client()
+
+    def tearDown(self):
+        self.service.SEARCH_CACHE.clear()
+        self.service.MARKETPLACE_APIS.clear()
+        del MARKETPLACES["local"]
+        self.simulator.stop()
+
+    def test_marketplace_clients_are_reused(self):
+        apis = []
+        for keywords, marketplaces in (("casque", "local"),
+                                       ("clavier", "local"),
+                                       ("souris", "local,local")):
+            response = self.client.get(
+                "/search?keywords=%s&marketplaces=%s"
+                % (keywords, marketplaces))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(json.loads(response.data)), 20)
+            apis.append(self.service.MARKETPLACE_APIS["local"])
+        self.assertEqual(list(self.service.MARKETPLACE_APIS), ["local"])
+        self.assertIs(apis[0], apis[1])
+        self.assertIs(apis[0], apis[2])
+
+    def test_unknown_marketplace_is_a_bad_request(self):
+        response = self.client.get("/search?keywords=casque&marketplaces=xx")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("xx", json.loads(response.data)["error"])
+        self.assertEqual(self.service.MARKETPLACE_APIS, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,233 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import json
+import unittest
+
+from benchmarks.simulator import PaapiSimulator, error_body, load_service
+from paapi5_python_sdk.cassette import CassetteMiss
+from paapi5_python_sdk.circuit_breaker import CircuitOpenError
+from paapi5_python_sdk.pagination import (asin_key, fetch_pages,
+                                          is_retryable, parent_asin_key)
+from paapi5_python_sdk.rest import ApiException
+from test.helpers import Page, page_items
+
+
+def api_error(status, code):
+    error = ApiException(status=status, reason=code)
+    error.body = json.dumps(error_body(code, "%s on this page" % code))
+    return error
+
+
+class TestPartialResults(unittest.TestCase):
+    """Partial results unit test stubs"""
+
+    def test_failed_pages_are_reported(self):
+        def fetch(page):
+            if page in (3, 7):
+                raise api_error(500, "InternalFailure")
+            return Page([page])
+
+        results = fetch_pages(fetch, 10, page_items, partial=True)
+        self.assertEqual(results.items, [1, 2, 4, 5, 6, 8, 9, 10])
+        self.assertFalse(results.complete)
+        self.assertFalse(results.deadline_exceeded)
+        self.assertEqual(results.page_errors(), [
+            {'page': 3, 'status': 500, 'codes': ['InternalFailure'],
+             'message': 'InternalFailure'},
+            {'page': 7, 'status': 500, 'codes': ['InternalFailure'],
+             'message': 'InternalFailure'},
+        ])
+
+    def test_errors_past_the_last_page_are_dropped(self):
+        def fetch(page):
+            if page == 5:
+                raise api_error(500, "InternalFailure")
+            return Page([page] if page <= 3 else [])
+
+        results = fetch_pages(fetch, 10, page_items, partial=True,
+                              concurrency=4)
+        self.assertEqual(results.items, [1, 2, 3])
+        self.assertTrue(results.complete)
+
+    def test_no_page_succeeded(self):
+        def fetch(page):
+            raise api_error(429, "TooManyRequests")
+
+        self.assertRaises(ApiException, fetch_pages, fetch, 3, page_items,
+                          partial=True)
+
+    def test_retry_failed_pages(self):
+        calls = []
+
+        def fetch(page):
+            calls.append(page)
+            if page == 2 and calls.count(2) == 1:
+                raise api_error(429, "TooManyRequests")
+            return Page([page])
+
+        results = fetch_pages(fetch, 4, page_items, partial=True, retries=1)
+        self.assertEqual(calls, [1, 2, 3, 4, 2])
+        self.assertEqual(results.items, [1, 2, 3, 4])
+        self.assertEqual(results.retries, 1)
+        self.assertTrue(results.complete)
+
+    def test_non_retryable_errors_are_not_retried(self):
+        calls = []
+
+        def fetch(page):
+            calls.append(page)
+            if page == 2:
+                raise api_error(400, "InvalidParameterValue")
+            return Page([page])
+
+        results = fetch_pages(fetch, 3, page_items, partial=True, retries=2)
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(list(results.errors), [2])
+
+    def test_bad_request_stops_pagination(self):
+        calls = []
+
+        def fetch(page):
+            calls.append(page)
+            raise api_error(400, "InvalidPartnerTag")
+
+        with self.assertRaises(ApiException) as context:
+            fetch_pages(fetch, 10, page_items, partial=True, retries=1)
+        self.assertEqual(calls, [1])
+        self.assertEqual(context.exception.error_codes(),
+                         ["InvalidPartnerTag"])
+
+    def test_transient_errors_do_not_stop_pagination(self):
+        def fetch(page):
+            if page == 2:
+                raise api_error(429, "TooManyRequests")
+            if page == 3:
+                raise api_error(503, "ServiceUnavailable")
+            return Page([page])
+
+        results = fetch_pages(fetch, 5, page_items, partial=True)
+        self.assertEqual(results.items, [1, 4, 5])
+        self.assertEqual(sorted(results.errors), [2, 3])
+
+    def test_is_retryable(self):
+        self.assertTrue(is_retryable(api_error(429, "TooManyRequests")))
+        self.assertTrue(is_retryable(api_error(503, "ServiceUnavailable")))
+        self.assertTrue(is_retryable(ApiException(status=0, reason="timeout")))
+        self.assertFalse(is_retryable(api_error(400, "InvalidParameterValue")))
+        self.assertFalse(is_retryable(
+            CircuitOpenError(("webservices.amazon.fr", "eu-west-1"), 5.0)))
+        self.assertFalse(is_retryable(
+            CassetteMiss("POST", "/paapi5/searchitems", "search.jsonl.gz")))
+
+
+class Item(object):
+    def __init__(self, asin, parent_asin=None):
+        self.asin = asin
+        self.parent_asin = parent_asin
+
+
+class TestDedup(unittest.TestCase):
+    """Dedup and unique target unit test stubs"""
+
+    def test_dedup_by_asin(self):
+        pages = {1: [Item("A"), Item("B")], 2: [Item("B"), Item("C")],
+                 3: []}
+        results = fetch_pages(lambda page: Page(pages[page]), 3, page_items,
+                              unique_by=asin_key)
+        self.assertEqual([item.asin for item in results.items],
+                         ["A", "B", "C"])
+        self.assertEqual(results.duplicates, 1)
+
+    def test_collapse_variations(self):
+        pages = {1: [Item("A1", "A"), Item("A2", "A"), Item("B")],
+                 2: [Item("A3", "A"), Item("C1", "C")]}
+        results = fetch_pages(lambda page: Page(pages[page]), 2, page_items,
+                              unique_by=parent_asin_key)
+        self.assertEqual([item.asin for item in results.items],
+                         ["A1", "B", "C1"])
+
+    def test_stop_at_unique_target(self):
+        fetched = []
+
+        def fetch(page):
+            fetched.append(page)
+            # every page repeats the last item of the previous one
+            return Page([Item(str(page * 3 + index)) for index in range(4)])
+
+        results = fetch_pages(fetch, 10, page_items, unique_by=asin_key,
+                              target=7)
+        self.assertEqual(fetched, [1, 2])
+        self.assertEqual(len(results.items), 7)
+        self.assertTrue(results.target_reached)
+        self.assertTrue(results.complete)
+
+    def test_target_without_dedup(self):
+        fetched = []
+
+        def fetch(page):
+            fetched.append(page)
+            return Page([Item("A"), Item("A")])
+
+        results = fetch_pages(fetch, 10, page_items, target=5)
+        self.assertEqual(fetched, [1, 2, 3])
+        self.assertEqual(len(results.items), 6)
+
+
+class TestSearchPartialResults(unittest.TestCase):
+    """/search partial results unit test stubs"""
+
+    def setUp(self):
+        self.simulator = PaapiSimulator(error_rate=0.3, seed=7)
+        self.simulator.start()
+        self.service = load_service(self.simulator)
+        self.service.SEARCH_CACHE.clear()
+        self.service.SEARCH_PAGE_RETRIES = 0
+        self.client = self.service.app.test_client()
+
+    def tearDown(self):
+        self.service.SEARCH_PAGE_RETRIES = 1
+        self.service.SEARCH_CACHE.clear()
+        self.simulator.stop()
+
+    def test_partial_mode(self):
+        response = self.client.get("/search?keywords=casque&partial=1")
+        self.assertEqual(response.status_code, 200)
+        search = json.loads(response.data)
+        self.assertFalse(search["complete"])
+        self.assertTrue(search["results"])
+        self.assertTrue(search["errors"])
+        for error in search["errors"]:
+            self.assertEqual(error["status"], 500)
+            self.assertEqual(error["codes"], ["InternalFailure"])
+        # An incomplete search is not cached.
+        self.assertEqual(len(self.service.SEARCH_CACHE), 0)
+
+    def test_all_or_nothing_mode(self):
+        response = self.client.get("/search?keywords=casque")
+        self.assertEqual(response.status_code, 500)
+        self.assertTrue(json.loads(response.data)["errors"])
+
+
+if __name__ == '__main__':
+    unittest.main()
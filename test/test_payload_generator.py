@@ -0,0 +1,67 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import unittest
+
+from benchmarks.fixtures import deserialize
+from benchmarks.payload_generator import (PayloadGenerator, RESPONSE_TYPES,
+                                          expected_to_dict)
+from paapi5_python_sdk import serializer
+
+
+class TestPayloadGenerator(unittest.TestCase):
+    """PayloadGenerator unit test stubs"""
+
+    def test_round_trip(self):
+        generator = PayloadGenerator(item_count=3, listings=2, promotions=2,
+                                     browse_node_depth=3, errors=1)
+        for response_type in RESPONSE_TYPES:
+            payload = generator.generate(response_type)
+            model = deserialize(payload, response_type)
+            expected = expected_to_dict(payload, response_type)
+            self.assertEqual(model.to_dict(), expected, response_type)
+            self.assertEqual(serializer.to_dict(model), expected, response_type)
+
+    def test_knobs(self):
+        generator = PayloadGenerator(item_count=4, listings=3, promotions=1,
+                                     contributors=5, browse_node_depth=2)
+        payload = generator.generate("SearchItemsResponse")
+        items = payload["SearchResult"]["Items"]
+        self.assertEqual(len(items), 4)
+        self.assertEqual(len(items[0]["Offers"]["Listings"]), 3)
+        self.assertEqual(len(items[0]["Offers"]["Listings"][0]["Promotions"]), 1)
+        self.assertEqual(len(items[0]["ItemInfo"]["ByLineInfo"]["Contributors"]), 5)
+        self.assertNotIn("Errors", payload)
+
+        ancestor = generator.generate("GetBrowseNodesResponse")[
+            "BrowseNodesResult"]["BrowseNodes"][0]["Ancestor"]
+        self.assertIn("Ancestor", ancestor)
+        self.assertNotIn("Ancestor", ancestor["Ancestor"])
+
+    def test_deterministic(self):
+        self.assertEqual(PayloadGenerator(seed=3).generate("GetItemsResponse"),
+                         PayloadGenerator(seed=3).generate("GetItemsResponse"))
+
+
+if __name__ == '__main__':
+    unittest.main()
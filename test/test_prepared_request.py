@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+# flake8: noqa
+
+from __future__ import absolute_import
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import unittest
+
+from paapi5_python_sdk import SearchItemsRequest, SearchItemsResource, serializer
+from paapi5_python_sdk.models.partner_type import PartnerType
+from paapi5_python_sdk.prepared_request import PreparedRequest
+
+
+def search_items_request(**kwargs):
+    return SearchItemsRequest(
+        partner_tag="dummy-21",
+        partner_type=PartnerType.ASSOCIATES,
+        search_index="All",
+        item_count=10,
+        resources=[SearchItemsResource.ITEMINFO_TITLE],
+        min_price=2500,
+        **kwargs
+    )
+
+
+class TestPreparedRequest(unittest.TestCase):
+    """PreparedRequest unit tests"""
+
+    def test_variants_match_full_serialization(self):
+        prepared = PreparedRequest(
+            search_items_request(keywords="casque", item_page=1))
+        for page, keywords in [(1, "casque"), (7, "casque"),
+                               (2, u"lampe é \"citée\"")]:
+            expected = serializer.dumps(
+                search_items_request(keywords=keywords, item_page=page))
+            self.assertEqual(
+                prepared.body(item_page=page, keywords=keywords),
+                expected.encode("utf-8"))
+
+    def test_unset_field_can_be_prepared(self):
+        prepared = PreparedRequest(search_items_request(keywords="casque"),
+                                   fields=("item_page",))
+        self.assertEqual(
+            prepared.body(item_page=4),
+            serializer.dumps(search_items_request(
+                keywords="casque", item_page=4)).encode("utf-8"))
+        # a None field is left out, as serialization does
+        self.assertEqual(
+            prepared.body(),
+            serializer.dumps(search_items_request(
+                keywords="casque")).encode("utf-8"))
+
+    def test_browse_node_search_without_keywords(self):
+        request = search_items_request(keywords=None, browse_node_id="123",
+                                       item_page=1)
+        prepared = PreparedRequest(request)
+        for page, keywords in [(1, None), (2, None), (3, "casque")]:
+            self.assertEqual(
+                prepared.body(item_page=page, keywords=keywords),
+                serializer.dumps(search_items_request(
+                    keywords=keywords, browse_node_id="123",
+                    item_page=page)).encode("utf-8"))
+
+    def test_every_combination_of_none_fields(self):
+        # the first, inner and last members of the body
+        fields = ("availability", "item_page", "keywords", "marketplace",
+                  "search_index")
+        prepared = PreparedRequest(search_items_request(), fields=fields)
+        values = {"availability": "Available", "item_page": 2,
+                  "keywords": "casque", "marketplace": "www.amazon.fr",
+                  "search_index": "All"}
+        for mask in range(2 ** len(fields)):
+            chosen = {field: values[field] if mask & (1 << bit) else None
+                      for bit, field in enumerate(fields)}
+            expected = serializer.dumps(prepared.request_for(**chosen))
+            self.assertEqual(prepared.body(**chosen),
+                             expected.encode("utf-8"), chosen)
+
+    def test_unknown_fields_are_rejected(self):
+        with self.assertRaises(ValueError):
+            PreparedRequest(search_items_request(), fields=("page",))
+        prepared = PreparedRequest(search_items_request(item_page=1),
+                                   fields=("item_page",))
+        with self.assertRaises(ValueError):
+            prepared.body(keywords="casque")
+
+    def test_request_for_leaves_template_untouched(self):
+        request = search_items_request(keywords="casque", item_page=1)
+        prepared = PreparedRequest(request)
+        self.assertEqual(prepared.request_for(item_page=3).item_page, 3)
+        self.assertEqual(request.item_page, 1)
+
+    def test_with_defaults(self):
+        prepared = PreparedRequest(search_items_request(keywords="casque"),
+                                   fields=("item_page", "marketplace"))
+        french = prepared.with_defaults(marketplace="www.amazon.fr")
+        self.assertEqual(
+            french.body(item_page=2),
+            serializer.dumps(search_items_request(
+                keywords="casque", item_page=2,
+                marketplace="www.amazon.fr")).encode("utf-8"))
+        self.assertNotIn(b"Marketplace", prepared.body(item_page=2))
+        with self.assertRaises(ValueError):
+            prepared.with_defaults(keywords="lampe")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import unittest
+
+from benchmarks.replay_traffic import load_calls, percentile, replay
+
+
+class TestReplayTraffic(unittest.TestCase):
+    """Traffic replay unit test stubs"""
+
+    def test_load_calls(self):
+        calls = load_calls([
+            '{"keywords": "souris", "timestamp": "2023-11-14T22:13:22.5Z"}',
+            '{"keywords": "clavier", "search_index": "All"}',
+            '127.0.0.1 - - [14/Nov/2023:22:13:20 +0000] '
+            '"GET /search?keywords=casque+audio&search_index=Electronics '
+            'HTTP/1.1" 200 512 "-" "curl/8.0"',
+            '127.0.0.1 - - [14/Nov/2023:22:13:21 +0000] "GET /metrics '
+            'HTTP/1.1" 200 64',
+            '',
+        ])
+        self.assertEqual([(call.offset, call.keywords, call.search_index)
+                          for call in calls],
+                         [(0.0, "casque audio", "Electronics"),
+                          (2.5, "souris", "All"),
+                          (2.5, "clavier", "All")])
+        self.assertEqual(calls[0].path,
+                         "/search?keywords=casque+audio"
+                         "&search_index=Electronics")
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 99.9), 100)
+        self.assertIsNone(percentile([], 50))
+
+    def test_replay(self):
+        calls = load_calls('{"keywords": "k%d", "timestamp": %d}' % (i, i)
+                           for i in range(20))
+
+        def send(call):
+            if call.keywords == "k3":
+                raise IOError("connection reset")
+            return 429 if call.keywords == "k4" else 200
+
+        report = replay(calls, send, speed=0, concurrency=4)
+        summary = report.summary()
+        self.assertEqual(summary["calls"], 20)
+        self.assertEqual(summary["statuses"], {"0": 1, "200": 18, "429": 1})
+        self.assertEqual(summary["error_rate"], 0.1)
+        self.assertLessEqual(summary["latency_ms"]["p50"],
+                             summary["latency_ms"]["max"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+from benchmarks.fixtures import deserialize, search_items_response
+from benchmarks.simulator import PaapiSimulator, load_service
+from paapi5_python_sdk.models.get_items_resource import GetItemsResource
+from paapi5_python_sdk.models.search_items_resource import SearchItemsResource
+from paapi5_python_sdk.resources import (ResourceUsage, resource_paths,
+                                         resources_for)
+
+
+def item():
+    return deserialize(search_items_response(item_count=1),
+                       'SearchItemsResponse').search_result.items[0]
+
+
+class TestResourcesFor(unittest.TestCase):
+    """resources_for unit test stubs"""
+
+    def test_resource_paths(self):
+        paths = resource_paths()
+        self.assertEqual(paths[SearchItemsResource.OFFERS_LISTINGS_PRICE],
+                         ('offers', 'listings', 'price'))
+        self.assertEqual(paths[SearchItemsResource.PARENTASIN],
+                         ('parent_asin',))
+        self.assertNotIn(SearchItemsResource.SEARCHREFINEMENTS, paths)
+        self.assertIn(GetItemsResource.ITEMINFO_TITLE,
+                      resource_paths(GetItemsResource))
+
+    def test_minimal_resources(self):
+        self.assertEqual(resources_for([
+            'asin',
+            'item_info.title.display_value',
+            'offers.listings[0].price.display_amount',
+            'offers.listings[*].delivery_info.is_prime_eligible',
+            'images.primary.large.url',
+        ]), [SearchItemsResource.IMAGES_PRIMARY_LARGE,
+             SearchItemsResource.ITEMINFO_TITLE,
+             SearchItemsResource.OFFERS_LISTINGS_DELIVERYINFO_ISPRIMEELIGIBLE,
+             SearchItemsResource.OFFERS_LISTINGS_PRICE])
+
+    def test_nested_resources(self):
+        self.assertEqual(
+            resources_for(['offers.listings.condition.condition_note']),
+            [SearchItemsResource.OFFERS_LISTINGS_CONDITION_CONDITIONNOTE])
+        self.assertEqual(
+            resources_for(['offers.listings.condition.value']),
+            [SearchItemsResource.OFFERS_LISTINGS_CONDITION])
+        self.assertEqual(resources_for(['customer_reviews']),
+                         [SearchItemsResource.CUSTOMERREVIEWS_COUNT,
+                          SearchItemsResource.CUSTOMERREVIEWS_STARRATING])
+
+    def test_unknown_field(self):
+        self.assertRaises(ValueError, resources_for, ['item_info.colour'])
+
+
+class TestResourceUsage(unittest.TestCase):
+    """ResourceUsage unit test stubs"""
+
+    def test_unused_resources(self):
+        usage = ResourceUsage([
+            SearchItemsResource.ITEMINFO_TITLE,
+            SearchItemsResource.OFFERS_LISTINGS_PRICE,
+            SearchItemsResource.ITEMINFO_EXTERNALIDS,
+            SearchItemsResource.BROWSENODEINFO_WEBSITESALESRANK,
+            SearchItemsResource.SEARCHREFINEMENTS,
+        ])
+        tracked, = usage.track([item()])
+        self.assertEqual(tracked.asin, "B000000000")
+        self.assertTrue(tracked.item_info.title.display_value)
+        self.assertTrue(tracked.offers.listings[0].price.amount >= 25)
+        # traversing a resource without reading a value does not use it
+        self.assertIsNotNone(tracked.browse_node_info.website_sales_rank)
+        self.assertEqual(usage.unused(), [
+            SearchItemsResource.ITEMINFO_EXTERNALIDS,
+            SearchItemsResource.BROWSENODEINFO_WEBSITESALESRANK])
+        with self.assertLogs('paapi5_python_sdk.resources', 'WARNING'):
+            usage.log_unused()
+
+    def test_to_dict_reads_everything_below(self):
+        usage = ResourceUsage([SearchItemsResource.ITEMINFO_TITLE,
+                               SearchItemsResource.ITEMINFO_EXTERNALIDS,
+                               SearchItemsResource.CUSTOMERREVIEWS_COUNT])
+        tracked, = usage.track([item()])
+        tracked.item_info.to_dict()
+        self.assertEqual(usage.unused(),
+                         [SearchItemsResource.CUSTOMERREVIEWS_COUNT])
+
+    def test_tracked_function_reads_count(self):
+        usage = ResourceUsage([SearchItemsResource.ITEMINFO_TITLE,
+                               SearchItemsResource.OFFERS_LISTINGS_PRICE])
+        has_price = usage.tracked(
+            lambda item: item.offers.listings[0].price.amount >= 25)
+        self.assertTrue(has_price(item()))
+        self.assertEqual(usage.unused(),
+                         [SearchItemsResource.ITEMINFO_TITLE])
+
+
+class TestServiceResourceDebug(unittest.TestCase):
+    """PAAPI_RESOURCE_DEBUG unit test stubs"""
+
+    def test_tracks_the_resources_sent(self):
+        usages = []
+
+        def resource_usage(resources):
+            usages.append(ResourceUsage(resources))
+            return usages[-1]
+
+        with PaapiSimulator() as simulator:
+            service = load_service(simulator)
+            with mock.patch.object(service, "PAAPI_RESOURCE_DEBUG", True), \
+                    mock.patch.object(service, "SEARCH_COLLAPSE_VARIATIONS",
+                                      True), \
+                    mock.patch.object(service, "ResourceUsage",
+                                      resource_usage), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                search = service.fetch_search_results("casque", "All")
+        self.assertTrue(search["results"])
+        usage, = usages
+        self.assertIn(SearchItemsResource.PARENTASIN, usage.resources)
+        self.assertIn(SearchItemsResource.OFFERS_LISTINGS_PRICE,
+                      usage.resources)
+        # ParentASIN is only read by the dedup key, while paging
+        self.assertNotIn(SearchItemsResource.PARENTASIN, usage.unused())
+        self.assertNotIn(SearchItemsResource.OFFERS_LISTINGS_PRICE,
+                         usage.unused())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import threading
+import time
+import unittest
+
+import urllib3
+
+from benchmarks.fixtures import search_items_request
+from benchmarks.simulator import PaapiSimulator, constant_latency
+from paapi5_python_sdk.api.default_api import DefaultApi
+from paapi5_python_sdk.concurrency import ConcurrencyLimiter
+from paapi5_python_sdk.configuration import Configuration
+from paapi5_python_sdk.deadline import Deadline
+from paapi5_python_sdk.metrics import MetricsRegistry
+from paapi5_python_sdk.rest import ApiException
+from paapi5_python_sdk.scheduler import (BACKGROUND, INTERACTIVE, NORMAL,
+                                         PriorityScheduler, RequestRejected)
+
+
+class TestPriorityScheduler(unittest.TestCase):
+    """PriorityScheduler unit test stubs"""
+
+    def setUp(self):
+        self.metrics = MetricsRegistry()
+        self.threads = []
+
+    def tearDown(self):
+        for thread in self.threads:
+            thread.join()
+
+    def hold_slot(self, scheduler, lane=NORMAL):
+        """Starts a call that runs until the returned event is set."""
+        release = threading.Event()
+        self.start(scheduler, release.wait, lane)
+        while scheduler.stats()['in_flight'] < 1:
+            time.sleep(0.001)
+        return release
+
+    def start(self, scheduler, send, lane):
+        thread = threading.Thread(target=scheduler.call, args=(send, lane))
+        thread.start()
+        self.threads.append(thread)
+
+    def queue(self, scheduler, send, lane):
+        depth = scheduler.stats()['lanes'][lane]['queue_depth']
+        self.start(scheduler, send, lane)
+        while scheduler.stats()['lanes'][lane]['queue_depth'] == depth:
+            time.sleep(0.001)
+
+    def test_free_slot_runs_at_once(self):
+        scheduler = PriorityScheduler(max_in_flight=2)
+        self.assertEqual(scheduler.call(lambda: "ok", INTERACTIVE), "ok")
+        stats = scheduler.stats()
+        self.assertEqual(stats['in_flight'], 0)
+        self.assertEqual(stats['lanes'][INTERACTIVE]['requests'], 1)
+        self.assertEqual(stats['lanes'][INTERACTIVE]['queued'], 0)
+
+    def test_weighted_fairness(self):
+        scheduler = PriorityScheduler(
+            max_in_flight=1, weights={INTERACTIVE: 2, BACKGROUND: 1},
+            metrics=self.metrics)
+        release = self.hold_slot(scheduler, BACKGROUND)
+        order = []
+        for lane in (BACKGROUND, INTERACTIVE) * 3:
+            self.queue(scheduler, lambda lane=lane: order.append(lane), lane)
+        self.assertEqual(
+            self.metrics.gauge("scheduler.queue_depth.interactive"), 3)
+        release.set()
+        self.tearDown()
+        self.assertEqual(order, [INTERACTIVE, BACKGROUND, INTERACTIVE,
+                                 INTERACTIVE, BACKGROUND, BACKGROUND])
+
+    def test_queue_depth_limit(self):
+        scheduler = PriorityScheduler(max_in_flight=1,
+                                      max_queue_depth={BACKGROUND: 1},
+                                      metrics=self.metrics)
+        release = self.hold_slot(scheduler)
+        self.queue(scheduler, lambda: None, BACKGROUND)
+        self.assertRaises(RequestRejected, scheduler.call, lambda: None,
+                          BACKGROUND)
+        release.set()
+        self.assertEqual(
+            self.metrics.counter("scheduler.rejected.background"), 1)
+
+    def test_queue_timeout(self):
+        scheduler = PriorityScheduler(max_in_flight=1)
+        release = self.hold_slot(scheduler)
+        with self.assertRaises(RequestRejected) as context:
+            scheduler.call(lambda: None, INTERACTIVE, timeout=0.02)
+        self.assertEqual(context.exception.lane, INTERACTIVE)
+        release.set()
+        self.assertEqual(
+            scheduler.stats()['lanes'][INTERACTIVE]['queue_depth'], 0)
+
+    def test_unknown_lane(self):
+        scheduler = PriorityScheduler()
+        self.assertRaises(ValueError, scheduler.call, lambda: None, "urgent")
+
+    def test_capacity_follows_the_limiter(self):
+        limiter = ConcurrencyLimiter(initial_limit=1, max_limit=1)
+        scheduler = PriorityScheduler(max_in_flight=8, limiter=limiter)
+        release = self.hold_slot(scheduler)
+        self.queue(scheduler, lambda: None, INTERACTIVE)
+        self.assertEqual(scheduler.stats()['in_flight'], 1)
+        release.set()
+
+    def test_api_client_lanes(self):
+        with PaapiSimulator() as simulator:
+            scheduler = PriorityScheduler(max_in_flight=2)
+            configuration = Configuration()
+            configuration.scheduler = scheduler
+            api = DefaultApi(api_client=simulator.api_client(
+                configuration=configuration))
+            api.search_items(search_items_request(), _priority=INTERACTIVE)
+            api.search_items(search_items_request())
+        lanes = scheduler.stats()['lanes']
+        self.assertEqual(lanes[INTERACTIVE]['requests'], 1)
+        self.assertEqual(lanes[NORMAL]['requests'], 1)
+
+    def test_queueing_counts_against_the_deadline(self):
+        with PaapiSimulator(latency=constant_latency(0.3)) as simulator:
+            scheduler = PriorityScheduler(max_in_flight=1)
+            configuration = Configuration()
+            configuration.scheduler = scheduler
+            api = DefaultApi(api_client=simulator.api_client(
+                configuration=configuration))
+            holder = threading.Thread(
+                target=api.search_items, args=(search_items_request(),))
+            holder.start()
+            while scheduler.stats()['in_flight'] < 1:
+                time.sleep(0.001)
+            started = time.time()
+            # about 0.3 s in the queue, leaving 0.1 s for the call
+            with self.assertRaises((ApiException,
+                                    urllib3.exceptions.HTTPError)):
+                api.search_items(search_items_request(),
+                                 _deadline=Deadline(0.4))
+            elapsed = time.time() - started
+            holder.join()
+        self.assertLess(elapsed, 0.55)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+# flake8: noqa
+
+from __future__ import absolute_import
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import datetime
+import json
+import unittest
+
+from paapi5_python_sdk import (
+    Availability,
+    BrowseNode,
+    BrowseNodeAncestor,
+    DeliveryFlag,
+    GetItemsRequest,
+    GetItemsResource,
+    SearchItemsRequest,
+    SearchItemsResource,
+)
+from paapi5_python_sdk import serializer
+from paapi5_python_sdk.api_client import ApiClient
+from paapi5_python_sdk.auth.sign_helper import AWSV4Auth
+from paapi5_python_sdk.models.partner_type import PartnerType
+from paapi5_python_sdk.rest import RESTResponse
+
+
+GET_ITEMS_RESPONSE = {
+    "ItemsResult": {
+        "Items": [{
+            "ASIN": "B000000001",
+            "DetailPageURL": "https://www.amazon.fr/dp/B000000001",
+            "ItemInfo": {"Title": {"DisplayValue": u"Casque é",
+                                   "Label": "Title", "Locale": "fr_FR"}},
+            "Offers": {"Listings": [{
+                "Price": {"Amount": 25.5, "Currency": "EUR",
+                          "DisplayAmount": u"25,50 €"},
+                "DeliveryInfo": {"IsPrimeEligible": True},
+            }]},
+            "UnknownKey": {"Kept": 1},
+        }],
+    },
+}
+
+
+class FakeUrllib3Response(object):
+    status = 200
+    reason = "OK"
+
+    def __init__(self, data):
+        self.data = data
+
+
+def search_items_request(**kwargs):
+    return SearchItemsRequest(
+        partner_tag="dummy-21",
+        partner_type=PartnerType.ASSOCIATES,
+        keywords=u"casque réduction de bruit",
+        search_index="All",
+        item_count=10,
+        item_page=3,
+        resources=[
+            SearchItemsResource.ITEMINFO_TITLE,
+            SearchItemsResource.ITEMINFO_BYLINEINFO,
+            SearchItemsResource.OFFERS_LISTINGS_PRICE,
+        ],
+        availability=Availability.AVAILABLE,
+        delivery_flags=[DeliveryFlag.PRIME],
+        min_price=2500,
+        **kwargs
+    )
+
+
+class TestSerializer(unittest.TestCase):
+    """Compiled serializer unit tests"""
+
+    def setUp(self):
+        self.api_client = ApiClient(access_key="key", secret_key="secret",
+                                    host="webservices.amazon.fr",
+                                    region="eu-west-1")
+
+    def legacy(self, obj):
+        return json.dumps(self.api_client.sanitize_for_serialization(obj))
+
+    def test_matches_sanitize_for_serialization(self):
+        requests = [
+            search_items_request(),
+            search_items_request(languages_of_preference=[], max_price=1.5),
+            GetItemsRequest(partner_tag="dummy-21",
+                            partner_type=PartnerType.ASSOCIATES,
+                            item_ids=["B000000001", "B000000002"],
+                            resources=[GetItemsResource.IMAGES_PRIMARY_LARGE]),
+            BrowseNode(id="123", display_name=u"Électronique", is_root=False,
+                       ancestor=BrowseNodeAncestor(id="1", display_name="Root"),
+                       sales_rank=12),
+            {"Key": [1, 2.5, None, True, {"Nested": u"é"}]},
+            [datetime.date(2020, 1, 2), (1, 2)],
+        ]
+        for request in requests:
+            self.assertEqual(serializer.dumps(request), self.legacy(request))
+
+    def test_serializer_for_is_reused_per_class(self):
+        serialize = serializer.serializer_for(SearchItemsRequest)
+        request = search_items_request()
+        self.assertEqual(serialize(request), self.legacy(request))
+        self.assertIn(SearchItemsRequest, serializer._WIRE._emitters)
+
+    def test_serialize_body_signs_the_bytes_it_sends(self):
+        request = search_items_request()
+        body = self.api_client.serialize_body(request)
+        self.assertEqual(body, self.legacy(request).encode("utf-8"))
+
+        def signature(payload):
+            auth = AWSV4Auth(access_key="key", secret_key="secret",
+                             host="webservices.amazon.fr", region="eu-west-1",
+                             service="ProductAdvertisingAPI",
+                             method_name="POST",
+                             timestamp=datetime.datetime(2020, 1, 1),
+                             headers={"host": "webservices.amazon.fr"},
+                             payload=payload, path="/paapi5/searchitems")
+            return auth.get_headers()["Authorization"]
+
+        self.assertEqual(
+            signature(body),
+            signature(self.api_client.sanitize_for_serialization(request)))
+
+
+class TestResponseOutput(unittest.TestCase):
+    """to_dict / to_json unit tests"""
+
+    def setUp(self):
+        api_client = ApiClient(access_key="key", secret_key="secret",
+                               host="webservices.amazon.fr",
+                               region="eu-west-1")
+        self.raw = json.dumps(GET_ITEMS_RESPONSE)
+        self.response = api_client.deserialize(
+            RESTResponse(FakeUrllib3Response(self.raw)), "GetItemsResponse")
+
+    def test_to_dict_matches_generated_to_dict(self):
+        self.assertEqual(serializer.to_dict(self.response),
+                         self.response.to_dict())
+
+    def test_to_json_snake_case_matches_to_dict(self):
+        document = json.loads(serializer.to_json(
+            self.response, key_style="snake", skip_none=False))
+        self.assertEqual(document, self.response.to_dict())
+
+    def test_to_json_api_keys(self):
+        document = json.loads(serializer.to_json(self.response))
+        item = document["ItemsResult"]["Items"][0]
+        self.assertEqual(item["ItemInfo"]["Title"]["DisplayValue"],
+                         u"Casque é")
+        self.assertNotIn("ParentASIN", item)
+
+    def test_to_json_raw_response(self):
+        self.assertEqual(serializer.to_json(self.raw),
+                         self.raw.encode("utf-8"))
+        document = json.loads(serializer.to_json(
+            self.raw, key_style="snake", response_type="GetItemsResponse"))
+        item = document["items_result"]["items"][0]
+        self.assertEqual(item["offers"]["listings"][0]["price"]["amount"],
+                         25.5)
+        self.assertEqual(item["UnknownKey"], {"Kept": 1})
+        expected = json.loads(serializer.to_json(self.response,
+                                                 key_style="snake"))
+        del item["UnknownKey"]
+        self.assertEqual(document, expected)
+
+    def test_raw_snake_case_requires_response_type(self):
+        for raw in (self.raw, json.loads(self.raw)):
+            with self.assertRaises(ValueError):
+                serializer.to_json(raw, key_style="snake")
+        self.assertEqual(serializer.to_json(json.loads(self.raw)),
+                         serializer.to_json(json.loads(self.raw),
+                                            response_type="GetItemsResponse"))
+
+    def test_unknown_key_style_is_rejected(self):
+        with self.assertRaises(ValueError):
+            serializer.to_json(self.response, key_style="camel")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+
+import unittest
+
+from benchmarks.fixtures import search_items_request
+from benchmarks.simulator import PaapiSimulator, select_resources
+from paapi5_python_sdk.api.default_api import DefaultApi
+from paapi5_python_sdk.models.get_variations_request import GetVariationsRequest
+from paapi5_python_sdk.models.get_variations_resource import GetVariationsResource
+from paapi5_python_sdk.models.partner_type import PartnerType
+from paapi5_python_sdk.rest import ApiException
+
+
+class TestPaapiSimulator(unittest.TestCase):
+    """PaapiSimulator unit test stubs"""
+
+    def setUp(self):
+        self.simulator = PaapiSimulator(total_results=25, seed=1).start()
+        self.api = DefaultApi(api_client=self.simulator.api_client())
+
+    def tearDown(self):
+        self.simulator.stop()
+
+    def test_search_items(self):
+        response = self.api.search_items(search_items_request(item_page=3))
+        items = response.search_result.items
+        self.assertEqual(len(items), 5)
+        self.assertEqual(response.search_result.total_result_count, 25)
+        self.assertIsNotNone(items[0].item_info.title.display_value)
+        # Not requested: left out of the payload.
+        self.assertIsNone(items[0].offers.listings[0].id)
+        self.assertEqual(self.simulator.metrics.counter("requests.SearchItems"), 1)
+
+    def test_page_beyond_results(self):
+        with self.assertRaises(ApiException) as context:
+            self.api.search_items(search_items_request(item_page=4))
+        self.assertEqual(context.exception.status, 404)
+        self.assertEqual(context.exception.error_codes(), ["NoResults"])
+
+    def test_get_variations(self):
+        request = GetVariationsRequest(
+            partner_tag="dummy-21", partner_type=PartnerType.ASSOCIATES,
+            asin="B000000001", variation_page=3,
+            resources=[GetVariationsResource.VARIATIONSUMMARY_VARIATIONDIMENSION])
+        result = self.api.get_variations(request).variations_result
+        self.assertEqual(result.variation_summary.page_count, 3)
+        self.assertEqual(len(result.items), 5)
+
+    def test_invalid_signature(self):
+        api = DefaultApi(api_client=self.simulator.api_client(secret_key="wrong"))
+        with self.assertRaises(ApiException) as context:
+            api.search_items(search_items_request())
+        self.assertEqual(context.exception.status, 401)
+        self.assertEqual(context.exception.error_codes(), ["InvalidSignature"])
+
+    def test_throttling(self):
+        self.simulator.throttle_rate = 1.0
+        with self.assertRaises(ApiException) as context:
+            self.api.search_items(search_items_request())
+        self.assertEqual(context.exception.status, 429)
+        self.assertEqual(context.exception.error_codes(), ["TooManyRequests"])
+        self.assertEqual(self.simulator.metrics.counter("throttled"), 1)
+
+    def test_select_resources(self):
+        item = {"ASIN": "B0", "Offers": {"Listings": [
+            {"Price": {"Amount": 1}, "Id": "x"}, {"Price": {"Amount": 2}}]}}
+        self.assertEqual(select_resources(item, ["Offers.Listings.Price"]),
+                         {"ASIN": "B0", "Offers": {"Listings": [
+                             {"Price": {"Amount": 1}}, {"Price": {"Amount": 2}}]}})
+
+
+if __name__ == '__main__':
+    unittest.main()
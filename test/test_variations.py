@@ -0,0 +1,105 @@
+# coding: utf-8
+
+"""
+  Copyright 2019 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+  Licensed under the Apache License, Version 2.0 (the "License").
+  You may not use this file except in compliance with the License.
+  A copy of the License is located at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+  or in the "license" file accompanying this file. This file is distributed
+  on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+  express or implied. See the License for the specific language governing
+  permissions and limitations under the License.
+"""
+
+"""
+    ProductAdvertisingAPI
+
+    https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
+"""
+
+import json
+import time
+import unittest
+
+from benchmarks.simulator import PaapiSimulator, constant_latency
+from paapi5_python_sdk.api.default_api import DefaultApi
+from paapi5_python_sdk.models.get_variations_request import \
+    GetVariationsRequest
+from paapi5_python_sdk.models.get_variations_resource import \
+    GetVariationsResource
+from paapi5_python_sdk.models.partner_type import PartnerType
+from paapi5_python_sdk.pagination import variation_pages
+
+
+def get_variations_request(asin="B000000001"):
+    return GetVariationsRequest(
+        partner_tag="dummy-21", partner_type=PartnerType.ASSOCIATES,
+        asin=asin, variation_count=10,
+        resources=[GetVariationsResource.ITEMINFO_TITLE,
+                   GetVariationsResource.VARIATIONSUMMARY_VARIATIONDIMENSION])
+
+
+class OverlappingApi(DefaultApi):
+    """Repeats the first variation of page one on page two, as when a
+    variation moves between pages during the crawl."""
+
+    def get_variations(self, get_variations_request, **kwargs):
+        response = super(OverlappingApi, self).get_variations(
+            get_variations_request, **kwargs)
+        if json.loads(get_variations_request)["VariationPage"] == 2:
+            page_one = super(OverlappingApi, self).get_variations(
+                get_variations_request.replace(b'"VariationPage": 2',
+                                               b'"VariationPage": 1'))
+            response.variations_result.items.append(
+                page_one.variations_result.items[0])
+        return response
+
+
+class TestGetAllVariations(unittest.TestCase):
+    """DefaultApi.get_all_variations unit test stubs"""
+
+    def test_every_page_is_merged(self):
+        with PaapiSimulator(variation_count=95,
+                            latency=constant_latency(0.1)) as simulator:
+            api = DefaultApi(api_client=simulator.api_client())
+            started = time.time()
+            result = api.get_all_variations(get_variations_request(),
+                                            concurrency=10)
+            elapsed = time.time() - started
+            requests = simulator.metrics.counter("requests.GetVariations")
+        self.assertEqual(requests, 10)
+        # page one, then the nine others at once
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(len(result.items), 95)
+        self.assertEqual(len(set(item.asin for item in result.items)), 95)
+        summary = result.variation_summary
+        self.assertEqual(summary.page_count, 10)
+        self.assertEqual(summary.variation_count, 95)
+        self.assertEqual([dimension.name for dimension
+                          in summary.variation_dimensions],
+                         ["size_name", "color_name"])
+
+    def test_single_page_family(self):
+        with PaapiSimulator(variation_count=4) as simulator:
+            api = DefaultApi(api_client=simulator.api_client())
+            result = api.get_all_variations(get_variations_request())
+            requests = simulator.metrics.counter("requests.GetVariations")
+        self.assertEqual(requests, 1)
+        self.assertEqual(len(result.items), 4)
+
+    def test_duplicates_are_dropped(self):
+        with PaapiSimulator(variation_count=20) as simulator:
+            api = OverlappingApi(api_client=simulator.api_client())
+            pages = variation_pages(api, get_variations_request())
+            self.assertEqual(len(pages.items), 20)
+            self.assertEqual(pages.duplicates, 1)
+            result = api.get_all_variations(get_variations_request())
+        self.assertEqual(len(result.items), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()